@@ -1,9 +1,18 @@
-from flask import Flask
 from pathlib import Path
 
 def create_app():
+    # Imported here so that using app.resume_parser / app.utils on their own
+    # (CLI, batch jobs, tests) does not load Flask.
+    from flask import Flask
+
+    from .uploads import SpooledRequest
+
     app = Flask(__name__, template_folder="../templates", static_folder="../static")
     app.config.from_object("app.config.Config")
+    app.request_class = SpooledRequest
+
+    from .memprofile import configure_profiling
+    configure_profiling(app.config)
 
     # Ensure uploads directory exists
     upload_dir = Path(app.config["UPLOAD_FOLDER"])
@@ -13,5 +22,8 @@ def create_app():
     from .main import main_bp
     app.register_blueprint(main_bp)
 
+    from .cli import register_commands
+    register_commands(app)
+
     return app
 
@@ -0,0 +1,187 @@
+# app/admission.py - admission control in front of the analysis pool
+#
+# Each request is checked against its client's token bucket for its lane,
+# then waits for one of a fixed number of analysis slots. Freed slots go
+# to interactive waiters before bulk ones, so a bulk import cannot starve
+# the upload page. A request whose estimated queue wait exceeds its lane's
+# budget is turned away up front (HTTP 429 + Retry-After) instead of
+# timing out after holding a connection.
+#
+# Runs on the asyncio event loop of the ASGI front end; not thread-safe.
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+# Priority order: earlier lanes are served first.
+LANES = ("interactive", "bulk")
+
+DEFAULT_LANES: Dict[str, Dict[str, float]] = {
+    # rate: requests/second per client, burst: bucket size,
+    # max_wait: seconds of estimated queueing before rejecting,
+    # max_queue: waiters allowed in the lane.
+    "interactive": {"rate": 1.0, "burst": 10, "max_wait": 10.0, "max_queue": 100},
+    "bulk": {"rate": 20.0, "burst": 100, "max_wait": 120.0, "max_queue": 1000},
+}
+
+MAX_TRACKED_CLIENTS = 10000
+WAIT_SAMPLES = 1000          # recent queue waits kept per lane for percentiles
+SERVICE_TIME_ALPHA = 0.2     # EWMA weight of the latest job duration
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take one token. Returns 0 on success, else seconds until one is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+def _percentile(sorted_values: list, q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[idx], 4)
+
+
+class Admission:
+    def __init__(self, slots: int, lanes: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+        self.slots = slots
+        self.lanes = {lane: dict(DEFAULT_LANES[lane], **(lanes or {}).get(lane, {})) for lane in LANES}
+        self._free = slots
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in LANES}
+        self._buckets: "OrderedDict[tuple, TokenBucket]" = OrderedDict()
+        self._service_time = 1.0
+
+        self._counts = {lane: {"admitted": 0, "rejected_rate": 0, "rejected_queue": 0} for lane in LANES}
+        self._waits: Dict[str, Deque[float]] = {lane: deque(maxlen=WAIT_SAMPLES) for lane in LANES}
+
+    # ---------- Rate limiting ----------
+
+    def check_rate(self, client: str, lane: str) -> None:
+        """Charge one request to client's bucket for lane; raises Rejected if empty."""
+        now = time.monotonic()
+        key = (client, lane)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            cfg = self.lanes[lane]
+            bucket = self._buckets[key] = TokenBucket(cfg["rate"], cfg["burst"], now)
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        wait = bucket.take(now)
+        if wait:
+            self._counts[lane]["rejected_rate"] += 1
+            raise Rejected("Rate limit exceeded", wait)
+
+    # ---------- Queueing ----------
+
+    def estimated_wait(self, lane: str) -> float:
+        """Seconds a new request in lane would queue, from the waiters ahead of it."""
+        ahead = sum(len(self._waiters[l]) for l in LANES[: LANES.index(lane) + 1])
+        if self._free > 0 and ahead == 0:
+            return 0.0
+        return (ahead + 1) * self._service_time / self.slots
+
+    def check_capacity(self, lane: str) -> float:
+        """Estimated wait for a slot in lane; raises Rejected if over the lane's budget."""
+        cfg = self.lanes[lane]
+        wait = self.estimated_wait(lane)
+        if wait > cfg["max_wait"] or len(self._waiters[lane]) >= cfg["max_queue"]:
+            self._counts[lane]["rejected_queue"] += 1
+            raise Rejected("Server busy", wait)
+        return wait
+
+    @asynccontextmanager
+    async def slot(self, lane: str) -> AsyncIterator[float]:
+        """Hold one analysis slot for the duration of the block; yields the queue wait."""
+        queue = self._waiters[lane]
+        wait = self.check_capacity(lane)
+
+        t0 = time.monotonic()
+        if wait == 0.0:
+            self._free -= 1
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            queue.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    self._release()      # the slot was handed over just before we were cancelled
+                else:
+                    try:
+                        queue.remove(fut)
+                    except ValueError:
+                        pass
+                raise
+
+        waited = time.monotonic() - t0
+        self._counts[lane]["admitted"] += 1
+        self._waits[lane].append(waited)
+
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            elapsed = time.monotonic() - started
+            self._service_time += SERVICE_TIME_ALPHA * (elapsed - self._service_time)
+            self._release()
+
+    def _release(self) -> None:
+        for lane in LANES:
+            queue = self._waiters[lane]
+            while queue:
+                fut = queue.popleft()
+                if not fut.done():
+                    fut.set_result(None)
+                    return
+        self._free += 1
+
+    # ---------- Metrics ----------
+
+    def metrics(self) -> Dict[str, Any]:
+        lanes: Dict[str, Any] = {}
+        for lane in LANES:
+            waits = sorted(self._waits[lane])
+            lanes[lane] = {
+                **self._counts[lane],
+                "queued": len(self._waiters[lane]),
+                "estimated_wait_seconds": round(self.estimated_wait(lane), 3),
+                "wait_seconds": {
+                    "samples": len(waits),
+                    "p50": _percentile(waits, 0.50),
+                    "p95": _percentile(waits, 0.95),
+                    "p99": _percentile(waits, 0.99),
+                    "max": round(waits[-1], 4) if waits else None,
+                },
+            }
+        return {
+            "slots": self.slots,
+            "in_use": self.slots - self._free,
+            "service_seconds_ewma": round(self._service_time, 4),
+            "lanes": lanes,
+        }
@@ -0,0 +1,268 @@
+# app/asgi.py - async front end (Quart) for the same pages as app.main
+#
+#     hypercorn asgi:app --bind 0.0.0.0:5000 --workers 0
+#
+# Request bodies are received by the event loop, so slow uploaders cost a
+# coroutine rather than a worker. Extraction and analysis run in a shared
+# process pool (see app.pipeline.AnalysisPool); app.admission decides who
+# gets a slot, interactive uploads ahead of bulk API traffic. Small
+# documents (app.utils.preflight) skip the pool hop and run in a thread of
+# the server process, still holding their slot.
+
+import asyncio
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from quart import Blueprint, Quart, Request, Response, current_app, flash, redirect, render_template, request
+from quart.formparser import FormDataParser
+from werkzeug.utils import secure_filename
+
+from . import memprofile
+from .admission import Admission, Rejected
+from .main import SEARCH_PATH, result_page_data, search_corpus
+from .pipeline import AnalysisPool, analyze_document
+from .resume_parser.advanced_analyzer import check_fields
+from .resume_parser.profiles import get_profile
+from .resume_parser.records import json_default
+from .utils.preflight import admit
+from .utils.sandbox import sandbox_limits
+from .uploads import BULK_PATH, bearer_token, is_bulk_token, query_flag, requested_fields, spooled_stream_factory, upload_limit
+
+# Same name as the Flask blueprint so url_for("main.index") in the
+# templates resolves under both front ends.
+asgi_bp = Blueprint("main", __name__)
+
+
+class SpooledRequest(Request):
+    """
+    Quart request class: spooled file parts and a per-route size limit.
+    Requests are created before any app context exists, so create_asgi_app
+    binds app_config on a per-app subclass.
+    """
+
+    app_config: Mapping[str, Any] = {}
+
+    def __init__(self, method, scheme, path, query_string, headers, *args, **kwargs) -> None:
+        # The body size limit is fixed when the body object is created, so
+        # decide it here from the path and Authorization header.
+        kwargs["max_content_length"] = upload_limit(path, headers, self.app_config)
+        super().__init__(method, scheme, path, query_string, headers, *args, **kwargs)
+
+    def make_form_data_parser(self) -> FormDataParser:
+        return self.form_data_parser_class(
+            stream_factory=spooled_stream_factory(self.app_config["UPLOAD_SPOOL_THRESHOLD"]),
+            max_content_length=self.max_content_length,
+            cls=self.parameter_storage_class,
+        )
+
+
+def create_asgi_app() -> Quart:
+    app = Quart(__name__, template_folder="../templates", static_folder="../static")
+    app.config.from_object("app.config.Config")
+    app.request_class = type("SpooledRequest", (SpooledRequest,), {"app_config": app.config})
+    memprofile.configure_profiling(app.config)
+
+    Path(app.config["UPLOAD_FOLDER"]).mkdir(parents=True, exist_ok=True)
+
+    pool = AnalysisPool(app.config["ANALYSIS_WORKERS"])
+    app.extensions["analysis_pool"] = pool
+    app.extensions["admission"] = Admission(
+        app.config["ANALYSIS_MAX_PENDING"] or 2 * pool.workers,
+        app.config["ADMISSION_LANES"],
+    )
+
+    @app.before_serving
+    async def start_pool() -> None:
+        pool.start()
+
+    @app.after_serving
+    async def stop_pool() -> None:
+        await asyncio.to_thread(pool.shutdown)
+
+    app.register_blueprint(asgi_bp)
+    return app
+
+
+def allowed_file(filename: str) -> bool:
+    _, ext = os.path.splitext(filename)
+    return ext.lower() in current_app.config["ALLOWED_EXTENSIONS"]
+
+
+def client_id() -> str:
+    # The connection's address; put a proxy that sets it correctly in front
+    # rather than trusting client-supplied X-Forwarded-For here.
+    return request.remote_addr or "unknown"
+
+
+async def _analyze_upload(
+    file,
+    lane: str,
+    fields: Optional[List[str]] = None,
+    profile: Optional[str] = None,
+    fuzzy: bool = False,
+    spans: bool = False,
+) -> Dict[str, Any]:
+    """Save the upload, triage it, wait for an analysis slot in lane and run the pipeline."""
+    admission: Admission = current_app.extensions["admission"]
+    pool: AnalysisPool = current_app.extensions["analysis_pool"]
+    # A full lane turns the request away before the upload touches the disk.
+    admission.check_capacity(lane)
+
+    filename = secure_filename(file.filename)
+    ext = Path(filename).suffix
+    file_path = Path(current_app.config["UPLOAD_FOLDER"]) / f"{uuid.uuid4().hex}{ext}"
+
+    # Streamed from the spooled part in chunks; only the path goes to the
+    # worker process.
+    with memprofile.stage("upload"):
+        await file.save(file_path)
+    try:
+        # Rejects (ValueError) before taking a slot.
+        with memprofile.stage("preflight"):
+            triage = await asyncio.to_thread(admit, file_path, sandbox_limits(current_app.config))
+    except ValueError:
+        file_path.unlink(missing_ok=True)
+        raise
+
+    args = (
+        str(file_path),
+        filename,
+        current_app.config.get("EXTRACTOR_BACKENDS"),
+        current_app.config.get("ANALYSIS_CACHE"),
+        fields,
+        profile,
+        fuzzy,
+        # The server process and each pool worker run their own helpers.
+        sandbox_limits(current_app.config),
+        spans,
+    )
+    try:
+        async with admission.slot(lane):
+            if triage.route == "inline":
+                return await asyncio.to_thread(analyze_document, *args)
+            return await pool.run(analyze_document, *args)
+    except Rejected:
+        # The lane filled up while the upload was saved; nothing was analyzed.
+        file_path.unlink(missing_ok=True)
+        raise
+
+
+def _json_response(payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, default=json_default)
+    return Response(body, status=status, headers=headers, mimetype="application/json")
+
+
+def _retry_after(e: Rejected) -> Dict[str, str]:
+    return {"Retry-After": str(e.retry_after)}
+
+
+@asgi_bp.route("/", methods=["GET", "POST"])
+async def index():
+    # --------- POST: user uploaded a resume ---------
+    if request.method == "POST":
+        try:
+            # Before reading the body: a throttled client costs nothing more.
+            current_app.extensions["admission"].check_rate(client_id(), "interactive")
+        except Rejected as e:
+            await flash(f"{e.reason}. Please try again in {e.retry_after} s.", "error")
+            return await render_template("index.html"), 429, _retry_after(e)
+
+        files = await request.files
+        if "resume" not in files:
+            await flash("No file part in the request", "error")
+            return redirect(request.url)
+
+        file = files["resume"]
+        if file.filename == "":
+            await flash("No selected file", "error")
+            return redirect(request.url)
+
+        if not allowed_file(file.filename):
+            await flash("Unsupported file type. Allowed: PDF, DOCX, TXT", "error")
+            return redirect(request.url)
+
+        try:
+            with memprofile.request("interactive"):
+                analysis_result = await _analyze_upload(file, "interactive", spans=True)
+
+                with memprofile.stage("render"):
+                    return await render_template(
+                        "result.html",
+                        result=analysis_result,
+                        page_data=result_page_data(analysis_result),
+                    )
+
+        except Rejected as e:
+            await flash(f"{e.reason}. Please try again in {e.retry_after} s.", "error")
+            return await render_template("index.html"), 429, _retry_after(e)
+
+        except Exception as e:
+            await flash(f"Error processing file: {e}", "error")
+            return redirect(request.url)
+
+    # --------- GET: just show the upload form ---------
+    return await render_template("index.html")
+
+
+@asgi_bp.route(BULK_PATH, methods=["POST"])
+async def api_analyze():
+    """Bulk lane: one multipart "resume" upload in, the analysis as JSON out."""
+    token = bearer_token(request.headers.get("Authorization"))
+    if not is_bulk_token(token, current_app.config["BULK_API_TOKENS"]):
+        return _json_response({"error": "A valid bulk API token is required"}, 401)
+
+    admission: Admission = current_app.extensions["admission"]
+    try:
+        # Bulk clients are rate limited per token, not per address.
+        admission.check_rate(f"token:{token}", "bulk")
+
+        files = await request.files
+        file = files.get("resume")
+        if file is None or file.filename == "":
+            return _json_response({"error": "No file in field 'resume'"}, 400)
+        if not allowed_file(file.filename):
+            return _json_response({"error": "Unsupported file type. Allowed: PDF, DOCX, TXT"}, 400)
+
+        # 422 before waiting for a slot.
+        fields = requested_fields(request.args.get("fields"))
+        if fields is not None:
+            check_fields(fields)
+        profile = request.args.get("profile")
+        get_profile(profile)
+        fuzzy = query_flag(request.args.get("fuzzy_skills"))
+        with memprofile.request("bulk"):
+            result = await _analyze_upload(file, "bulk", fields, profile, fuzzy)
+            with memprofile.stage("render"):
+                return _json_response(result)
+
+    except Rejected as e:
+        return _json_response({"error": e.reason, "retry_after": e.retry_after}, 429, _retry_after(e))
+    except ValueError as e:
+        return _json_response({"error": str(e)}, 422)
+
+
+@asgi_bp.route(SEARCH_PATH, methods=["POST"])
+async def api_search():
+    """Rank the indexed resumes against a job description (see main.api_search)."""
+    if not is_bulk_token(bearer_token(request.headers.get("Authorization")), current_app.config["BULK_API_TOKENS"]):
+        return _json_response({"error": "A valid bulk API token is required"}, 401)
+    payload = await request.get_json(silent=True)
+    # Searching is in-process NumPy work; keep it off the event loop.
+    body, status = await asyncio.to_thread(search_corpus, payload, current_app.config.get("CORPUS_INDEX"))
+    return _json_response(body, status)
+
+
+@asgi_bp.route("/metrics/admission")
+async def admission_metrics():
+    return _json_response(current_app.extensions["admission"].metrics())
+
+
+@asgi_bp.route("/metrics/memory")
+async def memory_metrics():
+    """The server process's memory profile; pool workers log theirs (see main.memory_metrics)."""
+    if not is_bulk_token(bearer_token(request.headers.get("Authorization")), current_app.config["BULK_API_TOKENS"]):
+        return _json_response({"error": "A valid bulk API token is required"}, 401)
+    return _json_response(memprofile.report())
@@ -0,0 +1,168 @@
+# app/cache.py - two-level persistent cache for the analysis pipeline
+#
+#   texts:   (content hash, extractor key)  -> cleaned text + extraction info
+#   results: (text hash, result key)        -> sections, skills, analysis
+#   names:   content hash                   -> file name it was first seen as
+#
+# The extractor key is EXTRACTOR_VERSION plus the configured backend
+# order, since both change the text; the result key is ANALYZER_VERSION
+# plus the as-of month, since ongoing roles are counted up to it.
+# Bumping ANALYZER_VERSION after a regex tweak therefore invalidates only
+# the second level: reprocessing the archive re-runs the analyzer on
+# cached text and never re-opens a PDF. SQLite in WAL mode, so gunicorn
+# workers and pool processes can share one file.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from .resume_parser.records import json_default
+from .utils.source import Source, is_bytes
+
+HASH_CHUNK = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS texts (
+    content_hash  TEXT NOT NULL,
+    extractor_key TEXT NOT NULL,
+    text          TEXT NOT NULL,
+    extraction    TEXT NOT NULL,
+    created       REAL NOT NULL,
+    PRIMARY KEY (content_hash, extractor_key)
+);
+CREATE TABLE IF NOT EXISTS results (
+    text_hash        TEXT NOT NULL,
+    analyzer_version TEXT NOT NULL,
+    result           TEXT NOT NULL,
+    created          REAL NOT NULL,
+    PRIMARY KEY (text_hash, analyzer_version)
+);
+CREATE TABLE IF NOT EXISTS names (
+    content_hash TEXT PRIMARY KEY,
+    file_name    TEXT NOT NULL,
+    created      REAL NOT NULL
+);
+"""
+
+
+def content_hash(source: Source) -> str:
+    h = hashlib.sha256()
+    if is_bytes(source):
+        h.update(source)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread and per process (never reuse one
+        # inherited across fork).
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = self._connect()
+            self._local.pid = os.getpid()
+        return conn
+
+    # ---------- Level 1: extraction ----------
+
+    def get_text(self, content_hash: str, extractor_key: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT text, extraction FROM texts WHERE content_hash = ? AND extractor_key = ?",
+            (content_hash, extractor_key),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"text": row[0], "extraction": json.loads(row[1])}
+
+    def put_text(self, content_hash: str, extractor_key: str, text: str, extraction: Dict[str, Any]) -> None:
+        with self._conn as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO texts VALUES (?, ?, ?, ?, ?)",
+                (content_hash, extractor_key, text, json.dumps(extraction), time.time()),
+            )
+
+    # ---------- File names ----------
+
+    def put_name(self, content_hash: str, file_name: str) -> None:
+        """Record the file name of content_hash; the first one recorded is kept."""
+        with self._conn as conn:
+            conn.execute("INSERT OR IGNORE INTO names VALUES (?, ?, ?)", (content_hash, file_name, time.time()))
+
+    def file_names(self) -> Dict[str, str]:
+        """content hash -> file name, for every document seen."""
+        return dict(self._conn.execute("SELECT content_hash, file_name FROM names"))
+
+    # ---------- Level 2: analysis ----------
+
+    def get_result(self, text_hash: str, analyzer_version: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT result FROM results WHERE text_hash = ? AND analyzer_version = ?",
+            (text_hash, analyzer_version),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_result(self, text_hash: str, analyzer_version: str, result: Dict[str, Any]) -> None:
+        body = json.dumps(result, ensure_ascii=False, default=json_default)
+        with self._conn as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (text_hash, analyzer_version, body, time.time()),
+            )
+
+    def iter_texts(self, extractor_key: str, batch: int = 500):
+        """(content_hash, text) for every document extracted with extractor_key."""
+        # Own connection, so callers can write results while iterating.
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "SELECT content_hash, text FROM texts WHERE extractor_key = ?", (extractor_key,)
+            )
+            while True:
+                rows = cursor.fetchmany(batch)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def prune(self, extractor_key: str, analyzer_version: str) -> Dict[str, int]:
+        """Delete entries under other extractor/result keys."""
+        with self._conn as conn:
+            texts = conn.execute("DELETE FROM texts WHERE extractor_key != ?", (extractor_key,)).rowcount
+            results = conn.execute(
+                "DELETE FROM results WHERE analyzer_version != ?", (analyzer_version,)
+            ).rowcount
+        return {"texts": texts, "results": results}
+
+
+@lru_cache(maxsize=None)
+def get_cache(path: str) -> AnalysisCache:
+    """One AnalysisCache per path and process."""
+    return AnalysisCache(path)
@@ -0,0 +1,191 @@
+# app/cli.py - `flask` commands (FLASK_APP=wsgi.py)
+#
+#   flask reprocess                 # every upload in UPLOAD_FOLDER
+#   flask reprocess archive/ a.pdf  # given files/directories
+#   flask reprocess --cached-text   # no files: re-analyze cached text only
+#
+#   flask corpus update             # index cached texts for /api/search
+#   flask corpus search "python django"   # or --file job.txt
+#   flask corpus experience-update  # month bitmaps from cached analyses
+#   flask corpus experience 3 --category Industry --within 5
+#
+# Only stale layers are recomputed: a file whose text is cached under the
+# current extractor version is not re-extracted, and text whose result is
+# under the current result key (ANALYZER_VERSION and month) is not
+# re-analyzed.
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import click
+from flask import current_app
+
+from .cache import get_cache, text_hash
+from .corpus.bm25 import BM25Index, get_index, sync_index
+from .corpus.experience_index import CATEGORIES, ExperienceBitmapIndex
+from .pipeline import analyze_stage, extractor_key, process_document, result_key
+
+
+def _iter_files(paths: List[Path], extensions) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            for p in sorted(path.rglob("*")):
+                if p.is_file() and p.suffix.lower() in extensions:
+                    yield p
+        elif path.is_file():
+            yield path
+
+
+def _reprocess_file(args: Tuple[str, Optional[Dict], str, date]) -> Tuple[str, Dict[str, bool], Optional[str]]:
+    path, backend_order, cache_path, as_of = args
+    try:
+        _, hits = process_document(path, Path(path).name, backend_order, get_cache(cache_path), as_of=as_of)
+        return path, hits, None
+    except Exception as e:
+        return path, {}, f"{type(e).__name__}: {e}"
+
+
+def _reanalyze_text(args: Tuple[str, str, date]) -> bool:
+    """Analyze one cached text unless its result is current. Returns True if it ran."""
+    text, cache_path, as_of = args
+    cache = get_cache(cache_path)
+    thash = text_hash(text)
+    if cache.get_result(thash, result_key(as_of)) is not None:
+        return False
+    cache.put_result(thash, result_key(as_of), analyze_stage(text, as_of=as_of))
+    return True
+
+
+def register_commands(app) -> None:
+    @app.cli.command("reprocess")
+    @click.argument("paths", nargs=-1, type=click.Path(exists=True, path_type=Path))
+    @click.option("--cached-text", is_flag=True, help="Re-analyze cached text; do not read any files.")
+    @click.option("--jobs", "-j", default=1, show_default=True, help="Worker processes.")
+    @click.option("--prune", is_flag=True, help="Afterwards, delete entries of other versions.")
+    def reprocess(paths, cached_text, jobs, prune):
+        """Bring the analysis cache up to date with the current code."""
+        cache_path = current_app.config.get("ANALYSIS_CACHE")
+        if not cache_path:
+            raise click.UsageError("ANALYSIS_CACHE is disabled.")
+        backend_order = current_app.config.get("EXTRACTOR_BACKENDS")
+        key = extractor_key(backend_order)
+        cache = get_cache(cache_path)
+        # One as-of date for the whole run, so it lands under one result key.
+        as_of = date.today()
+
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            if cached_text:
+                texts = ((text, cache_path, as_of) for _, text in cache.iter_texts(key))
+                ran = list(pool.map(_reanalyze_text, texts, chunksize=32))
+                click.echo(f"texts: {len(ran)}, re-analyzed: {sum(ran)}, up to date: {len(ran) - sum(ran)}")
+            else:
+                files = list(_iter_files(
+                    list(paths) or [Path(current_app.config["UPLOAD_FOLDER"])],
+                    current_app.config["ALLOWED_EXTENSIONS"],
+                ))
+                jobs_args = ((str(p), backend_order, cache_path, as_of) for p in files)
+                extracted = analyzed = failed = 0
+                for path, hits, error in pool.map(_reprocess_file, jobs_args, chunksize=4):
+                    if error:
+                        failed += 1
+                        click.echo(f"{path}: {error}", err=True)
+                        continue
+                    extracted += not hits["text"]
+                    analyzed += not hits["analysis"]
+                click.echo(f"files: {len(files)}, extracted: {extracted}, analyzed: {analyzed}, failed: {failed}")
+
+        if prune:
+            removed = cache.prune(key, result_key(as_of))
+            click.echo(f"pruned: {removed['texts']} texts, {removed['results']} results")
+        click.echo(f"done in {time.perf_counter() - t0:.1f}s")
+
+    @app.cli.group("corpus")
+    def corpus():
+        """Corpus indexes (BM25, experience) of the cached resumes."""
+
+    def _index_path() -> str:
+        path = current_app.config.get("CORPUS_INDEX")
+        if not path:
+            raise click.UsageError("CORPUS_INDEX is disabled.")
+        return path
+
+    @corpus.command("update")
+    @click.option("--rebuild", is_flag=True, help="Start from an empty index.")
+    def corpus_update(rebuild):
+        """Index new cached texts and drop those no longer cached."""
+        path = _index_path()
+        cache_path = current_app.config.get("ANALYSIS_CACHE")
+        if not cache_path:
+            raise click.UsageError("ANALYSIS_CACHE is disabled.")
+        key = extractor_key(current_app.config.get("EXTRACTOR_BACKENDS"))
+
+        t0 = time.perf_counter()
+        index = BM25Index() if rebuild or not (Path(path) / "meta.json").exists() else BM25Index.load(path)
+        cache = get_cache(cache_path)
+        counts = sync_index(index, cache.iter_texts(key), cache.file_names())
+        index.save(path)
+        click.echo(f"documents: {counts['documents']}, added: {counts['added']}, removed: {counts['removed']}")
+        click.echo(f"done in {time.perf_counter() - t0:.1f}s")
+
+    @corpus.command("search")
+    @click.argument("query", required=False)
+    @click.option("--file", "query_file", type=click.File("r"), help="Read the query (a job description) from a file.")
+    @click.option("-k", default=10, show_default=True, help="Results to show.")
+    def corpus_search(query, query_file, k):
+        """Rank the indexed resumes against a query."""
+        if query_file is not None:
+            query = query_file.read()
+        if not query:
+            raise click.UsageError("Give a query or --file.")
+        index = get_index(_index_path())
+        if index is None:
+            raise click.UsageError("No index yet; run `flask corpus update`.")
+        for doc_id, score in index.search(query, k):
+            click.echo(f"{score:8.3f}  {doc_id[:12]}  {index.names.get(doc_id, '-')}")
+
+    def _experience_path() -> str:
+        path = current_app.config.get("EXPERIENCE_INDEX")
+        if not path:
+            raise click.UsageError("EXPERIENCE_INDEX is disabled.")
+        return path
+
+    @corpus.command("experience-update")
+    def corpus_experience_update():
+        """Rebuild the experience bitmaps from the cached analysis results."""
+        path = _experience_path()
+        cache_path = current_app.config.get("ANALYSIS_CACHE")
+        if not cache_path:
+            raise click.UsageError("ANALYSIS_CACHE is disabled.")
+        cache = get_cache(cache_path)
+        key = extractor_key(current_app.config.get("EXTRACTOR_BACKENDS"))
+
+        # Ongoing roles are counted up to today, so rebuild regularly.
+        t0 = time.perf_counter()
+        index = ExperienceBitmapIndex()
+        unanalyzed = 0
+        for chash, text in cache.iter_texts(key):
+            result = cache.get_result(text_hash(text), result_key())
+            if result is None:
+                unanalyzed += 1
+                continue
+            index.add_history(chash, result["advanced"].get("experience_history") or [])
+        index.save(path)
+        click.echo(f"candidates: {len(index)}, not analyzed (run `flask reprocess --cached-text`): {unanalyzed}")
+        click.echo(f"done in {time.perf_counter() - t0:.1f}s")
+
+    @corpus.command("experience")
+    @click.argument("min_years", type=float)
+    @click.option("--category", type=click.Choice(CATEGORIES), help="Count one category only (default: any).")
+    @click.option("--within", "within_years", type=float, help="Only months in the last N years.")
+    def corpus_experience(min_years, category, within_years):
+        """Candidates with at least MIN_YEARS of experience."""
+        path = Path(_experience_path())
+        if not path.with_suffix(".npy").exists():
+            raise click.UsageError("No index yet; run `flask corpus experience-update`.")
+        index = ExperienceBitmapIndex.load(path)
+        for candidate_id in index.query(min_years, category, within_years, date.today()):
+            click.echo(candidate_id)
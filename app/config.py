@@ -3,8 +3,79 @@ import os
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret-key")
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
+    UPLOAD_FOLDER = os.environ.get("UPLOAD_FOLDER", os.path.join(BASE_DIR, "uploads"))
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5 MB max upload size
 
+    # Uploads larger than this are spooled to a temp file while they are
+    # received instead of being held in memory (see app.uploads).
+    UPLOAD_SPOOL_THRESHOLD = int(os.environ.get("UPLOAD_SPOOL_THRESHOLD", 512 * 1024))
+
+    # Bearer tokens accepted on the bulk API (/api/analyze), which also
+    # allows larger uploads. Comma separated; empty disables the route.
+    BULK_API_TOKENS = [t.strip() for t in os.environ.get("BULK_API_TOKENS", "").split(",") if t.strip()]
+    BULK_MAX_CONTENT_LENGTH = int(os.environ.get("BULK_MAX_CONTENT_LENGTH", 50 * 1024 * 1024))
+
+    # SQLite cache of extracted text and analysis results (app.cache).
+    # Set ANALYSIS_CACHE="" to disable.
+    ANALYSIS_CACHE = os.environ.get("ANALYSIS_CACHE", os.path.join(BASE_DIR, "cache", "analysis.sqlite3"))
+
+    # BM25 index of the cached resume texts (app.corpus.bm25), built by
+    # `flask corpus update` and searched on /api/search. "" disables.
+    CORPUS_INDEX = os.environ.get("CORPUS_INDEX", os.path.join(BASE_DIR, "cache", "bm25"))
+
+    # Month bitmaps of the cached candidates' experience
+    # (app.corpus.experience_index), built by `flask corpus
+    # experience-update`. "" disables.
+    EXPERIENCE_INDEX = os.environ.get("EXPERIENCE_INDEX", os.path.join(BASE_DIR, "cache", "experience"))
+
+    # Uploads are extracted in helper processes with rlimits and time
+    # budgets (app.utils.sandbox); over budget, the pages read so far are
+    # analyzed. Helpers per server process: one per gunicorn thread by
+    # default. A helper is replaced after MAX_DOCUMENTS documents or once
+    # its peak RSS passes MAX_RSS_MB. EXTRACTION_SANDBOX=0 extracts in-process.
+    EXTRACTION_SANDBOX = os.environ.get("EXTRACTION_SANDBOX", "1").strip().lower() in ("1", "true", "yes", "on")
+    SANDBOX_HELPERS = int(os.environ.get("SANDBOX_HELPERS", os.environ.get("GUNICORN_THREADS", "1")))
+    SANDBOX_MEMORY_MB = int(os.environ.get("SANDBOX_MEMORY_MB", "1024"))
+    SANDBOX_CPU_SECONDS = int(os.environ.get("SANDBOX_CPU_SECONDS", "20"))
+    SANDBOX_DOCUMENT_SECONDS = float(os.environ.get("SANDBOX_DOCUMENT_SECONDS", "20"))
+    SANDBOX_PAGE_SECONDS = float(os.environ.get("SANDBOX_PAGE_SECONDS", "5"))
+    SANDBOX_MAX_DOCUMENTS = int(os.environ.get("SANDBOX_MAX_DOCUMENTS", "200"))
+    SANDBOX_MAX_RSS_MB = int(os.environ.get("SANDBOX_MAX_RSS_MB", "512"))
+
+    # Memory diagnostics (app.memprofile): each pipeline stage is traced
+    # with tracemalloc and the TOP allocating lines (FRAMES deep) kept per
+    # request type, served on /metrics/memory and logged every LOG_EVERY
+    # requests. Worker recycling by RSS is WORKER_MAX_RSS_MB (gunicorn.conf.py).
+    MEMORY_PROFILE = os.environ.get("MEMORY_PROFILE", "0").strip().lower() in ("1", "true", "yes", "on")
+    MEMORY_PROFILE_TOP = int(os.environ.get("MEMORY_PROFILE_TOP", "10"))
+    MEMORY_PROFILE_FRAMES = int(os.environ.get("MEMORY_PROFILE_FRAMES", "1"))
+    MEMORY_PROFILE_LOG_EVERY = int(os.environ.get("MEMORY_PROFILE_LOG_EVERY", "100"))
+
     # Allowed resume extensions
-    ALLOWED_EXTENSIONS = {".pdf", ".docx", ".txt"}
\ No newline at end of file
+    ALLOWED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+
+    # Extractor backends tried per sniffed format, in order (see
+    # app.utils.file_extractor). Formats not listed use cheapest-first.
+    EXTRACTOR_BACKENDS = {
+        "pdf": os.environ.get("PDF_BACKENDS", "pymupdf-layout,pdfplumber").split(","),
+    }
+
+    # ASGI front end (app.asgi): size of the shared analysis process pool
+    # (0 = one worker per core) and how many jobs may run or be submitted
+    # to it at once (0 = twice the pool size).
+    ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", "0")) or None
+    ANALYSIS_MAX_PENDING = int(os.environ.get("ANALYSIS_MAX_PENDING", "0")) or None
+
+    # Admission control per lane (app.admission): interactive = upload
+    # page, bulk = /api/analyze (per token). Keys not given fall back to
+    # app.admission.DEFAULT_LANES.
+    ADMISSION_LANES = {
+        "interactive": {
+            "rate": float(os.environ.get("INTERACTIVE_RATE", "1.0")),
+            "max_wait": float(os.environ.get("INTERACTIVE_MAX_WAIT", "10")),
+        },
+        "bulk": {
+            "rate": float(os.environ.get("BULK_RATE", "20.0")),
+            "max_wait": float(os.environ.get("BULK_MAX_WAIT", "120")),
+        },
+    }
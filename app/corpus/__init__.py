@@ -0,0 +1,2 @@
+# Corpus-level tools: indexes and stores that work across many parsed
+# resumes rather than on a single document.
@@ -0,0 +1,433 @@
+# app/corpus/bm25.py - BM25 search over the cleaned text of parsed resumes
+#
+# An inverted index over the word tokens the gazetteer uses
+# (resume_parser.trie.tokenize on clean_text output), so a job description
+# and a resume normalize the same way. Term frequencies are weighted by the
+# section a token sits in (a skill under SKILLS counts more than one in the
+# declaration), BM25F style.
+#
+# Storage is two segments: a base of flat NumPy arrays (postings sorted by
+# document number, one slice per term) that is memory-mapped on load, and
+# an in-memory tail for documents added since. Removing a document marks
+# it dead; as with Lucene deletes, dead documents still count in the
+# collection statistics until save() writes one compact segment.
+#
+# A saved index is a symlink to a versioned directory. save() writes a new
+# version and swaps the link in one rename, so a reader sees either the
+# old index or the new one, never a mix.
+#
+# Queries run term at a time in decreasing order of each term's score upper
+# bound (MaxScore). Once the k-th best score exceeds what the remaining
+# terms could add, no unseen document can reach the top k, and the rest of
+# the terms only update the surviving candidates.
+
+import json
+import math
+import os
+import shutil
+import uuid
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from ..resume_parser.section_extractor import section_ranges
+from ..resume_parser.text_cleaner import clean_text
+from ..resume_parser.trie import tokenize
+
+K1 = 1.2
+B = 0.75
+
+# Section kind (see section_extractor.SECTION_KINDS) -> term weight; others 1.
+SECTION_WEIGHTS: Dict[str, float] = {
+    "skills": 2.0,
+    "experience": 1.5,
+    "internships": 1.5,
+    "projects": 1.5,
+    "summary": 1.2,
+    "other": 0.5,
+    "personal": 0.2,
+    "declaration": 0.0,
+}
+
+# Candidates are looked up in a posting list by binary search while there
+# are this many times fewer of them than postings, else by a dense mask.
+SEARCH_RATIO = 16
+
+_ARRAYS = ("docs", "tfs", "offsets", "max_tf", "min_dl", "doc_len")
+
+
+def weighted_terms(text: str) -> Tuple[Dict[str, float], float]:
+    """Section-weighted term frequencies of a document, and its weighted length."""
+    _, lines = clean_text(text)
+    weights = [1.0] * len(lines)
+    for kind, spans in section_ranges(lines).items():
+        weight = SECTION_WEIGHTS.get(kind, 1.0)
+        for start, end in spans:
+            weights[start:end] = [weight] * (end - start)
+
+    tf: Dict[str, float] = {}
+    length = 0.0
+    for line, weight in zip(lines, weights):
+        if not weight:
+            continue
+        for token in tokenize(line):
+            tf[token] = tf.get(token, 0.0) + weight
+            length += weight
+    return tf, length
+
+
+def query_terms(query: str) -> Counter:
+    return Counter(tokenize(clean_text(query)[0]))
+
+
+class BM25Index:
+    """
+    Incremental BM25 index. Not safe for concurrent writers; servers load a
+    saved index read-only (get_index) and a batch job updates and saves it.
+    """
+
+    def __init__(self, k1: float = K1, b: float = B) -> None:
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []          # by document number, dead ones included
+        self._docno: Dict[str, int] = {}  # live documents only
+        self.names: Dict[str, str] = {}   # doc_id -> file name, where known
+        self._doc_len = array("f")
+        self._live = bytearray()
+        self._total_len = 0.0
+
+        # Base segment.
+        self._vocab: Dict[str, int] = {}
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.float32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._max_tf = np.zeros(0, dtype=np.float32)
+        self._min_dl = np.zeros(0, dtype=np.float32)
+
+        # Tail segment: term -> (document numbers, tfs), and per-term bounds.
+        self._tail: Dict[str, Tuple[array, array]] = {}
+        self._tail_bounds: Dict[str, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docno)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docno
+
+    # ---------- Building ----------
+
+    def add(self, doc_id: str, text: str, name: Optional[str] = None) -> None:
+        """Index text (replacing doc_id's previous text, if any)."""
+        if doc_id in self._docno:
+            self.remove(doc_id)
+        tf, length = weighted_terms(text)
+        if name is not None:
+            self.names[doc_id] = name
+
+        docno = len(self.ids)
+        self.ids.append(doc_id)
+        self._docno[doc_id] = docno
+        self._doc_len.append(length)
+        self._live.append(1)
+        self._total_len += length
+
+        for term, freq in tf.items():
+            postings = self._tail.get(term)
+            if postings is None:
+                postings = self._tail[term] = (array("i"), array("f"))
+            postings[0].append(docno)
+            postings[1].append(freq)
+            max_tf, min_dl = self._tail_bounds.get(term, (0.0, math.inf))
+            self._tail_bounds[term] = (max(max_tf, freq), min(min_dl, length))
+
+    def remove(self, doc_id: str) -> bool:
+        docno = self._docno.pop(doc_id, None)
+        if docno is None:
+            return False
+        self._live[docno] = 0
+        self.names.pop(doc_id, None)
+        return True
+
+    # ---------- Postings ----------
+
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        parts_docs, parts_tfs = [], []
+        t = self._vocab.get(term)
+        if t is not None:
+            lo, hi = self._offsets[t], self._offsets[t + 1]
+            parts_docs.append(self._docs[lo:hi])
+            parts_tfs.append(self._tfs[lo:hi])
+        tail = self._tail.get(term)
+        if tail is not None:
+            parts_docs.append(np.frombuffer(tail[0], dtype=np.int32))
+            parts_tfs.append(np.frombuffer(tail[1], dtype=np.float32))
+        if len(parts_docs) == 1:
+            return parts_docs[0], parts_tfs[0]
+        if not parts_docs:
+            return self._docs[:0], self._tfs[:0]
+        # Tail document numbers are all above the base's, so still sorted.
+        return np.concatenate(parts_docs), np.concatenate(parts_tfs)
+
+    def _term_stats(self, term: str) -> Tuple[int, float, float]:
+        """(document frequency, max tf, min document length) of term."""
+        df, max_tf, min_dl = 0, 0.0, math.inf
+        t = self._vocab.get(term)
+        if t is not None:
+            df = int(self._offsets[t + 1] - self._offsets[t])
+            max_tf, min_dl = float(self._max_tf[t]), float(self._min_dl[t])
+        tail = self._tail.get(term)
+        if tail is not None:
+            df += len(tail[0])
+            tail_max, tail_min = self._tail_bounds[term]
+            max_tf, min_dl = max(max_tf, tail_max), min(min_dl, tail_min)
+        return df, max_tf, min_dl
+
+    # ---------- Queries ----------
+
+    def search(self, query: str, k: int = 10, prune: bool = True) -> List[Tuple[str, float]]:
+        """The k best (doc_id, score) for query, best first."""
+        n = len(self.ids)
+        if not n or not self._docno or k <= 0:
+            return []
+        k1, b = self.k1, self.b
+        avgdl = self._total_len / n or 1.0
+        doc_len = np.frombuffer(self._doc_len, dtype=np.float32)
+        live = np.frombuffer(self._live, dtype=np.uint8).astype(np.float32)
+
+        terms = []
+        for term, qtf in query_terms(query).items():
+            df, max_tf, min_dl = self._term_stats(term)
+            if not df:
+                continue
+            weight = qtf * math.log(1 + (n - df + 0.5) / (df + 0.5))
+            # tf (k1+1) / (tf + norm) grows with tf and shrinks with the
+            # document length, so max tf with min length bounds every posting.
+            bound = weight * max_tf * (k1 + 1) / (max_tf + k1 * (1 - b + b * min_dl / avgdl))
+            terms.append((bound, term, weight))
+        terms.sort(reverse=True)
+
+        scores = np.zeros(n, dtype=np.float32)
+        remaining = sum(bound for bound, _, _ in terms)
+        seen = 0.0
+        threshold = 0.0
+        candidates: Optional[np.ndarray] = None
+        is_candidate: Optional[np.ndarray] = None
+
+        for bound, term, weight in terms:
+            remaining -= bound
+            seen += bound
+            docs, tfs = self._postings(term)
+            if candidates is not None and len(docs):
+                if len(candidates) * SEARCH_RATIO < len(docs):
+                    pos = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                    hit = docs[pos] == candidates
+                    docs, tfs = candidates[hit], tfs[pos[hit]]
+                else:
+                    hit = is_candidate[docs]
+                    docs, tfs = docs[hit], tfs[hit]
+            norm = k1 * (1 - b + b * doc_len[docs] / avgdl)
+            scores[docs] += weight * tfs * (k1 + 1) / (tfs + norm) * live[docs]
+
+            # No score can exceed the bounds seen so far, so until those
+            # outweigh the rest the k-th score can't either. The k-th score
+            # only grows, so a failed check is retried only once the rest has
+            # fallen below it: the full partition is the costly step.
+            if not prune or seen <= remaining:
+                continue
+            if candidates is None and 0 < threshold <= remaining:
+                continue
+            pool = scores if candidates is None else scores[candidates]
+            if len(pool) <= k:
+                continue
+            threshold = float(np.partition(pool, len(pool) - k)[len(pool) - k])
+            if candidates is None:
+                if threshold > remaining:
+                    candidates = np.flatnonzero(scores + remaining >= threshold)
+                    is_candidate = np.zeros(n, dtype=bool)
+                    is_candidate[candidates] = True
+            else:
+                keep = pool + remaining >= threshold
+                is_candidate[candidates[~keep]] = False
+                candidates = candidates[keep]
+
+        hits = np.flatnonzero(scores > 0) if candidates is None else candidates[scores[candidates] > 0]
+        if len(hits) > k:
+            kth = np.partition(scores[hits], len(hits) - k)[len(hits) - k]
+            hits = hits[scores[hits] >= kth]
+        # Best first; ties in document order (hits is ascending).
+        hits = hits[np.argsort(-scores[hits], kind="stable")][:k]
+        return [(self.ids[i], float(scores[i])) for i in hits]
+
+    # ---------- Persistence ----------
+
+    def _compacted(self) -> Tuple[List[str], Dict[str, np.ndarray], List[str]]:
+        """Base and tail merged into one segment of live documents only."""
+        n = len(self.ids)
+        live = np.frombuffer(self._live, dtype=np.uint8).astype(bool)
+        remap = np.full(n, -1, dtype=np.int32)
+        remap[live] = np.arange(int(live.sum()), dtype=np.int32)
+
+        vocab = list(self._vocab)
+        term_ids = dict(self._vocab)
+        base_terms = np.repeat(np.arange(len(vocab), dtype=np.int32), np.diff(self._offsets))
+        all_terms, all_docs, all_tfs = [base_terms], [np.asarray(self._docs)], [np.asarray(self._tfs)]
+        for term, (docs, tfs) in self._tail.items():
+            t = term_ids.get(term)
+            if t is None:
+                t = term_ids[term] = len(vocab)
+                vocab.append(term)
+            all_terms.append(np.full(len(docs), t, dtype=np.int32))
+            all_docs.append(np.frombuffer(docs, dtype=np.int32))
+            all_tfs.append(np.frombuffer(tfs, dtype=np.float32))
+
+        terms = np.concatenate(all_terms)
+        docs = np.concatenate(all_docs)
+        tfs = np.concatenate(all_tfs)
+        keep = live[docs] if len(docs) else np.zeros(0, dtype=bool)
+        terms, docs, tfs = terms[keep], remap[docs[keep]], tfs[keep]
+
+        # Renumber terms that still have postings, in vocabulary order.
+        counts = np.bincount(terms, minlength=len(vocab))
+        used = counts > 0
+        term_remap = np.cumsum(used) - 1
+        vocab = [term for term, u in zip(vocab, used) if u]
+        terms = term_remap[terms]
+        counts = counts[used]
+
+        order = np.lexsort((docs, terms))
+        docs, tfs = docs[order], tfs[order]
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        doc_len = np.frombuffer(self._doc_len, dtype=np.float32)[live]
+        starts = offsets[:-1]
+        arrays = {
+            "docs": docs.astype(np.int32),
+            "tfs": tfs.astype(np.float32),
+            "offsets": offsets,
+            "max_tf": np.maximum.reduceat(tfs, starts).astype(np.float32) if len(vocab) else np.zeros(0, np.float32),
+            "min_dl": np.minimum.reduceat(doc_len[docs], starts).astype(np.float32) if len(vocab) else np.zeros(0, np.float32),
+            "doc_len": doc_len.copy(),
+        }
+        ids = [doc_id for doc_id, alive in zip(self.ids, live) if alive]
+        return ids, arrays, vocab
+
+    def _set_base(self, ids: List[str], arrays: Dict[str, np.ndarray], vocab: List[str]) -> None:
+        self.ids = ids
+        self._docno = {doc_id: i for i, doc_id in enumerate(ids)}
+        self._doc_len = array("f", arrays["doc_len"].astype(np.float32).tobytes())
+        self._live = bytearray(b"\x01" * len(ids))
+        self._total_len = float(np.sum(arrays["doc_len"], dtype=np.float64))
+        self._vocab = {term: i for i, term in enumerate(vocab)}
+        self._docs, self._tfs = arrays["docs"], arrays["tfs"]
+        self._offsets, self._max_tf, self._min_dl = arrays["offsets"], arrays["max_tf"], arrays["min_dl"]
+        self._tail = {}
+        self._tail_bounds = {}
+        self.names = {doc_id: name for doc_id, name in self.names.items() if doc_id in self._docno}
+
+    def compact(self) -> None:
+        """Drop dead documents and merge the tail into the base segment."""
+        self._set_base(*self._compacted())
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Compact and write the index: one .npy file per array plus meta.json
+        in a new directory next to path, then point the symlink path at it.
+        """
+        self.compact()
+        path = Path(path)
+        version = path.with_name(f"{path.name}.{uuid.uuid4().hex[:12]}")
+        version.mkdir(parents=True)
+
+        arrays = {
+            "docs": self._docs, "tfs": self._tfs, "offsets": self._offsets,
+            "max_tf": self._max_tf, "min_dl": self._min_dl,
+            "doc_len": np.frombuffer(self._doc_len, dtype=np.float32),
+        }
+        for name in _ARRAYS:
+            np.save(version / f"{name}.npy", arrays[name])
+        meta = {"k1": self.k1, "b": self.b, "ids": self.ids, "vocab": list(self._vocab), "names": self.names}
+        (version / "meta.json").write_text(json.dumps(meta, ensure_ascii=False))
+
+        previous = None
+        if path.is_symlink():
+            previous = path.parent / os.readlink(path)
+        elif path.is_dir():
+            # Saved before indexes were versioned: move it aside once.
+            previous = path.with_name(path.name + ".old")
+            shutil.rmtree(previous, ignore_errors=True)
+            os.replace(path, previous)
+        link = path.with_name(path.name + ".link")
+        link.unlink(missing_ok=True)
+        link.symlink_to(version.name)
+        os.replace(link, path)
+        # Processes that mapped the old version keep their open files.
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "BM25Index":
+        """Load a saved index; with mmap the postings stay on disk and are paged in on demand."""
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        index = cls(meta["k1"], meta["b"])
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in _ARRAYS
+        }
+        index.names = meta.get("names", {})
+        index._set_base(meta["ids"], arrays, meta["vocab"])
+        return index
+
+
+_loaded: Dict[str, Tuple[str, BM25Index]] = {}
+
+
+def get_index(path: Union[str, Path]) -> Optional[BM25Index]:
+    """
+    The saved index at path, loaded once per process and reloaded after
+    the next save(). None if nothing has been saved there yet.
+    """
+    # Loaded from the version the link resolves to now, so a save() in
+    # between cannot mix two versions.
+    version = os.path.realpath(path)
+    key = str(path)
+    cached = _loaded.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    try:
+        index = BM25Index.load(version)
+    except FileNotFoundError:
+        # Nothing saved yet, or the version was replaced while loading:
+        # keep serving what we have.
+        return cached[1] if cached is not None else None
+    _loaded[key] = (version, index)
+    return index
+
+
+def sync_index(
+    index: BM25Index, documents: Iterable[Tuple[str, str]], names: Optional[Mapping[str, str]] = None
+) -> Dict[str, int]:
+    """
+    Make index hold exactly documents ((doc_id, text) pairs): add the new
+    ones and remove those no longer present. Texts of ids already indexed
+    are not re-read, since ids are content hashes. names (doc_id -> file
+    name) labels the documents in search results.
+    """
+    names = names or {}
+    seen = set()
+    added = 0
+    for doc_id, text in documents:
+        seen.add(doc_id)
+        if doc_id not in index:
+            index.add(doc_id, text, names.get(doc_id))
+            added += 1
+        elif doc_id not in index.names and doc_id in names:
+            index.names[doc_id] = names[doc_id]
+    stale = [doc_id for doc_id in list(index._docno) if doc_id not in seen]
+    for doc_id in stale:
+        index.remove(doc_id)
+    return {"added": added, "removed": len(stale), "documents": len(index)}
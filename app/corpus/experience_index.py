@@ -0,0 +1,181 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..resume_parser.timeline import merge_intervals, month_interval, month_ordinal
+
+# Every candidate gets one bit per calendar month per category, packed into
+# uint8 rows over a fixed epoch. Window queries are then an AND with a mask
+# and a popcount, vectorised over the whole pool.
+
+EPOCH_YEAR = 1960
+END_YEAR = 2060
+N_MONTHS = (END_YEAR - EPOCH_YEAR) * 12
+N_BYTES = (N_MONTHS + 7) // 8
+
+CATEGORIES = ("Teaching", "Industry", "Other")
+
+# Month ordinals follow resume_parser.timeline: year * 12 + month.
+_EPOCH_ORD = EPOCH_YEAR * 12 + 1
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Rows are popcounted in chunks so temporaries stay bounded on big pools.
+_CHUNK_ROWS = 65536
+
+
+def _window_mask(start_ord: Optional[int], end_ord: Optional[int]) -> np.ndarray:
+    bits = np.zeros(N_MONTHS, dtype=bool)
+    lo = 0 if start_ord is None else max(0, start_ord - _EPOCH_ORD)
+    hi = N_MONTHS if end_ord is None else min(N_MONTHS, end_ord - _EPOCH_ORD)
+    if hi > lo:
+        bits[lo:hi] = True
+    return np.packbits(bits)
+
+
+def intervals_from_history(
+    experience_history: Iterable[Dict[str, Any]], as_of: Optional[date] = None
+) -> Dict[str, List[Tuple[int, int]]]:
+    """Half-open month intervals per category from extract_experience_history rows."""
+    as_of = as_of or date.today()
+    intervals: Dict[str, List[Tuple[int, int]]] = {c: [] for c in CATEGORIES}
+
+    for e in experience_history:
+        if not e.get("start_year") or not (e.get("ongoing") or e.get("end_year")):
+            continue
+        start, end = month_interval(
+            e["start_year"], e.get("start_month"), e.get("end_year"), e.get("end_month"), bool(e.get("ongoing")), as_of
+        )
+        if end > start:
+            category = e.get("category") if e.get("category") in intervals else "Other"
+            intervals[category].append((start, end))
+
+    return intervals
+
+
+class ExperienceBitmapIndex:
+    """
+    Per-candidate, per-category employment month bitmaps.
+
+    rows has shape (n_candidates, len(CATEGORIES), N_BYTES); ids[i] is the
+    candidate id of row i.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.ids: List[str] = []
+        self._rows = np.zeros((capacity, len(CATEGORIES), N_BYTES), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self._rows[: len(self.ids)]
+
+    # ---------- Building ----------
+
+    def add(self, candidate_id: str, intervals: Dict[str, List[Tuple[int, int]]]) -> None:
+        n = len(self.ids)
+        if n == self._rows.shape[0]:
+            grown = np.zeros((max(1, n) * 2, len(CATEGORIES), N_BYTES), dtype=np.uint8)
+            grown[:n] = self._rows[:n]
+            self._rows = grown
+
+        bits = np.zeros((len(CATEGORIES), N_MONTHS), dtype=bool)
+        for c, category in enumerate(CATEGORIES):
+            for start, end in merge_intervals(intervals.get(category, [])):
+                lo = max(0, start - _EPOCH_ORD)
+                hi = min(N_MONTHS, end - _EPOCH_ORD)
+                if hi > lo:
+                    bits[c, lo:hi] = True
+
+        self._rows[n] = np.packbits(bits, axis=-1)
+        self.ids.append(candidate_id)
+
+    def add_history(
+        self,
+        candidate_id: str,
+        experience_history: Iterable[Dict[str, Any]],
+        as_of: Optional[date] = None,
+    ) -> None:
+        self.add(candidate_id, intervals_from_history(experience_history, as_of))
+
+    # ---------- Queries ----------
+
+    def months(
+        self,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> np.ndarray:
+        """
+        Months of experience per candidate within [start, end) (whole
+        epoch when omitted). category=None counts the union of all
+        categories, so concurrent roles are counted once.
+        """
+        mask = _window_mask(
+            month_ordinal(start.year, start.month) if start else None,
+            month_ordinal(end.year, end.month) if end else None,
+        )
+        rows = self.rows
+        out = np.empty(len(rows), dtype=np.int32)
+
+        for lo in range(0, len(rows), _CHUNK_ROWS):
+            chunk = rows[lo: lo + _CHUNK_ROWS]
+            if category is None:
+                bits = np.bitwise_or.reduce(chunk, axis=1)
+            else:
+                bits = chunk[:, CATEGORIES.index(category)]
+            out[lo: lo + len(chunk)] = _POPCOUNT[bits & mask].sum(axis=-1, dtype=np.int32)
+
+        return out
+
+    def totals(self) -> Dict[str, np.ndarray]:
+        """Whole-career months per candidate: one array per category plus "Total"."""
+        result = {category: self.months(category) for category in CATEGORIES}
+        result["Total"] = self.months(None)
+        return result
+
+    def query(
+        self,
+        min_years: float,
+        category: Optional[str] = None,
+        within_years: Optional[float] = None,
+        as_of: Optional[date] = None,
+    ) -> List[str]:
+        """
+        Candidate ids with at least min_years of experience (optionally in
+        one category) inside the last within_years before as_of, e.g.
+        query(3, "Industry", within_years=5).
+        """
+        start = end = None
+        if within_years is not None:
+            as_of = as_of or date.today()
+            end_ord = month_ordinal(as_of.year, as_of.month) + 1
+            start_ord = end_ord - int(round(within_years * 12))
+            start = date((start_ord - 1) // 12, (start_ord - 1) % 12 + 1, 1)
+            end = date((end_ord - 1) // 12, (end_ord - 1) % 12 + 1, 1)
+
+        months = self.months(category, start, end)
+        hits = np.nonzero(months >= int(round(min_years * 12)))[0]
+        return [self.ids[i] for i in hits]
+
+    # ---------- Persistence ----------
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path.with_suffix(".npy"), self.rows)
+        path.with_suffix(".ids.json").write_text(json.dumps(self.ids))
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "ExperienceBitmapIndex":
+        """Load a saved index; with mmap the bitmaps stay on disk and are paged in on demand."""
+        path = Path(path)
+        index = cls(capacity=0)
+        index._rows = np.load(path.with_suffix(".npy"), mmap_mode="r" if mmap else None)
+        index.ids = json.loads(path.with_suffix(".ids.json").read_text())
+        return index
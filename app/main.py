@@ -1,17 +1,21 @@
-from flask import Blueprint, render_template, request, current_app, redirect, url_for, flash
+from flask import Blueprint, render_template, request, current_app, redirect, url_for, flash, jsonify
 from werkzeug.utils import secure_filename
 from pathlib import Path
 import os
 import uuid
 import json
-import re
-import html
+from typing import Any, Dict, Optional, Tuple
 
-from .resume_parser.text_cleaner import clean_text
-from .resume_parser.section_extractor import extract_sections
-from .resume_parser.skill_extractor import extract_skills
-from .resume_parser.advanced_analyzer import analyze_resume_text
-from .utils.file_extractor import extract_text_from_bytes
+from jinja2.utils import htmlsafe_json_dumps
+from markupsafe import Markup
+
+from . import memprofile
+from .corpus.bm25 import get_index
+from .pipeline import analyze_document
+from .resume_parser.records import json_default
+from .utils.preflight import admit
+from .utils.sandbox import sandbox_limits
+from .uploads import BULK_PATH, bearer_token, is_bulk_token, query_flag, requested_fields
 
 main_bp = Blueprint("main", __name__)
 
@@ -21,70 +25,64 @@ def allowed_file(filename: str) -> bool:
     return ext.lower() in current_app.config["ALLOWED_EXTENSIONS"]
 
 
-def build_highlighted_text(raw_text: str, advanced: dict) -> str:
+def save_upload(file) -> Path:
+    """Stream the (spooled) upload into UPLOAD_FOLDER under a unique name."""
+    filename = secure_filename(file.filename)
+    ext = Path(filename).suffix
+    file_path = Path(current_app.config["UPLOAD_FOLDER"]) / f"{uuid.uuid4().hex}{ext}"
+    file.save(file_path)   # shutil.copyfileobj in chunks
+    return file_path
+
+
+def admit_upload(file_path: Path) -> None:
+    """preflight.admit; a rejected upload is deleted rather than kept."""
+    try:
+        admit(file_path, sandbox_limits(current_app.config))
+    except ValueError:
+        file_path.unlink(missing_ok=True)
+        raise
+
+
+SEARCH_PATH = "/api/search"
+MAX_SEARCH_K = 100
+
+
+def search_corpus(payload: Any, index_path: Optional[str]) -> Tuple[Dict[str, Any], int]:
+    """Run a /api/search request body against the corpus index: (JSON body, status)."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("query"), str) or not payload["query"].strip():
+        return {"error": "Body must be JSON with a non-empty 'query' string"}, 400
+    k = payload.get("k", 10)
+    if not isinstance(k, int) or not 0 < k <= MAX_SEARCH_K:
+        return {"error": f"'k' must be an integer from 1 to {MAX_SEARCH_K}"}, 400
+    index = get_index(index_path) if index_path else None
+    if index is None:
+        return {"error": "No corpus index; run `flask corpus update`"}, 503
+    hits = index.search(payload["query"], k)
+    return {
+        "results": [
+            {"id": doc_id, "file_name": index.names.get(doc_id), "score": round(score, 4)}
+            for doc_id, score in hits
+        ]
+    }, 200
+
+
+def result_page_data(result: dict) -> Markup:
     """
-    Build HTML version of raw_text with degree-related parts and
-    experience-related parts highlighted using <mark> tags.
-    Degree highlights -> .hl-degree
-    Experience highlights -> .hl-exp
+    Everything the result page's script needs as one HTML-safe JSON block:
+    the entity spans and the structured result. The cleaned text is
+    rendered into the page as plain text (readable without JavaScript);
+    static/result.js adds the highlights to it.
     """
-    # Start from HTML-escaped text for safety
-    text_html = html.escape(raw_text)
-
-    degree_phrases = set()
-    exp_phrases = set()
-
-    # Collect degree-related phrases
-    for deg in advanced.get("degrees_info", []):
-        if deg.get("raw_text"):
-            degree_phrases.add(deg["raw_text"])
-        if deg.get("institution"):
-            degree_phrases.add(deg["institution"])
-        if deg.get("field_of_study"):
-            degree_phrases.add(deg["field_of_study"])
-
-    # Collect experience-related phrases
-    for exp in advanced.get("experience_history", []):
-        if exp.get("raw_text"):
-            exp_phrases.add(exp["raw_text"])
-        if exp.get("organization"):
-            exp_phrases.add(exp["organization"])
-        if exp.get("title"):
-            exp_phrases.add(exp["title"])
-
-    # Clean and sort phrases by length (longest first)
-    degree_list = sorted(
-        [p for p in degree_phrases if len(p.strip()) >= 3],
-        key=len,
-        reverse=True,
-    )
-    exp_list = sorted(
-        [p for p in exp_phrases if len(p.strip()) >= 3],
-        key=len,
-        reverse=True,
-    )
-
-    # Apply highlights for degree phrases
-    for phrase in degree_list:
-        escaped_phrase = re.escape(html.escape(phrase))
-        text_html = re.sub(
-            escaped_phrase,
-            r'<mark class="hl-degree">\g<0></mark>',
-            text_html,
-            flags=re.IGNORECASE,
-        )
-
-    # Apply highlights for experience phrases
-    for phrase in exp_list:
-        escaped_phrase = re.escape(html.escape(phrase))
-        text_html = re.sub(
-            escaped_phrase,
-            r'<mark class="hl-exp">\g<0></mark>',
-            text_html,
-            flags=re.IGNORECASE,
-        )
-
-    return text_html
+    advanced = result["advanced"].to_dict()
+    spans = advanced.pop("spans", None) or []
+    data = {
+        "spans": spans,
+        "result": dict(
+            {k: v for k, v in result.items() if k not in ("raw_text", "raw_preview")},
+            advanced=advanced,
+        ),
+    }
+    return htmlsafe_json_dumps(data, default=json_default, ensure_ascii=False)
 
 
 @main_bp.route("/", methods=["GET", "POST"])
@@ -104,61 +102,94 @@ def index():
             flash("Unsupported file type. Allowed: PDF, DOCX, TXT", "error")
             return redirect(request.url)
 
-        # Save & extract text
-        filename = secure_filename(file.filename)
-        ext = Path(filename).suffix
-        unique_name = f"{uuid.uuid4().hex}{ext}"
-        upload_folder = Path(current_app.config["UPLOAD_FOLDER"])
-        file_path = upload_folder / unique_name
+        with memprofile.request("interactive"):
+            # Save (streamed, never fully in memory) & extract text from the saved file
+            filename = secure_filename(file.filename)
+            with memprofile.stage("upload"):
+                file_path = save_upload(file)
+
+            try:
+                # 1) Triage: scanned or encrypted PDFs are turned away before
+                #    the backends spend any time on them. Without a pool,
+                #    everything admitted runs inline.
+                with memprofile.stage("preflight"):
+                    admit_upload(file_path)
+
+                # 2) Extraction and analysis
+                analysis_result = analyze_document(
+                    file_path,
+                    filename,
+                    current_app.config.get("EXTRACTOR_BACKENDS"),
+                    current_app.config.get("ANALYSIS_CACHE"),
+                    sandbox=sandbox_limits(current_app.config),
+                    spans=True,
+                )
+
+                # 3) Highlighting and the JSON view are rendered in the browser
+                with memprofile.stage("render"):
+                    return render_template(
+                        "result.html",
+                        result=analysis_result,
+                        page_data=result_page_data(analysis_result),
+                    )
+
+            except Exception as e:
+                flash(f"Error processing file: {e}", "error")
+                return redirect(request.url)
 
-        # Read file into memory once
-        file_bytes = file.read()
+    # --------- GET: just show the upload form ---------
+    return render_template("index.html")
 
-        # Save file for reference
-        with open(file_path, "wb") as f:
-            f.write(file_bytes)
 
-        try:
-            # 1) Text extraction (PyMuPDF + pdfplumber + DOCX/TXT)
-            raw_text = extract_text_from_bytes(file_bytes, filename)
-
-            # 2) Clean/normalize
-            cleaned_text, lines = clean_text(raw_text)
-
-            # 3) Sections and skills
-            sections = extract_sections(lines)
-            skills = extract_skills(cleaned_text)
-
-            # 4) Advanced analysis (your big analyzer)
-            advanced = analyze_resume_text(cleaned_text)
-
-            # 5) Highlighted HTML version of resume text
-            highlighted_text = build_highlighted_text(cleaned_text, advanced)
-
-            # 6) Build result object passed to template
-            analysis_result = {
-                "file_name": filename,
-                "sections": sections,
-                "skills": skills,
-                "raw_text": cleaned_text,
-                "raw_preview": "\n".join(lines[:40]),
-                "advanced": advanced,
-                "highlighted_text": highlighted_text,
-            }
-
-            json_result = json.dumps(analysis_result, indent=4, ensure_ascii=False)
-
-            # THIS is the line you asked about: it lives here,
-            # inside the POST branch, returning the result page.
-            return render_template(
-                "result.html",
-                result=analysis_result,
-                json_result=json_result,
-            )
+@main_bp.route(BULK_PATH, methods=["POST"])
+def api_analyze():
+    """Bulk API: one multipart "resume" upload in, the analysis as JSON out."""
+    if not is_bulk_token(bearer_token(request.headers.get("Authorization")), current_app.config["BULK_API_TOKENS"]):
+        return jsonify({"error": "A valid bulk API token is required"}), 401
 
-        except Exception as e:
-            flash(f"Error processing file: {e}", "error")
-            return redirect(request.url)
+    file = request.files.get("resume")
+    if file is None or file.filename == "":
+        return jsonify({"error": "No file in field 'resume'"}), 400
+    if not allowed_file(file.filename):
+        return jsonify({"error": "Unsupported file type. Allowed: PDF, DOCX, TXT"}), 400
 
-    # --------- GET: just show the upload form ---------
-    return render_template("index.html")
\ No newline at end of file
+    with memprofile.request("bulk"):
+        with memprofile.stage("upload"):
+            file_path = save_upload(file)
+        try:
+            with memprofile.stage("preflight"):
+                admit_upload(file_path)
+            result = analyze_document(
+                file_path,
+                secure_filename(file.filename),
+                current_app.config.get("EXTRACTOR_BACKENDS"),
+                current_app.config.get("ANALYSIS_CACHE"),
+                requested_fields(request.args.get("fields")),
+                request.args.get("profile"),
+                query_flag(request.args.get("fuzzy_skills")),
+                sandbox_limits(current_app.config),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 422
+
+        with memprofile.stage("render"):
+            body = json.dumps(result, ensure_ascii=False, default=json_default)
+        return current_app.response_class(body, mimetype="application/json")
+
+
+@main_bp.route(SEARCH_PATH, methods=["POST"])
+def api_search():
+    """Rank the indexed resumes against a job description: {"query", "k"} in, ids, file names and scores out."""
+    if not is_bulk_token(bearer_token(request.headers.get("Authorization")), current_app.config["BULK_API_TOKENS"]):
+        return jsonify({"error": "A valid bulk API token is required"}), 401
+    body, status = search_corpus(request.get_json(silent=True), current_app.config.get("CORPUS_INDEX"))
+    return jsonify(body), status
+
+
+@main_bp.route("/metrics/memory")
+def memory_metrics():
+    """This worker's memory profile (app.memprofile); just its RSS when profiling is off."""
+    # Source paths and allocation sites are for operators only.
+    if not is_bulk_token(bearer_token(request.headers.get("Authorization")), current_app.config["BULK_API_TOKENS"]):
+        return jsonify({"error": "A valid bulk API token is required"}), 401
+    return jsonify(memprofile.report())
@@ -0,0 +1,267 @@
+# app/memprofile.py - opt-in memory diagnostics per pipeline stage
+#
+# With MEMORY_PROFILE on, tracemalloc traces each stage of a request
+# (upload, preflight, extract, analyze, fuzzy, render) in every server
+# process. Per request type ("interactive", "bulk", or "document" in pool
+# workers) and stage the profiler keeps:
+#
+#   net_kb    memory the stage allocated and still holds when it ends -
+#             what a leak or a cache keeps
+#   peak_kb   the most the stage had allocated at once - the string copies
+#             and backend buffers that come and go
+#   top       the source lines holding most of net_kb
+#
+# Extraction itself runs in sandbox helpers (utils.sandbox), so the server
+# side of "extract" only sees the text coming back. The helpers trace each
+# document themselves (measure()) and send the numbers back with the
+# result; they are recorded as the "extract.helper" stage, together with
+# the helper's RSS after the document:
+#
+#   rss_mb_max  the largest helper RSS seen after a document
+#
+# tracemalloc only sees memory allocated through Python's allocator.
+# MuPDF (PyMuPDF) and the other C libraries malloc their document and page
+# structures directly, so a PDF's parse is invisible in net_kb/peak_kb;
+# the helper's RSS is the number that shows it.
+#
+# report() is served on /metrics/memory (the answering process only, bulk
+# API token required) and logged every MEMORY_PROFILE_LOG_EVERY requests
+# and when a worker is recycled, so pool workers and gunicorn workers all
+# end up in the logs.
+#
+# Tracing slows the stage down severalfold, and with several threads per
+# process their stages overlap and share traces: profile with one thread
+# per worker for clean numbers. Off, stage() and request() return a
+# nullcontext.
+#
+# rss_mb() is the process's current resident size, used by the worker
+# recycling hook in gunicorn.conf.py (WORKER_MAX_RSS_MB).
+
+import contextlib
+import contextvars
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Allocations made by the profiler and the import machinery are noise.
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_request_type: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("memprofile_request", default=None)
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process (peak where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+def _top(snapshot: tracemalloc.Snapshot, top: int, frames: int) -> List[Tuple[str, int]]:
+    grouped = snapshot.filter_traces(_SNAPSHOT_FILTERS).statistics("traceback" if frames > 1 else "lineno")
+    return [(" <- ".join(f"{f.filename}:{f.lineno}" for f in s.traceback), s.size) for s in grouped[:top]]
+
+
+@contextlib.contextmanager
+def measure(top: int = 10, frames: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    tracemalloc around a block in a process without a profiler (an
+    extraction helper): the yielded dict gets the block's net, peak, top
+    and the process's RSS afterwards, as MemoryProfiler.record() takes them.
+    """
+    stats: Dict[str, Any] = {}
+    tracemalloc.start(frames)
+    try:
+        yield stats
+    finally:
+        net, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        stats.update(net=net, peak=peak, top=_top(snapshot, top, frames), rss=rss_mb())
+
+
+class _StageStats:
+    __slots__ = ("calls", "net", "peak", "top", "rss")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.net = 0
+        self.peak = 0
+        self.top: Counter = Counter()
+        self.rss: Optional[float] = None
+
+
+class MemoryProfiler:
+    """tracemalloc around stages, aggregated per request type."""
+
+    def __init__(self, top: int = 10, frames: int = 1, log_every: int = 0) -> None:
+        self.top = top
+        self.frames = frames
+        self.log_every = log_every
+        self._lock = threading.Lock()
+        self._active = 0
+        self._stages: Dict[str, Dict[str, _StageStats]] = {}
+        self._requests: Counter = Counter()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        # Tracing runs only while a stage does, so the traces at its end
+        # are exactly what the stage allocated and still holds, and a
+        # snapshot never walks the whole heap.
+        with self._lock:
+            if self._active == 0:
+                tracemalloc.start(self.frames)
+            self._active += 1
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    tracemalloc.stop()
+            self.record(name, current, peak, _top(snapshot, self.top, self.frames))
+
+    def record(
+        self,
+        name: str,
+        net: int,
+        peak: int,
+        top: Iterable[Tuple[str, int]] = (),
+        rss: Optional[float] = None,
+    ) -> None:
+        """Add one run of stage name to the current request type's stats."""
+        with self._lock:
+            stats = self._stages.setdefault(_request_type.get() or "document", {}).setdefault(name, _StageStats())
+            stats.calls += 1
+            stats.net += net
+            stats.peak = max(stats.peak, peak)
+            for where, size in top:
+                stats.top[where] += size
+            if rss is not None:
+                stats.rss = max(stats.rss or 0.0, rss)
+
+    @contextlib.contextmanager
+    def request(self, kind: str) -> Iterator[None]:
+        # Inside a request already (the front end's), this one is part of it.
+        if _request_type.get() is not None:
+            yield
+            return
+        token = _request_type.set(kind)
+        try:
+            yield
+        finally:
+            _request_type.reset(token)
+            with self._lock:
+                self._requests[kind] += 1
+                total = sum(self._requests.values())
+            if self.log_every and total % self.log_every == 0:
+                self.log_report()
+
+    def _stage_report(self, s: _StageStats) -> Dict[str, Any]:
+        out = {
+            "calls": s.calls,
+            "net_kb_avg": round(s.net / s.calls / 1024, 1),
+            "peak_kb_max": round(s.peak / 1024, 1),
+            "top": [
+                {"where": where, "kb_avg": round(size / s.calls / 1024, 1)}
+                for where, size in s.top.most_common(self.top)
+            ],
+        }
+        if s.rss is not None:
+            out["rss_mb_max"] = round(s.rss, 1)
+        return out
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                kind: {
+                    name: self._stage_report(s)
+                    for name, s in by_stage.items()
+                }
+                for kind, by_stage in self._stages.items()
+            }
+            requests = dict(self._requests)
+        return {
+            "enabled": True,
+            "pid": os.getpid(),
+            "rss_mb": round(rss_mb(), 1),
+            "requests": requests,
+            "stages": stages,
+        }
+
+    def log_report(self) -> None:
+        report = self.report()
+        lines = [f"memory profile pid={report['pid']} rss={report['rss_mb']}MB requests={report['requests']}"]
+        for kind, by_stage in report["stages"].items():
+            for name, s in by_stage.items():
+                rss = f", rss {s['rss_mb_max']} MB max" if "rss_mb_max" in s else ""
+                lines.append(f"  {kind}/{name}: {s['calls']} calls, net {s['net_kb_avg']} KB avg, "
+                             f"peak {s['peak_kb_max']} KB{rss}")
+                lines.extend(f"    {t['kb_avg']:>10} KB  {t['where']}" for t in s["top"][:5])
+        logger.warning("\n".join(lines))
+
+
+_profiler: Optional[MemoryProfiler] = None
+
+
+def enable_profiling(top: int = 10, frames: int = 1, log_every: int = 0) -> MemoryProfiler:
+    """Profile stages in this process (and processes forked from it)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = MemoryProfiler(top, frames, log_every)
+    return _profiler
+
+
+def configure_profiling(config) -> Optional[MemoryProfiler]:
+    """enable_profiling() from app config if MEMORY_PROFILE is on."""
+    if not config.get("MEMORY_PROFILE"):
+        return None
+    return enable_profiling(
+        config["MEMORY_PROFILE_TOP"], config["MEMORY_PROFILE_FRAMES"], config["MEMORY_PROFILE_LOG_EVERY"]
+    )
+
+
+def get_profiler() -> Optional[MemoryProfiler]:
+    return _profiler
+
+
+def stage(name: str):
+    """Context manager profiling one stage of the current request (no-op when off)."""
+    return _profiler.stage(name) if _profiler is not None else contextlib.nullcontext()
+
+
+def request(kind: str):
+    """Context manager marking the current request's type (no-op when off)."""
+    return _profiler.request(kind) if _profiler is not None else contextlib.nullcontext()
+
+
+def record(name: str, net: int, peak: int, top: Iterable[Tuple[str, int]] = (), rss: Optional[float] = None) -> None:
+    """Stats of a stage measured elsewhere (see measure()); no-op when off."""
+    if _profiler is not None:
+        _profiler.record(name, net, peak, top, rss)
+
+
+def report() -> Dict[str, Any]:
+    if _profiler is None:
+        return {"enabled": False, "pid": os.getpid(), "rss_mb": round(rss_mb(), 1)}
+    return _profiler.report()
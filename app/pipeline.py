@@ -0,0 +1,270 @@
+# app/pipeline.py - upload bytes in, analysis result out
+#
+# One function shared by the Flask (sync) and ASGI front ends. It is a
+# plain module-level function taking and returning picklable values, so
+# the ASGI app can run it in a ProcessPoolExecutor (passing the saved
+# upload's path, not its contents).
+#
+# The work is two cacheable stages (see app.cache): extraction (file ->
+# cleaned text) and analysis (cleaned text -> sections, skills, advanced).
+
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import memprofile
+from .cache import AnalysisCache, content_hash, get_cache, text_hash
+from .resume_parser.text_cleaner import clean_text
+from .resume_parser.section_extractor import extract_sections
+from .resume_parser.skill_extractor import extract_skills, fuzzy_skills, select_skills
+from .resume_parser.advanced_analyzer import DEFAULT_FIELDS, analyze_resume_text, check_fields
+from .resume_parser.profiles import Profile, get_profile
+from .resume_parser.records import AnalysisResult
+from .utils.file_extractor import extract_document
+from .utils.sandbox import SandboxLimits, get_sandbox
+from .utils.source import Source
+
+# Bump when a change alters a stage's output, so cached entries from the
+# old code are recomputed (`flask reprocess`).
+EXTRACTOR_VERSION = "2"   # app.utils extractors/backends, text_cleaner
+ANALYZER_VERSION = "6"    # section_extractor, skill_extractor, advanced_analyzer
+
+BackendOrder = Optional[Dict[str, List[str]]]
+
+
+def extractor_key(backend_order: BackendOrder = None) -> str:
+    return f"{EXTRACTOR_VERSION}:{json.dumps(backend_order or {}, sort_keys=True)}"
+
+
+def result_key(as_of: Optional[date] = None) -> str:
+    """ANALYZER_VERSION plus the as-of month: ongoing roles count up to it."""
+    return f"{ANALYZER_VERSION}@{(as_of or date.today()):%Y-%m}"
+
+
+# ---------- Stages ----------
+
+def extract_stage(
+    source: Source,
+    filename: str,
+    backend_order: BackendOrder = None,
+    sandbox: Optional[SandboxLimits] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Text extraction and cleaning. Returns (cleaned text, extraction info).
+    With sandbox, extraction runs in this process's helpers under those
+    limits; info["partial"] says whether a budget cut it short.
+    """
+    if sandbox is not None:
+        profiling = memprofile.get_profiler() is not None
+        extraction = get_sandbox(sandbox).extract(source, filename, backend_order, profiling)
+        if "memory" in extraction:
+            memprofile.record("extract.helper", **extraction["memory"])
+    else:
+        extraction = extract_document(source, filename, backend_order=backend_order)
+    cleaned_text, _ = clean_text(extraction["text"])
+    return cleaned_text, {
+        "format": extraction["format"],
+        "backend": extraction["backend"],
+        "attempts": extraction["attempts"],
+        "partial": extraction.get("partial", False),
+    }
+
+
+def analyze_stage(
+    cleaned_text: str,
+    fields: Optional[Iterable[str]] = None,
+    profile: Optional[Profile] = None,
+    spans: bool = False,
+    as_of: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    With fields, only those fields of the advanced analysis are computed;
+    otherwise the profile's. spans adds the entity spans. A profile without
+    skill categories skips skill matching (skills is None, and no skill
+    spans). as_of (default today) ends ongoing roles.
+    """
+    profile = profile or get_profile()
+    if fields is None:
+        fields = profile.fields
+    if spans:
+        fields = tuple(fields if fields is not None else DEFAULT_FIELDS) + ("spans",)
+    lines = cleaned_text.split("\n") if cleaned_text else []
+    skills = None
+    if profile.skill_categories != ():
+        skills = extract_skills(cleaned_text, profile.skill_categories)
+    return {
+        "sections": extract_sections(lines),
+        "skills": skills,
+        "advanced": analyze_resume_text(
+            cleaned_text, as_of=as_of, fields=fields, skill_categories=profile.skill_categories
+        ),
+    }
+
+
+def process_document(
+    source: Source,
+    filename: str,
+    backend_order: BackendOrder = None,
+    cache: Optional[AnalysisCache] = None,
+    fields: Optional[Iterable[str]] = None,
+    profile: Optional[str] = None,
+    fuzzy: bool = False,
+    sandbox: Optional[SandboxLimits] = None,
+    spans: bool = False,
+    as_of: Optional[date] = None,
+) -> Tuple[Dict[str, Any], Dict[str, bool]]:
+    """
+    Run both stages, each only if the cache has no current entry for it.
+    Returns the result and which stages were served from the cache.
+
+    profile (see resume_parser.profiles) and fields limit the analysis;
+    fields, if given, replaces the profile's field list. A cached full
+    result is narrowed down; a limited one is never cached.
+
+    fuzzy adds typo-tolerant skill matches (skills["fuzzy"]). They are
+    found on every call rather than cached, so cache entries are the same
+    with or without.
+
+    sandbox: see extract_stage. Partial text is not cached, so the file is
+    extracted again next time.
+
+    spans adds the entity spans for the result page's highlights. Like
+    fuzzy matches they are never cached; on a cache hit only the spans
+    are computed.
+
+    as_of (default today) ends ongoing roles, so cached results are keyed
+    by its month as well (result_key).
+    """
+    as_of = as_of or date.today()
+    analysis_profile = get_profile(profile)
+    if fields is not None:
+        fields = check_fields(fields)
+    else:
+        fields = analysis_profile.fields
+    limited = fields is not None or not analysis_profile.is_full
+    hits = {"text": False, "analysis": False}
+
+    key = extractor_key(backend_order)
+    chash = content_hash(source) if cache else None
+    if cache:
+        # So corpus search results can name the file (see corpus.bm25).
+        cache.put_name(chash, filename)
+    cached_text = cache.get_text(chash, key) if cache else None
+    if cached_text is not None:
+        hits["text"] = True
+        cleaned_text, extraction = cached_text["text"], cached_text["extraction"]
+    else:
+        with memprofile.stage("extract"):
+            cleaned_text, extraction = extract_stage(source, filename, backend_order, sandbox)
+        if cache and not extraction["partial"]:
+            cache.put_text(chash, key, cleaned_text, extraction)
+
+    thash = text_hash(cleaned_text) if cache else None
+    rkey = result_key(as_of)
+    analysis = cache.get_result(thash, rkey) if cache else None
+    if analysis is not None:
+        hits["analysis"] = True
+        analysis["advanced"] = AnalysisResult.from_dict(analysis["advanced"])
+        if fields is not None:
+            analysis["advanced"] = analysis["advanced"].only(fields)
+        if analysis_profile.skill_categories == ():
+            analysis["skills"] = None
+        elif analysis_profile.skill_categories is not None:
+            analysis["skills"] = select_skills(analysis["skills"], analysis_profile.skill_categories)
+        if spans:
+            with memprofile.stage("analyze"):
+                analysis["advanced"].spans = analyze_resume_text(
+                    cleaned_text, as_of=as_of, fields=("spans",),
+                    skill_categories=analysis_profile.skill_categories,
+                ).spans
+    else:
+        with memprofile.stage("analyze"):
+            analysis = analyze_stage(cleaned_text, fields, analysis_profile, spans, as_of)
+        if cache and not limited:
+            cache.put_result(
+                thash, rkey, dict(analysis, advanced=analysis["advanced"].only(DEFAULT_FIELDS))
+            )
+    if fuzzy and analysis["skills"] is not None:
+        with memprofile.stage("fuzzy"):
+            analysis["skills"]["fuzzy"] = fuzzy_skills(
+                cleaned_text, analysis_profile.skill_categories, analysis["skills"]["all_skills"]
+            )
+
+    lines = cleaned_text.split("\n") if cleaned_text else []
+    result = {
+        "file_name": filename,
+        "sections": analysis["sections"],
+        "skills": analysis["skills"],
+        "raw_text": cleaned_text,
+        "raw_preview": "\n".join(lines[:40]),
+        "advanced": analysis["advanced"],
+        "extraction": dict(extraction, cached=hits["text"]),
+    }
+    return result, hits
+
+
+def analyze_document(
+    source: Source,
+    filename: str,
+    backend_order: BackendOrder = None,
+    cache_path: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+    profile: Optional[str] = None,
+    fuzzy: bool = False,
+    sandbox: Optional[SandboxLimits] = None,
+    spans: bool = False,
+) -> Dict[str, Any]:
+    """
+    source is the upload's bytes or, preferably, the path it was saved to.
+    With cache_path (Config.ANALYSIS_CACHE) both stages go through the cache.
+    """
+    cache = get_cache(cache_path) if cache_path else None
+    # Counts as a request of its own where no front end marked one (pool workers, CLI).
+    with memprofile.request("document"):
+        return process_document(source, filename, backend_order, cache, fields, profile, fuzzy, sandbox, spans)[0]
+
+
+# ---------- Process pool for async front ends ----------
+
+def _init_worker() -> None:
+    from .config import Config
+    from .warmup import warm_up
+    warm_up()
+    # Pool workers only log their reports; /metrics/memory is the server's.
+    memprofile.configure_profiling(vars(Config))
+
+
+class AnalysisPool:
+    """
+    A ProcessPoolExecutor shared by all requests of one server process.
+    Callers bound how much they submit at once (see app.admission), so
+    work waits in the event loop rather than in the executor's queue.
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        # forkserver: workers are not forked from a process that already
+        # runs an event loop and server threads.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=_init_worker,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            raise RuntimeError("AnalysisPool is not started")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
@@ -1,7 +1,20 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import re
 from datetime import date
 
+from .gazetteer import Place, get_gazetteer
+from .organizations import canonical_id
+from .records import AnalysisResult, DegreeInfo, ExperienceEntry
+from .section_extractor import section_kind, section_lines, section_ranges
+from .skill_extractor import skill_spans
+from .timeline import (
+    MONTH_PATTERN,
+    YEAR_RANGE_RE,
+    Timeline,
+    covered_months,
+    normalize_year,
+)
+
 # ---------- Degree detection patterns ----------
 
 DEGREE_PATTERNS: Dict[str, str] = {
@@ -155,114 +168,32 @@ DEPARTMENT_KEYWORDS: Dict[str, str] = {
     "biotechnology": "Biotechnology",
 }
 
-EDU_SECTION_TITLES: List[str] = [
-    "education",
-    "educational qualification",
-    "educational qualifications",
-    "academic background",
-    "academic qualifications",
-    "qualifications",
-    "education & training",
-]
+SectionRanges = Dict[str, List[Tuple[int, int]]]
 
-SECTION_BOUNDARY_TITLES: List[str] = [
-    "experience",
-    "work experience",
-    "professional experience",
-    "employment history",
-    "work history",
-    "projects",
-    "skills",
-    "technical skills",
-    "publications",
-    "research",
-    "certifications",
-    "achievements",
-    "summary",
-    "objective",
-    "profile",
-    "declaration",
-]
+# Sections whose date ranges are not periods of employment (degree years,
+# FDP dates, project durations) and are left out of the timeline.
+NON_WORK_SECTIONS = ("education", "publications", "training", "projects", "certifications", "awards")
 
-YEAR_RANGE_RE = re.compile(
-    r"(?P<start>(?:19|20)\d{2})\s*(?:[-–/]|to)\s*"
-    r"(?P<end>(?:19|20)\d{2}|present|current|ongoing|till date|now)",
-    re.IGNORECASE,
-)
 SINGLE_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
 DATE_WITH_YEAR_RE = re.compile(r"\d{1,2}[./-]\d{1,2}[./-](\d{2,4})")
 
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_BLOCK_RE = re.compile(r"\+?\d[\d\-\s/]{8,}\d")
 
-COUNTRY_HINT_RE = re.compile(
-    r"\b(india|usa|united states|canada|uk|united kingdom|australia|germany|france|italy|spain|"
-    r"singapore|uae|dubai|qatar|saudi arabia|china|japan)\b",
-    re.IGNORECASE,
-)
-
-NUMERIC_RANGE_RE = re.compile(
-    r"(?P<from_d>\d{1,2})[./-]\s*(?P<from_m>\d{1,2})[./-]\s*(?:[A-Za-z]{0,2})?(?P<from_y>\d{2,4})\s*"
-    r"(?:to|[-–])\s*"
-    r"(?:(?P<to_d>\d{1,2})[./-]\s*(?P<to_m>\d{1,2})[./-]\s*(?:[A-Za-z]{0,2})?(?P<to_y>\d{2,4})|"
-    r"(?P<to_label>Present|Currently Working|Current|Till Date|Till today|Today|Now|till today))",
-    re.IGNORECASE,
-)
-
 MONTH_ABBR = {
     1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr",
     5: "May", 6: "Jun", 7: "Jul", 8: "Aug",
     9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec",
 }
 
-INDIAN_STATES = [
-    "andhra pradesh", "arunachal pradesh", "assam", "bihar", "chhattisgarh",
-    "goa", "gujarat", "haryana", "himachal pradesh", "jharkhand", "karnataka",
-    "kerala", "madhya pradesh", "maharashtra", "manipur", "meghalaya",
-    "mizoram", "nagaland", "odisha", "punjab", "rajasthan", "sikkim",
-    "tamil nadu", "telangana", "tripura", "uttar pradesh", "uttarakhand",
-    "west bengal",
-    "andaman and nicobar islands", "chandigarh", "dadra and nagar haveli",
-    "daman and diu", "delhi", "lakshadweep", "puducherry", "ladakh", "jammu and kashmir"
-]
-
-
-def normalize_year(year_str: str) -> int:
-    y = int(year_str)
-    if len(year_str) == 4:
-        return y
-    cur_yy = date.today().year % 100
-    if y <= cur_yy:
-        return 2000 + y
-    return 1900 + y
-
 # ---------- Education helpers ----------
 
-def extract_education_section(text: str) -> str:
+def extract_education_section(text: str, sections: Optional[SectionRanges] = None) -> str:
+    """The education section(s), or the whole text if there is none."""
     lines = text.splitlines()
-    if not lines:
-        return text
-
-    start_idx: Optional[int] = None
-    for i, line in enumerate(lines):
-        ll = line.strip().lower()
-        if any(title in ll for title in EDU_SECTION_TITLES):
-            start_idx = i
-            break
-
-    if start_idx is None:
-        return text
-
-    end_idx = len(lines)
-    for j in range(start_idx + 1, len(lines)):
-        ll = lines[j].strip().lower()
-        if not ll:
-            continue
-        if any(title in ll for title in SECTION_BOUNDARY_TITLES):
-            end_idx = j
-            break
-
-    section = "\n".join(lines[start_idx:end_idx]).strip()
+    if sections is None:
+        sections = section_ranges(lines)
+    section = "\n".join(section_lines(lines, sections, "education")).strip()
     return section or text
 
 
@@ -431,7 +362,7 @@ def parse_role_org_location(header: str) -> Tuple[Optional[str], Optional[str],
     return role, org, location
 
 
-def extract_degrees_detail(education_text: str, full_text: str) -> List[Dict[str, Any]]:
+def extract_degrees_detail(education_text: str, full_text: str) -> List[DegreeInfo]:
     lines = [ln.strip() for ln in education_text.splitlines() if ln.strip()]
     if not lines:
         return []
@@ -461,7 +392,7 @@ def extract_degrees_detail(education_text: str, full_text: str) -> List[Dict[str
         blocks.append(current)
 
     phd_status_global = get_phd_status(full_text)
-    detailed: List[Dict[str, Any]] = []
+    detailed: List[DegreeInfo] = []
 
     for block in blocks:
         full = " ".join(block)
@@ -504,17 +435,17 @@ def extract_degrees_detail(education_text: str, full_text: str) -> List[Dict[str
                 phd_awarded = True
 
         detailed.append(
-            {
-                "degree_type": degree_type,
-                "raw_text": full,
-                "field_of_study": field,
-                "institution": institution,
-                "start_year": start_year,
-                "end_year": end_year,
-                "status": status,
-                "phd_thesis_submitted": phd_thesis_submitted if degree_type == "PhD" else None,
-                "phd_awarded": phd_awarded if degree_type == "PhD" else None,
-            }
+            DegreeInfo(
+                degree_type=degree_type,
+                raw_text=full,
+                field_of_study=field,
+                institution=institution,
+                start_year=start_year,
+                end_year=end_year,
+                status=status,
+                phd_thesis_submitted=phd_thesis_submitted if degree_type == "PhD" else None,
+                phd_awarded=phd_awarded if degree_type == "PhD" else None,
+            )
         )
 
     return detailed
@@ -564,6 +495,29 @@ def score_resume(
 
 # ---------- Personal info & global lists ----------
 
+# Contact details live at the top of almost every resume, so the header
+# region is scanned first and the rest of the document only when needed.
+HEADER_SCAN_LINES = 30
+LOCATION_SCAN_LINES = 25
+
+CONTACT_RE = re.compile(rf"(?P<email>{EMAIL_RE.pattern})|(?P<phone>{PHONE_BLOCK_RE.pattern})")
+
+NAME_PREFIXES = ["mr ", "ms ", "mrs ", "dr ", "dr. ", "prof. ", "prof "]
+NAME_BAD_WORDS = ["resume", "curriculum vitae", "curriculum vitæ", "bio-data", "biodata", "profile", "cv"]
+
+
+def _phone_parts(candidate: str) -> List[Tuple[str, str]]:
+    parts: List[Tuple[str, str]] = []
+    for part in re.split(r"[\/,|]", candidate):
+        part = part.strip()
+        if not part:
+            continue
+        digits = re.sub(r"\D", "", part)
+        if 10 <= len(digits) <= 13:
+            parts.append((part, digits))
+    return parts
+
+
 def extract_email(text: str) -> Optional[str]:
     m = EMAIL_RE.search(text)
     return m.group(0) if m else None
@@ -582,17 +536,12 @@ def extract_all_emails(text: str) -> List[str]:
 
 def extract_phone(text: str) -> Optional[str]:
     lines = text.splitlines()
-    top = "\n".join(lines[:25])
+    top = "\n".join(lines[:LOCATION_SCAN_LINES])
 
     def from_scope(scope: str) -> Optional[str]:
         for cand in PHONE_BLOCK_RE.findall(scope):
-            for part in re.split(r"[\/,|]", cand):
-                part = part.strip()
-                if not part:
-                    continue
-                digits = re.sub(r"\D", "", part)
-                if 10 <= len(digits) <= 13:
-                    return part
+            for part, _ in _phone_parts(cand):
+                return part
         return None
 
     phone = from_scope(top)
@@ -606,51 +555,68 @@ def extract_all_phones(text: str) -> List[str]:
     results: List[str] = []
 
     for cand in PHONE_BLOCK_RE.findall(text):
-        for part in re.split(r"[\/,|]", cand):
-            part = part.strip()
-            if not part:
-                continue
-            digits = re.sub(r"\D", "", part)
-            if 10 <= len(digits) <= 13 and digits not in seen_digits:
+        for part, digits in _phone_parts(cand):
+            if digits not in seen_digits:
                 seen_digits.add(digits)
                 results.append(part)
     return results
 
 
-def extract_name(text: str) -> Optional[str]:
-    lines = text.splitlines()
-
-    prefixes = ["mr ", "ms ", "mrs ", "dr ", "dr. ", "prof. ", "prof "]
-    bad_words = ["resume", "curriculum vitae", "curriculum vitæ", "bio-data", "biodata", "profile", "cv"]
-
-    for line in lines[:30]:
+def _name_line(lines: List[str]) -> Optional[Tuple[int, str]]:
+    """(index of the name line, the name) in the header, if any."""
+    for i, line in enumerate(lines[:HEADER_SCAN_LINES]):
         name = line.strip()
         if not name:
             continue
 
         low = name.lower()
-        if any(bw in low for bw in bad_words):
+        if any(bw in low for bw in NAME_BAD_WORDS):
             continue
         if "@" in name or re.search(r"\d", name):
             continue
 
-        for p in prefixes:
+        for p in NAME_PREFIXES:
             if low.startswith(p):
                 name = name[len(p):].strip()
                 break
 
         if 1 <= len(name.split()) <= 4:
-            return name
+            return i, name
 
     return None
 
 
-def extract_location(text: str) -> Optional[str]:
-    lines = text.splitlines()
+def _name_from_lines(lines: List[str]) -> Optional[str]:
+    found = _name_line(lines)
+    return found[1] if found else None
 
-    for line in lines[:25]:
+
+def extract_name(text: str) -> Optional[str]:
+    return _name_from_lines(text.splitlines())
+
+
+# Gazetteer matches (place, start, end) of each header line.
+LinePlaces = List[List[Tuple[Place, int, int]]]
+
+
+def _line_places(lines: List[str]) -> LinePlaces:
+    """Each header line tokenized once, for both location and states."""
+    gazetteer = get_gazetteer()
+    return [gazetteer.find(line) for line in lines[:HEADER_SCAN_LINES]]
+
+
+def _location_from_lines(lines: List[str], header_places: Optional[LinePlaces] = None) -> Optional[str]:
+    if header_places is None:
+        header_places = _line_places(lines)
+    fallback: Optional[str] = None
+    # Cities that are also surnames (Hassan, Puri, Salem) must not make the
+    # name line a location.
+    name_line = _name_line(lines)
+    skip = name_line[0] if name_line else -1
+
+    for i, line in enumerate(lines[:LOCATION_SCAN_LINES]):
         raw = line.strip()
-        if not raw:
+        if not raw or i == skip:
             continue
         low = raw.lower()
 
@@ -660,63 +626,136 @@ def extract_location(text: str) -> Optional[str]:
             if part:
                 return part
 
-        if COUNTRY_HINT_RE.search(low):
-            if "|" in raw:
-                cand = raw.split("|")[-1].strip()
-            else:
-                cand = raw
-            return cand
+        cand = raw.split("|")[-1].strip() if "|" in raw else raw
+        if "@" not in cand:
+            # A place name alone is not enough: it takes an address shape
+            # ("Area, City") or two places ("Pune Maharashtra").
+            offset = line.rfind(cand)
+            places = [p for p in header_places[i] if p[1] >= offset]
+            if places and ("," in cand or len({place for place, _, _ in places}) > 1):
+                return cand
 
-        if "," in raw and "@" not in raw and not re.search(r"\d", raw):
-            return raw
+        if fallback is None and "," in raw and "@" not in raw and not re.search(r"\d", raw):
+            fallback = raw
+
+    return fallback
+
+
+def extract_location(text: str) -> Optional[str]:
+    return _location_from_lines(text.splitlines())
 
+
+def canonical_location(location: Optional[str]) -> Optional[str]:
+    """Canonical gazetteer name for a location string, most specific place first."""
+    if not location:
+        return None
+    places = [place for place, _, _ in get_gazetteer().find(location)]
+    for kind in ("city", "state", "country"):
+        for place in places:
+            if place.kind == kind:
+                return place.name
     return None
 
 
-def extract_indian_states(text: str) -> List[str]:
-    low = text.lower()
-    found = []
-    for st in INDIAN_STATES:
-        if st in low:
-            found.append(st.title())
+def _is_indian_state(place: Place) -> bool:
+    return place.kind == "state" and place.parent == "India"
+
+
+def _states_in(text: str) -> List[str]:
+    return [place.name for place, _, _ in get_gazetteer().find(text) if _is_indian_state(place)]
+
+
+def _unique(items: List[str]) -> List[str]:
     seen = set()
     result_list = []
-    for s in found:
-        if s not in seen:
-            seen.add(s)
-            result_list.append(s)
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result_list.append(item)
     return result_list
 
 
-def extract_current_organization(text: str) -> Optional[str]:
+def _states_from_lines(lines: List[str], header_places: LinePlaces) -> List[str]:
+    states = [place.name for places in header_places for place, _, _ in places if _is_indian_state(place)]
+    if len(lines) > HEADER_SCAN_LINES:
+        states += _states_in("\n".join(lines[HEADER_SCAN_LINES:]))
+    return _unique(states)
+
+
+def extract_indian_states(text: str) -> List[str]:
+    return _unique(_states_in(text))
+
+
+def _emails_and_phones(lines: List[str], collect_all: bool = True) -> Tuple[List[str], List[str]]:
+    """
+    One combined email/phone pass over the header region. The remainder of
+    the document is scanned only when collect_all is set (full lists) or
+    when the header did not yield an email and a phone.
+    """
+    emails: List[str] = []
+    seen_emails = set()
+    phones: List[str] = []
+    seen_digits = set()
+
+    def scan(scope: str) -> None:
+        for m in CONTACT_RE.finditer(scope):
+            email = m.group("email")
+            if email:
+                if email.lower() not in seen_emails:
+                    seen_emails.add(email.lower())
+                    emails.append(email)
+                continue
+            for part, digits in _phone_parts(m.group("phone")):
+                if digits not in seen_digits:
+                    seen_digits.add(digits)
+                    phones.append(part)
+
+    scan("\n".join(lines[:HEADER_SCAN_LINES]))
+    if len(lines) > HEADER_SCAN_LINES and (collect_all or not emails or not phones):
+        scan("\n".join(lines[HEADER_SCAN_LINES:]))
+    return emails, phones
+
+
+def extract_contact_info(text: str, collect_all: bool = True) -> Dict[str, Any]:
+    """All contact fields at once; the analysis computes each one on its own."""
     lines = text.splitlines()
+    header_places = _line_places(lines)
+    emails, phones = _emails_and_phones(lines, collect_all)
+    location = _location_from_lines(lines, header_places)
 
-    work_start = None
-    for i, line in enumerate(lines):
-        ll = line.lower()
-        if any(k in ll for k in ["work experience", "professional experience", "experience", "employment history"]):
-            work_start = i
-            break
-    start_idx = work_start if work_start is not None else 0
+    return {
+        "name": _name_from_lines(lines),
+        "email": emails[0] if emails else None,
+        "all_emails": emails,
+        "phone": phones[0] if phones else None,
+        "all_phones": phones,
+        "location": location,
+        "location_canonical": canonical_location(location),
+        "indian_states": _states_from_lines(lines, header_places),
+    }
+
+
+CURRENT_ROLE_RE = re.compile(
+    rf"^(?P<role_org>.+?)\s+{MONTH_PATTERN}\s+\d{{4}}\s*[-–]\s*"
+    r"(?:Present|Current|Currently Working|Till Date|Now)\b",
+    re.IGNORECASE,
+)
+
+
+def extract_current_organization(text: str, sections: Optional[SectionRanges] = None) -> Optional[str]:
+    """Searches the experience section(s), or the whole text if there is none."""
+    lines = text.splitlines()
+    if sections is None:
+        sections = section_ranges(lines)
+    lines = section_lines(lines, sections, "experience", "internships") or lines
 
     org_keywords = [
         "university", "college", "institute", "school", "company", "pvt", "ltd", "limited",
         "inc", "solutions", "technologies", "labs", "systems", "corp", "corporation", "llc"
     ]
 
-    month_pattern = (
-        r"(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-        r"Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|"
-        r"Nov(?:ember)?|Dec(?:ember)?)"
-    )
-    present_pattern = re.compile(
-        rf"^(?P<role_org>.+?)\s+{month_pattern}\s+\d{{4}}\s*[-–]\s*"
-        r"(?:Present|Current|Currently Working|Till Date|Now)\b",
-        re.IGNORECASE,
-    )
-
-    for line in lines[start_idx:]:
-        m = present_pattern.search(line.strip())
+    for line in lines:
+        m = CURRENT_ROLE_RE.search(line.strip())
         if not m:
             continue
         role_org = m.group("role_org").strip(" -•")
@@ -727,20 +766,17 @@ def extract_current_organization(text: str) -> Optional[str]:
         if any(k in low for k in org_keywords):
             return role_org
 
-    for i in range(start_idx, len(lines)):
-        ll = lines[i].lower()
+    for i, line in enumerate(lines):
+        ll = line.lower()
         if "currently working" in ll or "present" in ll or "till today" in ll:
-            for j in range(max(start_idx, i - 3), i + 2):
-                if j < 0 or j >= len(lines):
-                    continue
+            for j in range(max(0, i - 3), min(len(lines), i + 2)):
                 cand = lines[j].strip()
                 if cand and any(k in cand.lower() for k in org_keywords):
                     return cand
 
-    for i in range(start_idx, min(start_idx + 25, len(lines))):
-        ll = lines[i].lower()
-        if any(k in ll for k in org_keywords):
-            cand = lines[i].strip()
+    for line in lines[:25]:
+        if any(k in line.lower() for k in org_keywords):
+            cand = line.strip()
             if cand:
                 return cand
 
@@ -748,277 +784,108 @@ def extract_current_organization(text: str) -> Optional[str]:
 
 # ---------- Experience breakdown (years only) ----------
 
-def calculate_experience_breakdown(text: str) -> Dict[str, Optional[float]]:
-    month_pattern = (
-        r"(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-        r"Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|"
-        r"Nov(?:ember)?|Dec(?:ember)?)"
-    )
-    month_range_pattern = (
-        rf"(?:(?:From|from|Since|since)\s+)?"
-        rf"(?P<from_day>\d{{1,2}}(?:st|nd|rd|th)?\s+)?"
-        rf"(?P<from_month>{month_pattern})\s+(?P<from_year>\d{{4}})\s*"
-        rf"(?:[-–]|to)\s*"
-        rf"(?:(?P<to_day>\d{{1,2}}(?:st|nd|rd|th)?\s+)?"
-        rf"(?P<to_month>{month_pattern})\s+(?P<to_year>\d{{4}})|"
-        r"(?P<to_label>Present|Currently Working|Current|Till Date|Till date|Now|till date))"
-    )
-    month_range_re = re.compile(month_range_pattern, re.IGNORECASE)
-
-    month_map = {
-        "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-        "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
-    }
-
-    teaching_keywords = [
-        "professor", "assistant professor", "associate professor",
-        "lecturer", "teacher", "faculty", "school", "college", "university",
-        "institute", "academy"
-    ]
-    industry_keywords = [
-        "developer", "software", "engineer", "company", "pvt", "ltd", "limited",
-        "solutions", "consultant", "analyst", "manager", "industry",
-        "it services", "technologies", "firm", "corporation", "llc", "startup",
-        "audit", "auditor", "accounts", "accountant", "bank", "retail",
-        "supermarts"
-    ]
-
-    teaching_months = 0
-    industry_months = 0
-    other_months = 0
-
-    today = date.today()
-
-    for m in month_range_re.finditer(text):
-        fm_str = m.group("from_month")[:3].lower()
-        from_month = month_map.get(fm_str)
-        from_year = int(m.group("from_year"))
-        if from_month is None:
-            continue
+TEACHING_KEYWORDS = [
+    "professor", "assistant professor", "associate professor",
+    "lecturer", "teacher", "faculty", "school", "college", "university",
+    "institute", "academy"
+]
+INDUSTRY_KEYWORDS = [
+    "developer", "software", "engineer", "company", "pvt", "ltd", "limited",
+    "solutions", "consultant", "analyst", "manager", "industry",
+    "it services", "technologies", "firm", "corporation", "llc", "startup",
+    "audit", "auditor", "accounts", "accountant", "bank", "retail",
+    "supermarts"
+]
 
-        if m.group("to_month"):
-            tm_str = m.group("to_month")[:3].lower()
-            to_month = month_map.get(tm_str)
-            to_year = int(m.group("to_year"))
-        else:
-            to_month = today.month
-            to_year = today.year
 
-        months = (to_year - from_year) * 12 + (to_month - from_month)
-        if months <= 0:
-            continue
+def experience_intervals(
+    text: str, timeline: Optional[Timeline] = None
+) -> Dict[str, List[Tuple[int, int]]]:
+    """Month intervals of the resume's date ranges per category (teaching/industry/other)."""
+    if timeline is None:
+        timeline = Timeline(text)
+    text = timeline.text
 
-        ctx = text[max(0, m.start() - 120): m.end() + 120].lower()
-        if any(kw in ctx for kw in teaching_keywords):
-            teaching_months += months
-        elif any(kw in ctx for kw in industry_keywords):
-            industry_months += months
-        else:
-            other_months += months
+    intervals: Dict[str, List[Tuple[int, int]]] = {"teaching": [], "industry": [], "other": []}
 
-    for m in NUMERIC_RANGE_RE.finditer(text):
-        from_month = int(m.group("from_m"))
-        from_year = normalize_year(m.group("from_y"))
-        if not (1 <= from_month <= 12):
+    for span in timeline.spans:
+        start, end = timeline.interval(span)
+        if end <= start:
             continue
 
-        if m.group("to_label"):
-            to_year = today.year
-            to_month = today.month
+        ctx = text[max(0, span.start - 120): span.end + 120].lower()
+        if any(kw in ctx for kw in TEACHING_KEYWORDS):
+            intervals["teaching"].append((start, end))
+        elif any(kw in ctx for kw in INDUSTRY_KEYWORDS):
+            intervals["industry"].append((start, end))
         else:
-            to_month = int(m.group("to_m"))
-            to_year = normalize_year(m.group("to_y"))
-            if not (1 <= to_month <= 12):
-                continue
+            intervals["other"].append((start, end))
 
-        months = (to_year - from_year) * 12 + (to_month - from_month)
-        if months <= 0:
-            continue
+    return intervals
 
-        ctx = text[max(0, m.start() - 120): m.end() + 120].lower()
-        if any(kw in ctx for kw in teaching_keywords):
-            teaching_months += months
-        elif any(kw in ctx for kw in industry_keywords):
-            industry_months += months
-        else:
-            other_months += months
 
-    for m in YEAR_RANGE_RE.finditer(text):
-        from_year = int(m.group("start"))
-        end_raw = m.group("end")
-        if end_raw.isdigit():
-            to_year = int(end_raw)
-            to_month = 12
-        else:
-            to_year = today.year
-            to_month = today.month
-        months = (to_year - from_year) * 12 + (to_month - 1)
-        if months <= 0:
-            continue
+def months_to_years(m: int) -> Optional[float]:
+    if m <= 0:
+        return None
+    return round(m / 12.0, 1)
 
-        ctx = text[max(0, m.start() - 120): m.end() + 120].lower()
-        if any(kw in ctx for kw in teaching_keywords):
-            teaching_months += months
-        elif any(kw in ctx for kw in industry_keywords):
-            industry_months += months
-        else:
-            other_months += months
 
-    def months_to_years(m: int) -> Optional[float]:
-        if m <= 0:
-            return None
-        return round(m / 12.0, 1)
+def category_years(intervals: Dict[str, List[Tuple[int, int]]], category: Optional[str] = None) -> Optional[float]:
+    """
+    Years in one category of experience_intervals(), or in any (None).
+    Overlapping or repeated ranges are merged before counting, so
+    concurrent roles count once.
+    """
+    if category is None:
+        return months_to_years(covered_months([iv for ivs in intervals.values() for iv in ivs]))
+    return months_to_years(covered_months(intervals[category]))
 
-    total_months = teaching_months + industry_months + other_months
 
+def calculate_experience_breakdown(
+    text: str, timeline: Optional[Timeline] = None
+) -> Dict[str, Optional[float]]:
+    """Years per category from the resume's date ranges; the total is their union."""
+    intervals = experience_intervals(text, timeline)
     return {
-        "teaching_years": months_to_years(teaching_months),
-        "industry_years": months_to_years(industry_months),
-        "other_years": months_to_years(other_months),
-        "total_years": months_to_years(total_months),
+        "teaching_years": category_years(intervals, "teaching"),
+        "industry_years": category_years(intervals, "industry"),
+        "other_years": category_years(intervals, "other"),
+        "total_years": category_years(intervals),
     }
 
 # ---------- Experience history (detailed list) ----------
 
-def extract_experience_history(text: str) -> List[Dict[str, Any]]:
-    lines = text.splitlines()
-    if not lines:
-        return []
-
-    month_pattern = (
-        r"(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-        r"Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|"
-        r"Nov(?:ember)?|Dec(?:ember)?)"
-    )
-    month_range_pattern = (
-        rf"(?:(?:From|from|Since|since)\s+)?"
-        rf"(?P<from_day>\d{{1,2}}(?:st|nd|rd|th)?\s+)?"
-        rf"(?P<from_month>{month_pattern})\s+(?P<from_year>\d{{4}})\s*"
-        rf"(?:[-–]|to)\s*"
-        rf"(?:(?P<to_day>\d{{1,2}}(?:st|nd|rd|th)?\s+)?"
-        rf"(?P<to_month>{month_pattern})\s+(?P<to_year>\d{{4}})|"
-        r"(?P<to_label>Present|Currently Working|Current|Till Date|Till date|Now|till date))"
-    )
-    month_range_re = re.compile(month_range_pattern, re.IGNORECASE)
-
-    month_map = {
-        "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-        "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
-    }
-
-    today = date.today()
-
-    JOB_TITLE_KEYWORDS = [
-        "assistant professor", "associate professor", "professor",
-        "lecturer", "teacher", "head of the department", "hod",
-        "consultant", "manager", "executive", "engineer", "developer",
-        "associate", "officer", "analyst", "instructor", "faculty",
-        "accounts", "accountant", "audit", "auditor"
-    ]
-
-    TEACHING_KEYWORDS = [
-        "professor", "assistant professor", "associate professor",
-        "lecturer", "teacher", "faculty", "school", "college", "university",
-        "institute", "academy"
-    ]
-    INDUSTRY_KEYWORDS = [
-        "developer", "software", "engineer", "company", "pvt", "ltd", "limited",
-        "solutions", "consultant", "analyst", "manager", "industry",
-        "it services", "technologies", "firm", "corporation", "llc", "startup",
-        "audit", "auditor", "accounts", "accountant", "bank", "retail",
-        "supermarts"
-    ]
-
-    STOP_HEADINGS = EDU_SECTION_TITLES + SECTION_BOUNDARY_TITLES + [
-        "research experience", "journal papers", "publications",
-        "faculty development programs", "fdp", "fdps", "conferences",
-    ]
-
-    BULLET_PREFIXES = ("•", "◦", "●", "○", "■", "▪", "►", "", "-", "*")
-
-    def parse_line_date(line: str):
-        m = month_range_re.search(line)
-        if m:
-            fm_str = m.group("from_month")[:3].lower()
-            from_month = month_map.get(fm_str)
-            from_year = int(m.group("from_year"))
-            if from_month is None:
-                return None
-            if m.group("to_month"):
-                tm_str = m.group("to_month")[:3].lower()
-                to_month = month_map.get(tm_str)
-                to_year = int(m.group("to_year"))
-                ongoing = False
-            else:
-                to_month = None
-                to_year = None
-                ongoing = True
-            return {
-                "from_year": from_year,
-                "from_month": from_month,
-                "to_year": to_year,
-                "to_month": to_month,
-                "ongoing": ongoing,
-                "date_text": m.group(0),
-            }
+JOB_TITLE_KEYWORDS = [
+    "assistant professor", "associate professor", "professor",
+    "lecturer", "teacher", "head of the department", "hod",
+    "consultant", "manager", "executive", "engineer", "developer",
+    "associate", "officer", "analyst", "instructor", "faculty",
+    "accounts", "accountant", "audit", "auditor"
+]
 
-        m = NUMERIC_RANGE_RE.search(line)
-        if m:
-            from_month = int(m.group("from_m"))
-            from_year = normalize_year(m.group("from_y"))
-            if not (1 <= from_month <= 12):
-                return None
-            if m.group("to_label"):
-                to_year = None
-                to_month = None
-                ongoing = True
-            else:
-                to_month = int(m.group("to_m"))
-                to_year = normalize_year(m.group("to_y"))
-                if not (1 <= to_month <= 12):
-                    return None
-                ongoing = False
-            return {
-                "from_year": from_year,
-                "from_month": from_month,
-                "to_year": to_year,
-                "to_month": to_month,
-                "ongoing": ongoing,
-                "date_text": m.group(0),
-            }
+BULLET_PREFIXES = ("•", "◦", "●", "○", "■", "▪", "►", "\uf0fc", "-", "*")
 
-        m = YEAR_RANGE_RE.search(line)
-        if m:
-            from_year = int(m.group("start"))
-            end_raw = m.group("end")
-            if end_raw.isdigit():
-                to_year = int(end_raw)
-                to_month = 12
-                ongoing = False
-            else:
-                to_year = None
-                to_month = None
-                ongoing = True
-            return {
-                "from_year": from_year,
-                "from_month": 1,
-                "to_year": to_year,
-                "to_month": to_month,
-                "ongoing": ongoing,
-                "date_text": m.group(0),
-            }
 
-        return None
+def extract_experience_history(
+    text: str, timeline: Optional[Timeline] = None
+) -> List[ExperienceEntry]:
+    if timeline is None:
+        timeline = Timeline(text)
+    lines = timeline.lines
+    if not lines:
+        return []
 
-    experiences: List[Dict[str, Any]] = []
+    experiences: List[ExperienceEntry] = []
 
     for idx, line in enumerate(lines):
-        date_info = parse_line_date(line)
-        if not date_info:
+        span = timeline.line_span(idx)
+        if span is None:
             continue
 
-        date_text = date_info["date_text"]
+        # A range wrapped onto the next line: only its start is on this one.
+        date_text = span.date_text.splitlines()[0]
         date_line = line.strip()
+        wrapped = len(span.date_text.splitlines()) - 1
 
         base_header_wo_date = date_line.replace(date_text, " ").strip(" ,.-–")
         header_parts = [base_header_wo_date]
@@ -1030,15 +897,15 @@ def extract_experience_history(text: str) -> List[Dict[str, Any]]:
             prev = lines[prev_idx].strip()
             if not prev:
                 continue
-            if parse_line_date(prev):
+            if timeline.has_date(prev_idx):
                 continue
             if prev.lstrip().startswith(BULLET_PREFIXES):
                 continue
             if re.match(r"^\d+[\).\s]", prev):
                 continue
+            if section_kind(prev) is not None:
+                break  # the header is never in another section
             low_prev = prev.lower()
-            if any(h in low_prev for h in STOP_HEADINGS):
-                continue
             has_job_kw = any(kw in low_prev for kw in JOB_TITLE_KEYWORDS)
             has_org_kw = any(
                 k in low_prev
@@ -1068,17 +935,16 @@ def extract_experience_history(text: str) -> List[Dict[str, Any]]:
                 header_wo_date = header_wo_date[first_pos:].lstrip(" ,.-–")
 
         desc_lines: List[str] = []
-        for k in range(idx + 1, min(idx + 10, len(lines))):
+        for k in range(idx + 1 + wrapped, min(idx + 10, len(lines))):
             nxt = lines[k].strip()
             if not nxt:
                 if desc_lines:
                     break
                 else:
                     continue
-            if parse_line_date(nxt):
+            if timeline.has_date(k):
                 break
-            low_nxt = nxt.lower()
-            if any(h in low_nxt for h in STOP_HEADINGS):
+            if section_kind(nxt) is not None:
                 break
             desc_lines.append(nxt)
 
@@ -1088,21 +954,9 @@ def extract_experience_history(text: str) -> List[Dict[str, Any]]:
 
         title, organization, location = parse_role_org_location(header_wo_date)
 
-        fy = date_info["from_year"]
-        fm = date_info["from_month"]
-        if date_info["ongoing"]:
-            ty = today.year
-            tm = today.month
-        else:
-            ty = date_info["to_year"]
-            tm = date_info["to_month"] or 12
-
-        if ty is None or tm is None:
-            duration_months = None
-        else:
-            duration_months = (ty - fy) * 12 + (tm - fm)
-            if duration_months <= 0:
-                continue
+        duration_months = timeline.duration_months(span)
+        if duration_months <= 0:
+            continue
 
         if any(kw in combined_for_keywords for kw in TEACHING_KEYWORDS):
             category = "Teaching"
@@ -1126,10 +980,10 @@ def extract_experience_history(text: str) -> List[Dict[str, Any]]:
         elif any(kw in title_org for kw in strong_teaching_kw):
             category = "Teaching"
 
-        start_month = fm
-        start_year = fy
-        end_month = date_info["to_month"]
-        end_year = date_info["to_year"]
+        start_month = span.from_month
+        start_year = span.from_year
+        end_month = span.to_month
+        end_year = span.to_year
 
         def fmt_date(yy: Optional[int], mm: Optional[int]) -> Optional[str]:
             if yy is None:
@@ -1139,78 +993,46 @@ def extract_experience_history(text: str) -> List[Dict[str, Any]]:
             abbr = MONTH_ABBR.get(mm, str(mm))
             return f"{abbr} {yy}"
 
-        exp_entry = {
-            "title": title,
-            "organization": organization,
-            "location": location,
-            "category": category,
-            "start_year": start_year,
-            "start_month": start_month,
-            "end_year": end_year,
-            "end_month": end_month,
-            "ongoing": bool(date_info["ongoing"]),
-            "duration_months": duration_months,
-            "start_date_str": fmt_date(start_year, start_month),
-            "end_date_str": fmt_date(end_year, end_month) if not date_info["ongoing"] else "Present",
-            "description": " ".join(desc_lines) if desc_lines else None,
-            "raw_text": date_line + (" " + " ".join(desc_lines) if desc_lines else ""),
-        }
+        exp_entry = ExperienceEntry(
+            title=title,
+            organization=organization,
+            location=location,
+            category=category,
+            start_year=start_year,
+            start_month=start_month,
+            end_year=end_year,
+            end_month=end_month,
+            ongoing=span.ongoing,
+            duration_months=duration_months,
+            start_date_str=fmt_date(start_year, start_month),
+            end_date_str=fmt_date(end_year, end_month) if not span.ongoing else "Present",
+            description=" ".join(desc_lines) if desc_lines else None,
+            raw_text=" ".join([date_line] + [l.strip() for l in lines[idx + 1: idx + 1 + wrapped]] + desc_lines),
+        )
         experiences.append(exp_entry)
 
-    def sort_key(e: Dict[str, Any]) -> Tuple[int, int]:
-        sy = e.get("start_year") or 0
-        sm = e.get("start_month") or 0
+    def sort_key(e: ExperienceEntry) -> Tuple[int, int]:
+        sy = e.start_year or 0
+        sm = e.start_month or 0
         return (-sy, -sm)
 
     return sorted(experiences, key=sort_key)
 
 # ---------- Publications breakdown ----------
 
-def count_publications_breakdown(text: str) -> Dict[str, int]:
+def count_publications_breakdown(text: str, sections: Optional[SectionRanges] = None) -> Dict[str, int]:
+    """Numbered or dashed entries in the publications and research sections."""
     lines = text.splitlines()
-    start = None
-    end = len(lines)
-
-    for i, line in enumerate(lines):
-        ll = line.lower()
-        if any(
-            kw in ll
-            for kw in [
-                "details of research publications",
-                "research publications",
-                "research experience",
-                "journal papers",
-            ]
-        ):
-            start = i
-            break
-
-    if start is None:
-        return {"total": 0, "articles": 0, "books": 0, "conferences": 0}
-
-    for j in range(start + 1, len(lines)):
-        ll = lines[j].lower()
-        if any(
-            kw in ll
-            for kw in [
-                "faculty development",
-                "refresher courses",
-                "work experience",
-                "professional experience",
-                "employment history",
-                "teaching",
-                "declaration",
-            ]
-        ):
-            end = j
-            break
+    if sections is None:
+        sections = section_ranges(lines)
+    entries = section_lines(lines, sections, "publications", "research")
 
     total = 0
     articles = 0
     books = 0
     conferences = 0
 
-    for line in lines[start:end]:
+    for line in entries:
         if not re.match(r"^\s*(\d+\s*[).]|-\s)", line):
             continue
         total += 1
@@ -1231,85 +1053,193 @@ def count_publications_breakdown(text: str) -> Dict[str, int]:
         "conferences": conferences,
     }
 
-# ---------- MAIN PUBLIC FUNCTION ----------
+# ---------- Field producers ----------
+#
+# The analysis is a graph of named producers. Each declares the producers
+# it depends on and receives their values as arguments; an
+# AnalysisContext computes a name on first use and memoizes it for the
+# rest of the call. Asking for a subset of result fields therefore runs
+# only the extractors those fields need.
 
-def analyze_resume_text(
-    text: str, target_department: Optional[str] = None
-) -> Dict[str, Any]:
-    education_text = extract_education_section(text)
-    degrees_info = extract_degrees_detail(education_text, text)
-
-    degree_types = [d["degree_type"] for d in degrees_info]
-    degrees_detected = sorted(
-        set(degree_types or detect_degrees_simple(text)),
+Producer = Callable[..., Any]
+
+PRODUCERS: Dict[str, Tuple[Tuple[str, ...], Producer]] = {}
+
+
+def producer(name: str, *deps: str) -> Callable[[Producer], Producer]:
+    def register(fn: Producer) -> Producer:
+        PRODUCERS[name] = (deps, fn)
+        return fn
+    return register
+
+
+class AnalysisContext:
+    """Inputs of one analysis plus the producer values computed so far."""
+
+    __slots__ = ("text", "target_department", "as_of", "skill_categories", "_memo")
+
+    def __init__(
+        self,
+        text: str,
+        target_department: Optional[str] = None,
+        as_of: Optional[date] = None,
+        skill_categories: Optional[Tuple[str, ...]] = None,
+    ) -> None:
+        self.text = text
+        self.target_department = target_department
+        self.as_of = as_of
+        # As in resume_parser.profiles: None = every category, () = no skills.
+        self.skill_categories = skill_categories
+        self._memo: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self._memo[name]
+        except KeyError:
+            pass
+        deps, fn = PRODUCERS[name]
+        value = fn(self, *(self[d] for d in deps))
+        self._memo[name] = value
+        return value
+
+
+@producer("lines")
+def _lines(ctx: AnalysisContext) -> List[str]:
+    return ctx.text.splitlines()
+
+
+@producer("sections", "lines")
+def _sections(ctx: AnalysisContext, lines: List[str]) -> SectionRanges:
+    # Detected once; each extractor below reads only its own sections.
+    return section_ranges(lines)
+
+
+@producer("degrees_info", "sections")
+def _degrees_info(ctx: AnalysisContext, sections: SectionRanges) -> List[DegreeInfo]:
+    degrees = extract_degrees_detail(extract_education_section(ctx.text, sections), ctx.text)
+    for d in degrees:
+        d.institution_id = canonical_id(d.institution)
+    return degrees
+
+
+@producer("degrees_detected", "degrees_info")
+def _degrees_detected(ctx: AnalysisContext, degrees_info: List[DegreeInfo]) -> List[str]:
+    degree_types = [d.degree_type for d in degrees_info]
+    return sorted(
+        set(degree_types or detect_degrees_simple(ctx.text)),
         key=lambda d: DEGREE_PRIORITY.get(d, 0),
         reverse=True,
     )
-    highest_deg = determine_highest_degree(degrees_detected)
-    has_phd_flag = "PhD" in degrees_detected
 
-    phd_start_year = None
-    phd_end_year = None
+
+@producer("highest_degree", "degrees_detected")
+def _highest_degree(ctx: AnalysisContext, degrees_detected: List[str]) -> str:
+    return determine_highest_degree(degrees_detected)
+
+
+@producer("has_phd", "degrees_detected")
+def _has_phd(ctx: AnalysisContext, degrees_detected: List[str]) -> bool:
+    return "PhD" in degrees_detected
+
+
+@producer("phd_years", "degrees_info")
+def _phd_years(ctx: AnalysisContext, degrees_info: List[DegreeInfo]) -> Tuple[Optional[int], Optional[int]]:
     for d in degrees_info:
-        if d["degree_type"] == "PhD":
-            phd_start_year = d.get("start_year")
-            phd_end_year = d.get("end_year")
-            break
+        if d.degree_type == "PhD":
+            return d.start_year, d.end_year
+    return None, None
 
+
+@producer("fields_of_study", "degrees_info")
+def _fields_of_study(ctx: AnalysisContext, degrees_info: List[DegreeInfo]) -> List[str]:
     fields_of_study: List[str] = []
     seen_fields = set()
     for d in degrees_info:
-        f = d.get("field_of_study")
+        f = d.field_of_study
         if f:
             f_low = f.lower()
             if f_low not in seen_fields:
                 seen_fields.add(f_low)
                 fields_of_study.append(f)
+    return fields_of_study
+
 
+@producer("department", "fields_of_study")
+def _department(ctx: AnalysisContext, fields_of_study: List[str]) -> str:
     department = infer_department_from_fields(fields_of_study)
     if department == "Unknown":
-        department = infer_department_from_text(text)
+        department = infer_department_from_text(ctx.text)
+    return department
+
+
+@producer("timeline", "sections")
+def _timeline(ctx: AnalysisContext, sections: SectionRanges) -> Timeline:
+    # All date ranges are parsed once, against one as-of date, and shared
+    # by the history and the breakdown.
+    skip = [span for kind in NON_WORK_SECTIONS for span in sections.get(kind, ())]
+    return Timeline(ctx.text, ctx.as_of, skip)
+
+
+@producer("experience_intervals", "timeline")
+def _experience_intervals(ctx: AnalysisContext, timeline: Timeline) -> Dict[str, List[Tuple[int, int]]]:
+    return experience_intervals(ctx.text, timeline)
+
 
-    experience_history_raw = extract_experience_history(text)
+# One producer per category, so a profile asking for industry years does
+# not count teaching months.
+@producer("teaching_years", "experience_intervals")
+def _teaching_years(ctx: AnalysisContext, intervals: Dict[str, List[Tuple[int, int]]]) -> Optional[float]:
+    return category_years(intervals, "teaching")
+
+
+@producer("industry_years", "experience_intervals")
+def _industry_years(ctx: AnalysisContext, intervals: Dict[str, List[Tuple[int, int]]]) -> Optional[float]:
+    return category_years(intervals, "industry")
+
+
+@producer("other_years", "experience_intervals")
+def _other_years(ctx: AnalysisContext, intervals: Dict[str, List[Tuple[int, int]]]) -> Optional[float]:
+    return category_years(intervals, "other")
+
+
+@producer("total_years", "experience_intervals")
+def _total_years(ctx: AnalysisContext, intervals: Dict[str, List[Tuple[int, int]]]) -> Optional[float]:
+    return category_years(intervals)
+
+
+def _build_exp_row(e: ExperienceEntry) -> Dict[str, Any]:
+    duration_years = None
+    if e.duration_months is not None:
+        duration_years = round(e.duration_months / 12.0, 1)
+
+    return {
+        "organization": e.organization or "-",
+        "joining_date": e.start_date_str or "-",
+        "relieving_date": "Present" if e.ongoing else (e.end_date_str or "-"),
+        "experience_type": e.category or "Other",
+        "duration_years": duration_years,
+    }
+
+
+@producer("experience", "timeline", "sections")
+def _experience(ctx: AnalysisContext, timeline: Timeline, sections: SectionRanges) -> Dict[str, Any]:
+    """History (oldest first), table rows and the current organization/role."""
     experience_history = sorted(
-        experience_history_raw,
-        key=lambda e: ((e.get("start_year") or 0), (e.get("start_month") or 0)),
+        extract_experience_history(ctx.text, timeline),
+        key=lambda e: ((e.start_year or 0), (e.start_month or 0)),
     )
+    experience_rows = [_build_exp_row(e) for e in experience_history]
 
-    def build_exp_row(e: Dict[str, Any]) -> Dict[str, Any]:
-        duration_years = None
-        if e.get("duration_months") is not None:
-            duration_years = round(e["duration_months"] / 12.0, 1)
-
-        return {
-            "organization": e.get("organization") or "-",
-            "joining_date": e.get("start_date_str") or "-",
-            "relieving_date": "Present" if e.get("ongoing") else (e.get("end_date_str") or "-"),
-            "experience_type": e.get("category") or "Other",
-            "duration_years": duration_years,
-        }
-
-    experience_rows = [build_exp_row(e) for e in experience_history]
-    exp_breakdown = calculate_experience_breakdown(text)
-
-    name = extract_name(text)
-    email = extract_email(text)
-    all_emails = extract_all_emails(text)
-    phone = extract_phone(text)
-    all_phones = extract_all_phones(text)
-    location = extract_location(text)
-    indian_states_found = extract_indian_states(text)
-
-    current_org = extract_current_organization(text)
+    current_org = extract_current_organization(ctx.text, sections)
     current_role = None
     if experience_history:
         current_job = next(
-            (e for e in experience_history if e.get("ongoing")),
+            (e for e in experience_history if e.ongoing),
             experience_history[-1],
         )
-        if current_job.get("organization"):
-            current_org = current_job["organization"]
-        current_role = current_job.get("title")
+        if current_job.organization:
+            current_org = current_job.organization
+        current_role = current_job.title
 
     if not experience_rows and current_org:
         org_low = current_org.lower()
@@ -1328,58 +1258,223 @@ def analyze_resume_text(
             }
         ]
         experience_history = [
-            {
-                "title": current_role,
-                "organization": current_org,
-                "location": None,
-                "category": exp_type,
-                "start_year": None,
-                "start_month": None,
-                "end_year": None,
-                "end_month": None,
-                "ongoing": True,
-                "duration_months": None,
-                "start_date_str": "-",
-                "end_date_str": "Present",
-                "description": None,
-                "raw_text": current_org,
-            }
+            ExperienceEntry(
+                title=current_role,
+                organization=current_org,
+                category=exp_type,
+                ongoing=True,
+                start_date_str="-",
+                end_date_str="Present",
+                raw_text=current_org,
+            )
         ]
 
-    pubs = count_publications_breakdown(text)
-    score = score_resume(has_phd_flag, highest_deg, department, target_department)
-
-    result: Dict[str, Any] = {
-        "name": name,
-        "email": email,
-        "all_emails": all_emails,
-        "phone": phone,
-        "all_phones": all_phones,
-        "current_location": location,
-        "indian_states_found": indian_states_found,
+    for e in experience_history:
+        e.organization_id = canonical_id(e.organization)
+
+    return {
+        "history": experience_history,
+        "rows": experience_rows,
         "current_organization": current_org,
+        "current_organization_id": canonical_id(current_org),
         "current_role": current_role,
-
-        "teaching_experience_years": exp_breakdown["teaching_years"],
-        "industry_experience_years": exp_breakdown["industry_years"],
-        "other_experience_years": exp_breakdown["other_years"],
-        "total_experience_years": exp_breakdown["total_years"],
-
-        "experience_history": experience_history,
-        "experience_rows": experience_rows,
-
-        "publications_total_count": pubs["total"],
-        "research_articles_count": pubs["articles"],
-        "books_count": pubs["books"],
-        "conference_papers_count": pubs["conferences"],
-        "has_phd": has_phd_flag,
-        "highest_degree": highest_deg,
-        "phd_start_year": phd_start_year,
-        "phd_end_year": phd_end_year,
-        "department": department,
-        "degrees_detected": degrees_detected,
-        "degrees_info": degrees_info,
-        "fields_of_study": fields_of_study,
-        "score": score,
     }
-    return result
\ No newline at end of file
+
+
+# Contact fields are independent: one producer each, so fields=email does
+# not also look for a name, a location and states.
+
+@producer("contact", "lines")
+def _contact(ctx: AnalysisContext, lines: List[str]) -> Dict[str, Optional[str]]:
+    # The first email and phone: the body only if the header lacks one.
+    emails, phones = _emails_and_phones(lines, collect_all=False)
+    return {"email": emails[0] if emails else None, "phone": phones[0] if phones else None}
+
+
+@producer("all_contacts", "lines")
+def _all_contacts(ctx: AnalysisContext, lines: List[str]) -> Dict[str, List[str]]:
+    emails, phones = _emails_and_phones(lines)
+    return {"emails": emails, "phones": phones}
+
+
+@producer("header_places", "lines")
+def _header_places(ctx: AnalysisContext, lines: List[str]) -> LinePlaces:
+    return _line_places(lines)
+
+
+@producer("name", "lines")
+def _name(ctx: AnalysisContext, lines: List[str]) -> Optional[str]:
+    return _name_from_lines(lines)
+
+
+@producer("location", "lines", "header_places")
+def _location(ctx: AnalysisContext, lines: List[str], header_places: LinePlaces) -> Dict[str, Optional[str]]:
+    location = _location_from_lines(lines, header_places)
+    return {"location": location, "canonical": canonical_location(location)}
+
+
+@producer("indian_states", "lines", "header_places")
+def _indian_states(ctx: AnalysisContext, lines: List[str], header_places: LinePlaces) -> List[str]:
+    return _states_from_lines(lines, header_places)
+
+
+@producer("publications", "sections")
+def _publications(ctx: AnalysisContext, sections: SectionRanges) -> Dict[str, int]:
+    return count_publications_breakdown(ctx.text, sections)
+
+
+@producer("score", "has_phd", "highest_degree", "department")
+def _score(ctx: AnalysisContext, has_phd: bool, highest_degree: str, department: str) -> int:
+    return score_resume(has_phd, highest_degree, department, ctx.target_department)
+
+
+# ---------- Entity spans ----------
+
+Span = Tuple[int, int, str]
+
+
+def _line_starts(text: str) -> List[int]:
+    """Character offset of each line of text.splitlines()."""
+    starts = []
+    offset = 0
+    for raw_line in text.splitlines(keepends=True):
+        starts.append(offset)
+        offset += len(raw_line)
+    return starts
+
+
+def _phrase_spans(text: str, phrases: Iterable[Optional[str]], label: str) -> List[Span]:
+    spans: List[Span] = []
+    for phrase in {p.strip() for p in phrases if p and len(p.strip()) >= 3}:
+        for m in re.finditer(re.escape(phrase), text, re.IGNORECASE):
+            spans.append((m.start(), m.end(), label))
+    return spans
+
+
+def flatten_spans(spans: Iterable[Span]) -> List[List[Any]]:
+    """Sorted, non-overlapping [start, end, label]; the earlier, then longer, span wins."""
+    flat: List[List[Any]] = []
+    end = -1
+    for start, stop, label in sorted(spans, key=lambda s: (s[0], -s[1])):
+        if start >= end:
+            flat.append([start, stop, label])
+            end = stop
+    return flat
+
+
+@producer("spans", "sections", "timeline", "degrees_info", "experience")
+def _spans(
+    ctx: AnalysisContext,
+    sections: SectionRanges,
+    timeline: Timeline,
+    degrees_info: List[DegreeInfo],
+    experience: Dict[str, Any],
+) -> List[List[Any]]:
+    text = ctx.text
+    spans: List[Span] = []
+
+    # Degree names only where degrees are listed ("M.E" also matches "me").
+    starts = _line_starts(text)
+    education = [
+        (starts[a], starts[b] if b < len(starts) else len(text))
+        for a, b in sections.get("education", ())
+        if a < len(starts)
+    ] or [(0, len(text))]
+    for lo, hi in education:
+        for regex, _ in DEGREE_REGEXES:
+            spans.extend((m.start(), m.end(), "degree") for m in regex.finditer(text, lo, hi) if m.end() > m.start())
+
+    spans.extend(_phrase_spans(text, (d.institution for d in degrees_info), "institution"))
+    spans.extend(_phrase_spans(text, (d.field_of_study for d in degrees_info), "field"))
+    spans.extend(_phrase_spans(text, (e.organization for e in experience["history"]), "organization"))
+    spans.extend(_phrase_spans(text, (e.title for e in experience["history"]), "title"))
+    spans.extend((span.start, span.end, "date") for span in timeline.spans)
+
+    for m in CONTACT_RE.finditer(text):
+        if m.group("email"):
+            spans.append((m.start(), m.end(), "email"))
+            continue
+        candidate = m.group("phone")
+        for part, _ in _phone_parts(candidate):
+            offset = m.start() + candidate.find(part)
+            spans.append((offset, offset + len(part), "phone"))
+
+    if ctx.skill_categories != ():
+        spans.extend(skill_spans(text))
+    return flatten_spans(spans)
+
+
+# Result field -> (producer, key into its value or None for the value itself).
+RESULT_FIELDS: Dict[str, Tuple[str, Optional[Any]]] = {
+    "name": ("name", None),
+    "email": ("contact", "email"),
+    "all_emails": ("all_contacts", "emails"),
+    "phone": ("contact", "phone"),
+    "all_phones": ("all_contacts", "phones"),
+    "current_location": ("location", "location"),
+    "current_location_canonical": ("location", "canonical"),
+    "indian_states_found": ("indian_states", None),
+    "current_organization": ("experience", "current_organization"),
+    "current_organization_id": ("experience", "current_organization_id"),
+    "current_role": ("experience", "current_role"),
+
+    "teaching_experience_years": ("teaching_years", None),
+    "industry_experience_years": ("industry_years", None),
+    "other_experience_years": ("other_years", None),
+    "total_experience_years": ("total_years", None),
+
+    "experience_history": ("experience", "history"),
+    "experience_rows": ("experience", "rows"),
+
+    "publications_total_count": ("publications", "total"),
+    "research_articles_count": ("publications", "articles"),
+    "books_count": ("publications", "books"),
+    "conference_papers_count": ("publications", "conferences"),
+    "has_phd": ("has_phd", None),
+    "highest_degree": ("highest_degree", None),
+    "phd_start_year": ("phd_years", 0),
+    "phd_end_year": ("phd_years", 1),
+    "department": ("department", None),
+    "degrees_detected": ("degrees_detected", None),
+    "degrees_info": ("degrees_info", None),
+    "fields_of_study": ("fields_of_study", None),
+    "score": ("score", None),
+    "spans": ("spans", None),
+}
+
+# Computed only when asked for by name: the result page's highlights.
+OPT_IN_FIELDS = ("spans",)
+DEFAULT_FIELDS = tuple(f for f in RESULT_FIELDS if f not in OPT_IN_FIELDS)
+
+
+def check_fields(fields: Iterable[str]) -> List[str]:
+    fields = list(fields)
+    unknown = [f for f in fields if f not in RESULT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown analysis field(s): {', '.join(unknown)}")
+    return fields
+
+
+# ---------- MAIN PUBLIC FUNCTION ----------
+
+def analyze_resume_text(
+    text: str,
+    target_department: Optional[str] = None,
+    as_of: Optional[date] = None,
+    fields: Optional[Iterable[str]] = None,
+    skill_categories: Optional[Tuple[str, ...]] = None,
+) -> AnalysisResult:
+    """
+    Analyze resume text. With fields (names of AnalysisResult fields) only
+    those are computed, running just the producers they depend on; the
+    other fields of the result are None. Without, every field but the
+    OPT_IN_FIELDS is. skill_categories=() leaves skills out of the spans.
+    """
+    fields = DEFAULT_FIELDS if fields is None else check_fields(fields)
+    ctx = AnalysisContext(text, target_department, as_of, skill_categories)
+    values: Dict[str, Any] = {}
+    for field in fields:
+        name, key = RESULT_FIELDS[field]
+        value = ctx[name]
+        values[field] = value if key is None else value[key]
+    return AnalysisResult(**values)
@@ -1,30 +1,9 @@
 from pathlib import Path
-import pdfplumber
-from docx import Document
 
-def extract_text_from_pdf(path: Path) -> str:
-    text = []
-    with pdfplumber.open(str(path)) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            text.append(page_text)
-    return "\n".join(text)
+from ..utils.file_extractor import extract_text_from_bytes
 
-def extract_text_from_docx(path: Path) -> str:
-    doc = Document(str(path))
-    return "\n".join(p.text for p in doc.paragraphs)
-
-def extract_text_from_txt(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="ignore")
+# Thin path-based wrapper over the shared extractor registry in
+# app.utils.file_extractor; the format is sniffed from the file content.
 
 def extract_text_from_file(path: Path) -> str:
-    suffix = path.suffix.lower()
-
-    if suffix == ".pdf":
-        return extract_text_from_pdf(path)
-    elif suffix == ".docx":
-        return extract_text_from_docx(path)
-    elif suffix == ".txt":
-        return extract_text_from_txt(path)
-    else:
-        raise ValueError(f"Unsupported file type: {suffix}")
\ No newline at end of file
+    return extract_text_from_bytes(Path(path), Path(path).name)
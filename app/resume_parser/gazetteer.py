@@ -0,0 +1,81 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .trie import TokenTrie, tokenize, tokenize_with_spans
+
+GAZETTEER_PATH = Path(__file__).parent / "data" / "gazetteer.tsv"
+
+
+class Place(NamedTuple):
+    name: str
+    kind: str  # "country" | "state" | "city"
+    parent: Optional[str]
+
+
+class Gazetteer:
+    """
+    Place names and their aliases compiled into one TokenTrie. Lookups are
+    word-boundary aware and longest-match ("New Delhi" beats "Delhi"), and
+    every alias resolves to its canonical Place ("Bombay" -> Mumbai).
+    """
+
+    __slots__ = ("places", "_trie")
+
+    def __init__(self, places: List[Place], trie: TokenTrie) -> None:
+        self.places = places
+        self._trie = trie
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def lookup(self, name: str) -> Optional[Place]:
+        return self._trie.get(tokenize(name))
+
+    def find(self, text: str) -> List[Tuple[Place, int, int]]:
+        """Return (place, start, end) character spans in text order."""
+        spans = tokenize_with_spans(text)
+        tokens = [tok for tok, _, _ in spans]
+        return [
+            (place, spans[i][1], spans[j - 1][2])
+            for i, j, place in self._trie.longest_matches(tokens)
+        ]
+
+
+def load_gazetteer(path: Union[str, Path] = GAZETTEER_PATH) -> Gazetteer:
+    places: List[Place] = []
+    trie = TokenTrie()
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.split("\t")
+            cols += [""] * (4 - len(cols))
+            name, kind, parent, aliases = (c.strip() for c in cols[:4])
+            if not name:
+                continue
+
+            place = Place(name, kind or "city", parent or None)
+            places.append(place)
+            for surface in [name] + [a.strip() for a in aliases.split(";") if a.strip()]:
+                tokens = tokenize(surface)
+                if tokens:
+                    trie.insert(tokens, place)
+
+    return Gazetteer(places, trie)
+
+
+@lru_cache(maxsize=None)
+def get_gazetteer() -> Gazetteer:
+    # Loaded once per process; under a preloading server it is built in the
+    # master and shared copy-on-write by the workers.
+    return load_gazetteer()
+
+
+def find_places(text: str) -> List[Dict[str, Any]]:
+    return [
+        {"name": place.name, "kind": place.kind, "parent": place.parent, "start": start, "end": end}
+        for place, start, end in get_gazetteer().find(text)
+    ]
@@ -0,0 +1,132 @@
+# app/resume_parser/organizations.py - canonical employers and institutions
+#
+# Extractors return organization names as written ("TCS", "Tata
+# Consultancy Services Ltd", "JNTU Kakinada"). resolve() maps them to one
+# Organization with a stable id, so aggregations and the candidate store
+# can key on that instead of the raw string.
+#
+# Names and aliases from data/organizations.tsv are normalized to tokens
+# (trie.tokenize, minus legal suffixes and "the"/"and") and compiled into a
+# TokenTrie, like the gazetteer. A name resolves if its normalized tokens
+# are an entry, or else if an entry occurs inside it ("Tata Consultancy
+# Services, Hyderabad"), the longest such entry winning. Only multi-word
+# entries and one-word organization names that are not acronyms are looked
+# for inside longer names: "CTS", "BEL" or "Satyam" inside "CTS Public
+# School" or "Satyam Software Solutions" is another organization. Batch
+# runs see the same few thousand raw strings over and over, so resolve()
+# is memoized.
+
+from functools import lru_cache
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+
+from .trie import TokenTrie, tokenize
+
+ORGANIZATIONS_PATH = Path(__file__).parent / "data" / "organizations.tsv"
+
+# Dropped from names before matching.
+NAME_NOISE = frozenset({
+    "the", "and", "ltd", "limited", "pvt", "private", "inc", "incorporated",
+    "llc", "llp", "plc", "co", "corp", "gmbh",
+})
+
+# One-word names shorter than this ("EY", "HP") only resolve a name that is
+# exactly the name, never one that merely contains it.
+MIN_PARTIAL_CHARS = 4
+
+RESOLVE_CACHE_SIZE = 65536
+
+
+class Organization(NamedTuple):
+    id: str
+    name: str
+    kind: str  # "company" | "institution" | "government"
+
+
+def normalize_name(name: str) -> List[str]:
+    return [tok for tok in tokenize(name) if tok not in NAME_NOISE]
+
+
+def _matches_inside(surface: str, tokens: List[str], is_name: bool) -> bool:
+    """Whether an entry may resolve names it only occurs in (see the header)."""
+    if len(tokens) > 1:
+        return True
+    # Acronyms as written: "IBM", "PwC", "TechM".
+    acronym = sum(c.isupper() for c in surface) > 1
+    return is_name and not acronym and len(tokens[0]) >= MIN_PARTIAL_CHARS
+
+
+class OrganizationIndex:
+    """Organization names and aliases compiled into one TokenTrie."""
+
+    __slots__ = ("organizations", "_trie", "_partial")
+
+    def __init__(self, organizations: List[Organization], trie: TokenTrie, partial: TokenTrie) -> None:
+        self.organizations = organizations
+        self._trie = trie
+        self._partial = partial
+
+    def __len__(self) -> int:
+        return len(self.organizations)
+
+    def resolve(self, name: Optional[str]) -> Optional[Organization]:
+        if not name:
+            return None
+        tokens = normalize_name(name)
+        org = self._trie.get(tokens)
+        if org is not None:
+            return org
+
+        best: Optional[Organization] = None
+        best_len = 0
+        for start, end, candidate in self._partial.longest_matches(tokens):
+            if end - start > best_len:
+                best, best_len = candidate, end - start
+        return best
+
+
+def load_organizations(path: Union[str, Path] = ORGANIZATIONS_PATH) -> OrganizationIndex:
+    organizations: List[Organization] = []
+    trie = TokenTrie()
+    partial = TokenTrie()
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.split("\t")
+            cols += [""] * (4 - len(cols))
+            org_id, name, kind, aliases = (c.strip() for c in cols[:4])
+            if not org_id or not name:
+                continue
+
+            org = Organization(org_id, name, kind or "company")
+            organizations.append(org)
+            for surface in [name] + [a.strip() for a in aliases.split(";") if a.strip()]:
+                tokens = normalize_name(surface)
+                # An alias listed twice keeps its first organization.
+                if not tokens or trie.get(tokens) is not None:
+                    continue
+                trie.insert(tokens, org)
+                if _matches_inside(surface, tokens, surface is name):
+                    partial.insert(tokens, org)
+
+    return OrganizationIndex(organizations, trie, partial)
+
+
+@lru_cache(maxsize=None)
+def get_organizations() -> OrganizationIndex:
+    # Built once per process, like the gazetteer.
+    return load_organizations()
+
+
+@lru_cache(maxsize=RESOLVE_CACHE_SIZE)
+def resolve(name: Optional[str]) -> Optional[Organization]:
+    """The canonical organization a raw employer/institution name refers to."""
+    return get_organizations().resolve(name)
+
+
+def canonical_id(name: Optional[str]) -> Optional[str]:
+    org = resolve(name)
+    return org.id if org is not None else None
@@ -0,0 +1,59 @@
+# app/resume_parser/profiles.py - named analysis profiles
+#
+# A profile is the part of the analysis one hiring pipeline consumes: the
+# AnalysisResult fields to compute (only the producers they depend on run,
+# see advanced_analyzer.RESULT_FIELDS) and the skill categories to match
+# (only those categories' precompiled patterns are tried). "full" is the
+# whole analysis and the only profile whose results are cached.
+
+from typing import Dict, NamedTuple, Optional, Tuple
+
+DEFAULT_PROFILE = "full"
+
+CONTACT_FIELDS = (
+    "name", "email", "all_emails", "phone", "all_phones",
+    "current_location", "current_location_canonical", "indian_states_found",
+)
+DEGREE_FIELDS = ("highest_degree", "degrees_detected", "degrees_info", "fields_of_study")
+
+
+class Profile(NamedTuple):
+    name: str
+    fields: Optional[Tuple[str, ...]]            # None = every field
+    skill_categories: Optional[Tuple[str, ...]]  # None = every category, () = no skills
+
+    @property
+    def is_full(self) -> bool:
+        return self.fields is None and self.skill_categories is None
+
+
+PROFILES: Dict[str, Profile] = {
+    profile.name: profile
+    for profile in [
+        Profile("full", None, None),
+        # University hiring: degrees, PhD, teaching years and publications;
+        # never looks at the skill taxonomy.
+        Profile("academic", None, ()),
+        # Industry hiring: no publications, PhD years or teaching years.
+        Profile(
+            "industry",
+            CONTACT_FIELDS + (
+                "current_organization", "current_organization_id", "current_role",
+                "industry_experience_years", "total_experience_years",
+                "experience_history", "experience_rows",
+            ) + DEGREE_FIELDS,
+            None,
+        ),
+        # Freshers: no work history to parse, so contact, degrees and skills.
+        Profile("fresher", CONTACT_FIELDS + DEGREE_FIELDS + ("department",), None),
+    ]
+}
+
+
+def get_profile(name: Optional[str] = None) -> Profile:
+    try:
+        return PROFILES[name or DEFAULT_PROFILE]
+    except KeyError:
+        raise ValueError(
+            f"Unknown analysis profile {name!r}; expected one of: {', '.join(PROFILES)}"
+        ) from None
@@ -0,0 +1,164 @@
+# app/resume_parser/records.py
+#
+# Slotted record types for analyzer output. Batch runs and the candidate
+# store hold very many of these, and a per-instance __dict__ (plus the
+# repeated key strings of a plain dict) is most of their footprint.
+# Records still answer record["field"] and record.get("field") so code
+# and templates written against the old dicts keep working.
+
+from typing import Any, Dict, Iterable
+
+
+class Record:
+    __slots__ = ()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        fields = self.__slots__
+        if len(args) > len(fields):
+            raise TypeError(f"{type(self).__name__} takes at most {len(fields)} fields")
+        for name, value in zip(fields, args):
+            setattr(self, name, value)
+        for name in fields[len(args):]:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(f"{type(self).__name__} has no field(s): {', '.join(kwargs)}")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return self.__slots__
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def only(self, fields: Iterable[str]) -> "Record":
+        """A copy with just fields set; the others are None."""
+        return type(self)(**{name: getattr(self, name) for name in fields})
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list) and value and isinstance(value[0], Record):
+        return [v.to_dict() for v in value]
+    return value
+
+
+def json_default(obj: Any) -> Any:
+    """`default=` hook for json.dumps so records serialize like the old dicts."""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class DegreeInfo(Record):
+    __slots__ = (
+        "degree_type",
+        "raw_text",
+        "field_of_study",
+        "institution",
+        "institution_id",  # organizations.Organization.id, if institution resolved
+        "start_year",
+        "end_year",
+        "status",
+        "phd_thesis_submitted",
+        "phd_awarded",
+    )
+
+
+class ExperienceEntry(Record):
+    __slots__ = (
+        "title",
+        "organization",
+        "organization_id",  # organizations.Organization.id, if organization resolved
+        "location",
+        "category",
+        "start_year",
+        "start_month",
+        "end_year",
+        "end_month",
+        "ongoing",
+        "duration_months",
+        "start_date_str",
+        "end_date_str",
+        "description",
+        "raw_text",
+    )
+
+
+class AnalysisResult(Record):
+    __slots__ = (
+        "name",
+        "email",
+        "all_emails",
+        "phone",
+        "all_phones",
+        "current_location",
+        "current_location_canonical",
+        "indian_states_found",
+        "current_organization",
+        "current_organization_id",
+        "current_role",
+
+        "teaching_experience_years",
+        "industry_experience_years",
+        "other_experience_years",
+        "total_experience_years",
+
+        "experience_history",
+        "experience_rows",
+
+        "publications_total_count",
+        "research_articles_count",
+        "books_count",
+        "conference_papers_count",
+        "has_phd",
+        "highest_degree",
+        "phd_start_year",
+        "phd_end_year",
+        "department",
+        "degrees_detected",
+        "degrees_info",
+        "fields_of_study",
+        "score",
+
+        # [start, end, label] character offsets into the analyzed text of
+        # every entity found, sorted and non-overlapping (for highlighting).
+        "spans",
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AnalysisResult":
+        result = super().from_dict(data)
+        result.experience_history = [ExperienceEntry.from_dict(e) for e in result.experience_history or []]
+        result.degrees_info = [DegreeInfo.from_dict(d) for d in result.degrees_info or []]
+        return result
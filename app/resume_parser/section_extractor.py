@@ -1,59 +1,163 @@
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional, Tuple
 import re
 
-SECTION_HEADERS = [
-    "SUMMARY",
-    "PROFILE",
-    "OBJECTIVE",
-    "EXPERIENCE",
-    "WORK EXPERIENCE",
-    "PROFESSIONAL EXPERIENCE",
-    "EMPLOYMENT",
-    "EDUCATION",
-    "SKILLS",
-    "TECHNICAL SKILLS",
-    "PROJECTS",
-    "CERTIFICATIONS",
-    "AWARDS",
-    "PUBLICATIONS",
-    "INTERNSHIPS",
-]
+# Section kind -> the headings that open it, written as heading_key()
+# produces them (lower case, "and" as "&"). The one table behind both the
+# sections shown with the result and the section-scoped extractors in
+# advanced_analyzer.
+SECTION_KINDS: Dict[str, List[str]] = {
+    "summary": [
+        "summary", "profile", "objective", "career objective", "professional summary",
+        "profile summary", "career summary", "about me",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "experience details", "teaching experience",
+        "industry experience", "industrial experience", "professional profile",
+    ],
+    "internships": ["internships", "internship", "internship experience"],
+    "education": [
+        "education", "educational qualification", "educational qualifications",
+        "educational details", "education details", "academic background",
+        "academic qualification", "academic qualifications", "academic details",
+        "academic profile", "qualifications", "education & training",
+    ],
+    "skills": ["skills", "technical skills", "key skills", "skill set", "skills & interests", "computer skills"],
+    "projects": ["projects", "academic projects", "project details", "project work"],
+    "certifications": ["certifications", "certification", "certificates", "courses"],
+    "awards": ["awards", "achievements", "awards & achievements", "honours", "honors"],
+    "publications": [
+        "publications", "research publications", "details of research publications",
+        "list of publications", "list of research publications", "journal papers",
+        "research papers", "papers published", "conference papers", "conferences",
+    ],
+    "research": ["research", "research experience", "research interests", "research profile"],
+    "training": [
+        "faculty development programs", "faculty development programmes",
+        "fdp", "fdps", "refresher courses", "workshops", "seminars", "workshops & seminars",
+    ],
+    "personal": ["personal details", "personal information", "personal profile", "personal data"],
+    "other": [
+        "languages", "languages known", "hobbies", "interests", "strengths",
+        "extra curricular activities", "extra-curricular activities", "references",
+    ],
+    "declaration": ["declaration"],
+}
+
+SECTION_TITLES: Dict[str, str] = {
+    title: kind for kind, titles in SECTION_KINDS.items() for title in titles
+}
+
+HEADING_STRIP = " \t:;-–—•*#|.=_"
+MAX_HEADING_WORDS = 6
+CAPS_HEADING_RE = re.compile(r"^[A-Z][A-Z &/]+$")
+PARENTHESES_RE = re.compile(r"\(.*?\)")
+HEADING_FILLER = frozenset({
+    "list", "of", "my", "the", "&", "details", "detail", "particulars", "information",
+    "history", "summary", "record", "records", "brief",
+})
+
+
+class Section(NamedTuple):
+    kind: Optional[str]  # SECTION_KINDS key; None for untitled text and unknown headings
+    heading: str         # as written, "" for the text before the first heading
+    start: int           # index of the first body line (the heading is start - 1)
+    end: int             # one past the last body line
+
+
+def heading_key(line: str) -> str:
+    key = " ".join(line.strip().strip(HEADING_STRIP).lower().split())
+    return key.replace(" and ", " & ")
+
+
+def section_kind(line: str) -> Optional[str]:
+    """The section kind line opens, if it is a known heading."""
+    key = heading_key(line)
+    if not key:
+        return None
+    kind = SECTION_TITLES.get(key)
+    if kind is not None:
+        return kind
+
+    # "LIST OF JOURNAL PAPERS", "Education details (UG onwards)": a known
+    # title plus filler words only. "Research Scholar" is not a heading.
+    words = PARENTHESES_RE.sub(" ", key).split()
+    if len(words) > MAX_HEADING_WORDS:
+        return None
+    for n in range(len(words), 0, -1):
+        for i in range(len(words) - n + 1):
+            kind = SECTION_TITLES.get(" ".join(words[i:i + n]))
+            if kind is not None and HEADING_FILLER.issuperset(words[:i] + words[i + n:]):
+                return kind
+    return None
+
+
+def _is_caps_heading(stripped: str) -> bool:
+    # Patterns like "SKILLS & INTERESTS", "EDUCATION AND TRAINING"
+    return bool(CAPS_HEADING_RE.match(stripped)) and len(stripped.split()) <= 5
+
 
 def is_section_header(line: str) -> bool:
-    stripped = line.strip()
-    upper = stripped.upper()
-    if upper in SECTION_HEADERS:
-        return True
-    # Detect patterns like "SKILLS & INTERESTS", "EDUCATION AND TRAINING"
-    if re.match(r"^[A-Z][A-Z &/]+$", stripped) and len(stripped.split()) <= 5:
-        return True
-    return False
+    return section_kind(line) is not None or _is_caps_heading(line.strip())
+
 
 def normalize_header(line: str) -> str:
-    upper = line.strip().upper()
-    for header in SECTION_HEADERS:
-        if upper == header:
-            return header
-    # fallback: return uppercased line
-    return upper
+    return " ".join(line.strip().strip(HEADING_STRIP).split()).upper()
+
+
+def detect_sections(lines: List[str]) -> List[Section]:
+    """Headed sections of lines, in order, as line ranges."""
+    sections: List[Section] = []
+    kind: Optional[str] = None
+    heading = ""
+    start = 0
+
+    for idx, line in enumerate(lines):
+        line_kind = section_kind(line)
+        if line_kind is None and not _is_caps_heading(line.strip()):
+            continue
+        if idx > start or heading:
+            sections.append(Section(kind, heading, start, idx))
+        kind, heading, start = line_kind, line.strip(), idx + 1
+
+    sections.append(Section(kind, heading, start, len(lines)))
+    return sections
+
+
+def section_ranges(lines: List[str]) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Line ranges per section kind. A known section runs until the next
+    known heading: unknown headings inside it (an all-caps university name
+    in the education list) don't end it.
+    """
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    current: Optional[str] = None
+    for section in detect_sections(lines):
+        if section.kind is not None:
+            current = section.kind
+            ranges.setdefault(current, []).append((section.start, section.end))
+        elif current is not None and section.heading:
+            start, _ = ranges[current][-1]
+            ranges[current][-1] = (start, section.end)
+    return ranges
+
 
 def extract_sections(lines: List[str]) -> Dict[str, str]:
     sections: Dict[str, List[str]] = {}
-    current_header = "GENERAL"
-
-    for line in lines:
-        if is_section_header(line):
-            current_header = normalize_header(line)
-            if current_header not in sections:
-                sections[current_header] = []
-        else:
-            if current_header not in sections:
-                sections[current_header] = []
-            sections[current_header].append(line)
+
+    for section in detect_sections(lines):
+        header = normalize_header(section.heading) if section.heading else "GENERAL"
+        sections.setdefault(header, []).extend(lines[section.start:section.end])
 
     # Join lines back into text per section
     joined_sections = {header: "\n".join(content).strip()
                        for header, content in sections.items()
                        if content and content[0].strip()}
 
-    return joined_sections
\ No newline at end of file
+    return joined_sections
+
+
+def section_lines(lines: List[str], ranges: Dict[str, List[Tuple[int, int]]], *kinds: str) -> List[str]:
+    """Lines of every section of the given kinds, in document order."""
+    spans = sorted(span for kind in kinds for span in ranges.get(kind, ()))
+    return [line for start, end in spans for line in lines[start:end]]
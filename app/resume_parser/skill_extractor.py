@@ -1,25 +1,164 @@
 import re
-from typing import Dict, List
-from .skills_data import TECHNICAL_SKILLS
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .skills_data import NOT_SKILL_TYPOS, TECHNICAL_SKILLS
+from .symspell import SymSpellIndex, Suggestion
+from .trie import tokenize_with_spans
 
 def normalize(text: str) -> str:
     return text.lower()
 
-def extract_skills(text: str) -> Dict[str, List[str]]:
+# Word boundary match for single words,
+# substring for multi-word terms like 'machine learning'.
+# Compiled once at import so request handling never pays for it.
+SKILL_PATTERNS = {
+    category: [(skill, re.compile(r"\b" + re.escape(skill.lower()) + r"\b")) for skill in skills]
+    for category, skills in TECHNICAL_SKILLS.items()
+}
+
+# Every skill in one pass for span offsets; longest first, so "spring
+# boot" is preferred over "spring" at the same position.
+SKILL_SPAN_RE = re.compile(
+    r"\b(?:"
+    + "|".join(
+        re.escape(skill)
+        for skill in sorted({s.lower() for skills in TECHNICAL_SKILLS.values() for s in skills}, key=len, reverse=True)
+    )
+    + r")\b"
+)
+
+
+# ---------- Fuzzy matching ----------
+
+# Skills are looked up by their letters and digits only, so "node js",
+# "NodeJS" and "node.js" share a key, and a run of up to FUZZY_MAX_TOKENS
+# adjacent words is tried joined ("postgre sql"). Short keys would match
+# too many ordinary words, so the allowed distance grows with key length
+# and keys under FUZZY_MIN_LENGTH (aws, go, c and c++ alike) are left out.
+FUZZY_MIN_LENGTH = 4
+FUZZY_MAX_TOKENS = 3
+# Below this key length the one allowed edit must be two swapped letters
+# ("pyhton", "djnago"): any other edit of a short key is too often an
+# English word ("bumpy" / numpy, "scalar" / scala, "reacts" / react).
+FUZZY_SWAP_ONLY_BELOW = 7
+# Characters allowed between words joined into one candidate.
+FUZZY_JOINERS = " .-/"
+NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+
+def fuzzy_key(skill: str) -> str:
+    return NON_ALNUM_RE.sub("", skill.lower())
+
+
+def fuzzy_distance(length: int) -> int:
+    """Edits allowed against a skill key of this length."""
+    if length < 5:
+        return 0
+    return 1 if length < 9 else 2
+
+
+def _build_fuzzy_index() -> SymSpellIndex:
+    keys: Dict[str, List[Tuple[str, str]]] = {}
+    for category, skills in TECHNICAL_SKILLS.items():
+        for skill in skills:
+            keys.setdefault(fuzzy_key(skill), []).append((category, skill))
+    index = SymSpellIndex(max_distance=2)
+    for key, owners in keys.items():
+        if len(key) >= FUZZY_MIN_LENGTH and len({skill for _, skill in owners}) == 1:
+            index.add(key, owners, fuzzy_distance(len(key)))
+    return index
+
+
+FUZZY_INDEX = _build_fuzzy_index()
+# Longer candidates can't be within distance of any key.
+FUZZY_MAX_KEY = max(len(fuzzy_key(s)) for skills in TECHNICAL_SKILLS.values() for s in skills) + FUZZY_INDEX.max_distance
+
+
+def _is_swap(a: str, b: str) -> bool:
+    """b is a with two adjacent characters swapped."""
+    diff = [i for i, (x, y) in enumerate(zip(a, b)) if x != y] if len(a) == len(b) else []
+    return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+
+
+@lru_cache(maxsize=8192)
+def _fuzzy_lookup(candidate: str) -> Optional[Suggestion]:
+    # Resumes repeat the same words; each distinct one is looked up once.
+    hit = FUZZY_INDEX.lookup(candidate)
+    if hit and hit.distance and len(hit.term) < FUZZY_SWAP_ONLY_BELOW and not _is_swap(candidate, hit.term):
+        return None
+    return hit
+
+
+def fuzzy_skills(
+    text: str,
+    categories: Optional[Iterable[str]] = None,
+    exclude: Iterable[str] = (),
+) -> List[Dict[str, Any]]:
+    """
+    Skills written with a typo, odd spacing or punctuation ("kubernates",
+    "postgre sql", "NodeJS"), other than those in exclude (the exact
+    matches). One entry per skill, closest and then first occurrence:
+    {"skill", "category", "matched" (as written), "distance"}.
+    """
+    wanted = None if categories is None else set(categories)
+    skip = set(exclude)
+    tokens = tokenize_with_spans(text)
+    best: Dict[str, Dict[str, Any]] = {}
+
+    for i, (_, start, _) in enumerate(tokens):
+        candidate = ""
+        for j in range(i, min(i + FUZZY_MAX_TOKENS, len(tokens))):
+            token, token_start, end = tokens[j]
+            if j > i and text[tokens[j - 1][2]:token_start].strip(FUZZY_JOINERS):
+                break
+            candidate += token if token.isascii() else fuzzy_key(token)
+            if len(candidate) > FUZZY_MAX_KEY:
+                break
+            # Keys under FUZZY_MIN_LENGTH aren't indexed, and only those of
+            # length 5 and up allow an edit.
+            if len(candidate) < FUZZY_MIN_LENGTH:
+                continue
+            if j == i and (token in NOT_SKILL_TYPOS or token.isdigit()):
+                continue
+            hit = _fuzzy_lookup(candidate)
+            if hit is None:
+                continue
+            for category, skill in hit.value:
+                if skill in skip or (wanted is not None and category not in wanted):
+                    continue
+                seen = best.get(skill)
+                if seen is None or hit.distance < seen["distance"]:
+                    best[skill] = {
+                        "skill": skill,
+                        "category": category,
+                        "matched": text[start:end],
+                        "distance": hit.distance,
+                    }
+    return [best[skill] for skill in sorted(best)]
+
+
+def _patterns_for(categories: Optional[Iterable[str]]):
+    if categories is None:
+        return SKILL_PATTERNS
+    wanted = set(categories)
+    return {c: p for c, p in SKILL_PATTERNS.items() if c in wanted}
+
+
+def extract_skills(text: str, categories: Optional[Iterable[str]] = None, fuzzy: bool = False) -> Dict[str, Any]:
     """
     Simple keyword-based matcher.
     Returns dict: category -> list of matched skills
+    With categories, only those categories' patterns are tried.
+    With fuzzy, near misses of the remaining skills are listed separately
+    under "fuzzy" (see fuzzy_skills); they are not in the categories.
     """
     text_norm = normalize(text)
     found = {}
 
-    for category, skills in TECHNICAL_SKILLS.items():
+    for category, patterns in _patterns_for(categories).items():
         matches = set()
-        for skill in skills:
-            # Word boundary match for single words,
-            # substring for multi-word terms like 'machine learning'
-            pattern = r"\b" + re.escape(skill.lower()) + r"\b"
-            if re.search(pattern, text_norm):
+        for skill, pattern in patterns:
+            if pattern.search(text_norm):
                 matches.add(skill)
         if matches:
             found[category] = sorted(matches)
@@ -27,5 +166,25 @@ def extract_skills(text: str) -> Dict[str, List[str]]:
     # Flatten all skills for a 'all_skills' field if needed
     all_skills = sorted({s for sub in found.values() for s in sub})
     found["all_skills"] = all_skills
+    if fuzzy:
+        found["fuzzy"] = fuzzy_skills(text, categories, all_skills)
+
+    return found
 
-    return found
\ No newline at end of file
+
+def select_skills(skills: Dict[str, List[str]], categories: Iterable[str]) -> Dict[str, List[str]]:
+    """Narrow an extract_skills() result to categories."""
+    wanted = set(categories)
+    found = {c: matches for c, matches in skills.items() if c in wanted and c not in ("all_skills", "fuzzy")}
+    found["all_skills"] = sorted({s for sub in found.values() for s in sub})
+    if "fuzzy" in skills:
+        found["fuzzy"] = [m for m in skills["fuzzy"] if m["category"] in wanted]
+    return found
+
+
+def skill_spans(text: str) -> List[Tuple[int, int, str]]:
+    """(start, end, "skill") for every skill mention in text, non-overlapping."""
+    text_norm = normalize(text)
+    if len(text_norm) != len(text):
+        return []  # lower() changed the length, offsets would not line up
+    return [(m.start(), m.end(), "skill") for m in SKILL_SPAN_RE.finditer(text_norm)]
@@ -23,4 +23,9 @@ TECHNICAL_SKILLS = {
         "git", "github", "gitlab", "bitbucket", "jira", "jenkins",
         "ci/cd"
     ],
-}
\ No newline at end of file
+}
+
+# Ordinary words one edit away from a longer skill ("seaborne" / "seaborn");
+# fuzzy skill matching never corrects these. Short skills need no entries:
+# they only match with two letters swapped (skill_extractor).
+NOT_SKILL_TYPOS = {"expresso", "seaborne"}
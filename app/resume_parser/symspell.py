@@ -0,0 +1,116 @@
+# app/resume_parser/symspell.py - bounded edit-distance lookup (SymSpell)
+#
+# Symmetric delete: every dictionary term is stored under each string
+# obtained by deleting up to max_distance of its characters. Two words are
+# within edit distance d only if some pair of their deletes (at most d
+# each) coincide, so a lookup generates the query's deletes, collects the
+# terms stored under them and verifies each with a real distance. The
+# work per lookup depends on the query's length and the distance bound,
+# not on the size of the dictionary.
+#
+# Deletes are only taken over the first PREFIX_LENGTH characters (the
+# SymSpell prefix trick); that keeps the table small for long terms and
+# the final distance check still compares whole strings.
+
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+PREFIX_LENGTH = 7
+
+
+class Suggestion(NamedTuple):
+    term: str
+    distance: int
+    value: Any
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """word and every string left after deleting up to max_distance characters."""
+    found = {word}
+    level = found
+    for _ in range(max_distance):
+        level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))} - found
+        if not level:
+            break
+        found |= level
+    return found
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), or limit + 1 if it exceeds limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+class SymSpellIndex:
+    """
+    Terms with a per-term distance bound: lookup(word) finds the closest
+    term whose own bound admits word. Build once, then read-only.
+    """
+
+    __slots__ = ("max_distance", "_terms", "_deletes", "_bounds")
+
+    def __init__(self, max_distance: int = 2) -> None:
+        self.max_distance = max_distance
+        self._terms: Dict[str, Any] = {}                # term -> (bound, value)
+        self._deletes: Dict[str, List[str]] = {}
+        self._bounds: Dict[int, int] = {}               # term length -> largest bound
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._terms
+
+    def add(self, term: str, value: Any, max_distance: Optional[int] = None) -> None:
+        bound = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if term in self._terms:
+            return
+        self._terms[term] = (bound, value)
+        self._bounds[len(term)] = max(bound, self._bounds.get(len(term), 0))
+        for key in deletes(term[:PREFIX_LENGTH], bound):
+            self._deletes.setdefault(key, []).append(term)
+
+    def lookup(self, word: str) -> Optional[Suggestion]:
+        """The nearest term within its bound of word; ties go to the alphabetically first."""
+        hit = self._terms.get(word)
+        if hit is not None:
+            return Suggestion(word, 0, hit[1])
+
+        # Only terms within their own bound of word's length can match, so
+        # the query needs no deeper deletes than the largest such bound.
+        reach = max(
+            (bound for length, bound in self._bounds.items() if abs(length - len(word)) <= bound),
+            default=-1,
+        )
+        if reach < 1:
+            return None
+        best: Optional[Suggestion] = None
+        seen: Set[str] = set()
+        for key in deletes(word[:PREFIX_LENGTH], reach):
+            for term in self._deletes.get(key, ()):
+                if term in seen:
+                    continue
+                seen.add(term)
+                bound, value = self._terms[term]
+                limit = bound if best is None else min(bound, best.distance)
+                distance = osa_distance(word, term, limit)
+                if distance > limit or (best is not None and distance == best.distance and term >= best.term):
+                    continue
+                best = Suggestion(term, distance, value)
+        return best
@@ -0,0 +1,228 @@
+import re
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# ---------- Date range patterns ----------
+
+MONTH_PATTERN = (
+    r"(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+    r"Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|"
+    r"Nov(?:ember)?|Dec(?:ember)?)"
+)
+
+MONTH_RANGE_RE = re.compile(
+    rf"(?:(?:From|from|Since|since)\s+)?"
+    rf"(?P<from_day>\d{{1,2}}(?:st|nd|rd|th)?\s+)?"
+    rf"(?P<from_month>{MONTH_PATTERN})\s+(?P<from_year>\d{{4}})\s*"
+    rf"(?:[-–]|to)\s*"
+    rf"(?:(?P<to_day>\d{{1,2}}(?:st|nd|rd|th)?\s+)?"
+    rf"(?P<to_month>{MONTH_PATTERN})\s+(?P<to_year>\d{{4}})|"
+    r"(?P<to_label>Present|Currently Working|Current|Till Date|Till date|Now|till date))",
+    re.IGNORECASE,
+)
+
+NUMERIC_RANGE_RE = re.compile(
+    r"(?P<from_d>\d{1,2})[./-]\s*(?P<from_m>\d{1,2})[./-]\s*(?:[A-Za-z]{0,2})?(?P<from_y>\d{2,4})\s*"
+    r"(?:to|[-–])\s*"
+    r"(?:(?P<to_d>\d{1,2})[./-]\s*(?P<to_m>\d{1,2})[./-]\s*(?:[A-Za-z]{0,2})?(?P<to_y>\d{2,4})|"
+    r"(?P<to_label>Present|Currently Working|Current|Till Date|Till today|Today|Now|till today))",
+    re.IGNORECASE,
+)
+
+YEAR_RANGE_RE = re.compile(
+    r"(?P<start>(?:19|20)\d{2})\s*(?:[-–/]|to)\s*"
+    r"(?P<end>(?:19|20)\d{2}|present|current|ongoing|till date|now)",
+    re.IGNORECASE,
+)
+
+# A line ending in a range's start and its connector ("Jan 2015 -"): the
+# range is finished on the next line.
+DANGLING_RANGE_RE = re.compile(r"\d\s*(?:[-–]|\bto)\s*$", re.IGNORECASE)
+
+MONTH_MAP = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# When one line holds several kinds of range, this is the order in which
+# the line's primary date is chosen (most specific first).
+KIND_PRIORITY = ("month", "numeric", "year")
+
+
+def normalize_year(year_str: str, as_of: Optional[date] = None) -> int:
+    y = int(year_str)
+    if len(year_str) == 4:
+        return y
+    cur_yy = (as_of or date.today()).year % 100
+    if y <= cur_yy:
+        return 2000 + y
+    return 1900 + y
+
+
+class DateSpan(NamedTuple):
+    kind: str              # "month" | "numeric" | "year"
+    line: int              # index into text.splitlines()
+    start: int             # character offsets into the text
+    end: int
+    date_text: str
+    from_year: int
+    from_month: int
+    to_year: Optional[int]   # None when ongoing
+    to_month: Optional[int]
+    ongoing: bool
+
+
+def _span_from_match(kind: str, m: "re.Match", line_idx: int, offset: int, as_of: date) -> Optional[DateSpan]:
+    if kind == "month":
+        from_month = MONTH_MAP.get(m.group("from_month")[:3].lower())
+        from_year = int(m.group("from_year"))
+        if from_month is None:
+            return None
+        if m.group("to_month"):
+            to_month = MONTH_MAP.get(m.group("to_month")[:3].lower())
+            to_year = int(m.group("to_year"))
+            ongoing = False
+        else:
+            to_month = to_year = None
+            ongoing = True
+
+    elif kind == "numeric":
+        from_month = int(m.group("from_m"))
+        from_year = normalize_year(m.group("from_y"), as_of)
+        if not (1 <= from_month <= 12):
+            return None
+        if m.group("to_label"):
+            to_month = to_year = None
+            ongoing = True
+        else:
+            to_month = int(m.group("to_m"))
+            to_year = normalize_year(m.group("to_y"), as_of)
+            if not (1 <= to_month <= 12):
+                return None
+            ongoing = False
+
+    else:
+        from_year = int(m.group("start"))
+        from_month = 1
+        end_raw = m.group("end")
+        if end_raw.isdigit():
+            to_year = int(end_raw)
+            to_month = 12
+            ongoing = False
+        else:
+            to_month = to_year = None
+            ongoing = True
+
+    return DateSpan(
+        kind, line_idx, offset + m.start(), offset + m.end(), m.group(0),
+        from_year, from_month, to_year, to_month, ongoing,
+    )
+
+
+def month_ordinal(year: int, month: int) -> int:
+    return year * 12 + month
+
+
+def month_interval(
+    from_year: int,
+    from_month: Optional[int],
+    to_year: Optional[int],
+    to_month: Optional[int],
+    ongoing: bool,
+    as_of: date,
+) -> Tuple[int, int]:
+    """Half-open month-ordinal interval of a range; ongoing ranges end at as_of."""
+    if ongoing:
+        to_year, to_month = as_of.year, as_of.month
+    return month_ordinal(from_year, from_month or 1), month_ordinal(to_year, to_month or 12)
+
+
+def merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping/adjacent half-open [start, end) intervals, O(n log n)."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def covered_months(intervals: List[Tuple[int, int]]) -> int:
+    return sum(end - start for start, end in merge_intervals(intervals))
+
+
+class Timeline:
+    """
+    Every date range in a resume, collected in one pass per line and
+    evaluated against a single as-of date. Ranges nested inside another
+    match (e.g. the "2015 - Present" inside "Jan 2015 - Present") are
+    dropped, so each period is seen once by every consumer. Lines in the
+    skip ranges (start, end) - sections that are not work history - are
+    not searched.
+    """
+
+    __slots__ = ("text", "lines", "as_of", "spans", "_primary")
+
+    def __init__(
+        self, text: str, as_of: Optional[date] = None, skip: Iterable[Tuple[int, int]] = ()
+    ) -> None:
+        self.text = text
+        skip = list(skip)
+        self.as_of = as_of or date.today()
+        self.lines: List[str] = []
+        candidates: List[DateSpan] = []
+
+        raw_lines = text.splitlines(keepends=True)
+        offset = 0
+        for idx, raw_line in enumerate(raw_lines):
+            line = (raw_line.splitlines() or [""])[0]
+            self.lines.append(line)
+            if any(start <= idx < end for start, end in skip):
+                offset += len(raw_line)
+                continue
+            # A wrapped range is matched across the line break (the patterns
+            # allow whitespace around the connector) and belongs to the line
+            # it starts on; its copy found again on the next line is nested
+            # and dropped below.
+            scope = line
+            if idx + 1 < len(raw_lines) and DANGLING_RANGE_RE.search(line):
+                scope = raw_line + (raw_lines[idx + 1].splitlines() or [""])[0]
+            for kind, regex in (("month", MONTH_RANGE_RE), ("numeric", NUMERIC_RANGE_RE), ("year", YEAR_RANGE_RE)):
+                for m in regex.finditer(scope):
+                    span = _span_from_match(kind, m, idx, offset, self.as_of)
+                    if span is not None:
+                        candidates.append(span)
+            offset += len(raw_line)
+
+        self.spans: List[DateSpan] = []
+        max_end = -1
+        for span in sorted(candidates, key=lambda s: (s.start, -s.end, KIND_PRIORITY.index(s.kind))):
+            if span.end <= max_end:
+                continue  # nested inside an earlier, longer match
+            self.spans.append(span)
+            max_end = span.end
+
+        self._primary: Dict[int, DateSpan] = {}
+        for span in self.spans:
+            current = self._primary.get(span.line)
+            if current is None or KIND_PRIORITY.index(span.kind) < KIND_PRIORITY.index(current.kind):
+                self._primary[span.line] = span
+
+    def line_span(self, line_idx: int) -> Optional[DateSpan]:
+        """The line's primary date range (month names beat numeric beat years)."""
+        return self._primary.get(line_idx)
+
+    def has_date(self, line_idx: int) -> bool:
+        return line_idx in self._primary
+
+    def interval(self, span: DateSpan) -> Tuple[int, int]:
+        """Half-open month-ordinal interval covered by span."""
+        return month_interval(
+            span.from_year, span.from_month, span.to_year, span.to_month, span.ongoing, self.as_of
+        )
+
+    def duration_months(self, span: DateSpan) -> int:
+        start, end = self.interval(span)
+        return end - start
@@ -0,0 +1,98 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Words are runs of letters/digits; punctuation and whitespace separate them,
+# so "U.S.A." and "u s a" tokenize the same way.
+WORD_RE = re.compile(r"[^\W_]+")
+
+# Edge keys pack (node, token id) into a single int instead of a tuple,
+# which keeps the trie small enough to build once and share between workers.
+_TOKEN_BITS = 24
+
+
+def tokenize_with_spans(text: str) -> List[Tuple[str, int, int]]:
+    return [(m.group(0).lower(), m.start(), m.end()) for m in WORD_RE.finditer(text)]
+
+
+def tokenize(text: str) -> List[str]:
+    return [m.group(0).lower() for m in WORD_RE.finditer(text)]
+
+
+class TokenTrie:
+    """
+    Word-level trie. Matching walks whole tokens, so every hit starts and
+    ends on a word boundary, and scanning always prefers the longest entry.
+    """
+
+    __slots__ = ("_vocab", "_edges", "_values", "_nodes")
+
+    def __init__(self) -> None:
+        self._vocab: Dict[str, int] = {}
+        self._edges: Dict[int, int] = {}
+        self._values: Dict[int, Any] = {}
+        self._nodes = 1  # node 0 is the root
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def insert(self, tokens: Iterable[str], value: Any) -> None:
+        node = 0
+        for tok in tokens:
+            tok_id = self._vocab.get(tok)
+            if tok_id is None:
+                tok_id = len(self._vocab) + 1
+                self._vocab[tok] = tok_id
+            key = (node << _TOKEN_BITS) | tok_id
+            child = self._edges.get(key)
+            if child is None:
+                child = self._nodes
+                self._nodes += 1
+                self._edges[key] = child
+            node = child
+        if node:
+            self._values[node] = value
+
+    def get(self, tokens: Iterable[str]) -> Optional[Any]:
+        node = 0
+        for tok in tokens:
+            tok_id = self._vocab.get(tok)
+            if tok_id is None:
+                return None
+            node = self._edges.get((node << _TOKEN_BITS) | tok_id)
+            if node is None:
+                return None
+        return self._values.get(node)
+
+    def longest_matches(self, tokens: List[str]) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Yield (start, end, value) token ranges, scanning left to right and
+        taking the longest entry at each position. Matches never overlap.
+        """
+        vocab = self._vocab
+        edges = self._edges
+        values = self._values
+        ids = [vocab.get(tok, 0) for tok in tokens]
+        n = len(ids)
+
+        i = 0
+        while i < n:
+            if not ids[i]:
+                i += 1
+                continue
+            node = 0
+            best_end = -1
+            best_value = None
+            j = i
+            while j < n and ids[j]:
+                node = edges.get((node << _TOKEN_BITS) | ids[j])
+                if node is None:
+                    break
+                j += 1
+                if node in values:
+                    best_end = j
+                    best_value = values[node]
+            if best_end == -1:
+                i += 1
+                continue
+            yield i, best_end, best_value
+            i = best_end
@@ -0,0 +1,77 @@
+# app/uploads.py - how upload bodies are received
+#
+# File parts are written to a SpooledTemporaryFile: small uploads stay in
+# memory, anything over UPLOAD_SPOOL_THRESHOLD rolls over to disk while it
+# is being received. Views then stream the upload into UPLOAD_FOLDER and
+# hand the extractors a path, so no step holds the whole file in memory.
+#
+# Callers presenting a BULK_API_TOKENS bearer token on BULK_PATH get
+# BULK_MAX_CONTENT_LENGTH instead of MAX_CONTENT_LENGTH. They may also ask
+# for a subset of the analysis with ?profile=industry (see
+# resume_parser.profiles) and/or ?fields=email,highest_degree,... and
+# add typo-tolerant skill matches with ?fuzzy_skills=1.
+
+import hmac
+from tempfile import SpooledTemporaryFile
+from typing import IO, Callable, Iterable, List, Mapping, Optional
+
+from flask import Request, current_app
+
+BULK_PATH = "/api/analyze"
+
+StreamFactory = Callable[..., IO[bytes]]
+
+
+def spooled_stream_factory(threshold: int) -> StreamFactory:
+    def factory(total_content_length, content_type, filename, content_length=None) -> IO[bytes]:
+        return SpooledTemporaryFile(max_size=threshold, mode="rb+")
+    return factory
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if authorization and authorization[:7].lower() == "bearer ":
+        return authorization[7:].strip() or None
+    return None
+
+
+def is_bulk_token(token: Optional[str], tokens: Iterable[str]) -> bool:
+    if not token:
+        return False
+    # Compare against every token so timing doesn't reveal a prefix match.
+    ok = False
+    for candidate in tokens:
+        ok |= hmac.compare_digest(token.encode(), candidate.encode())
+    return ok
+
+
+def requested_fields(value: Optional[str]) -> Optional[List[str]]:
+    """The ?fields= query parameter: comma-separated AnalysisResult fields."""
+    if value is None:
+        return None
+    return [f.strip() for f in value.split(",") if f.strip()]
+
+
+def query_flag(value: Optional[str]) -> bool:
+    """A boolean query parameter such as ?fuzzy_skills=1."""
+    return (value or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def upload_limit(path: str, headers: Mapping[str, str], config: Mapping) -> Optional[int]:
+    """Maximum request body size for this request."""
+    if path == BULK_PATH and is_bulk_token(bearer_token(headers.get("Authorization")), config["BULK_API_TOKENS"]):
+        return config["BULK_MAX_CONTENT_LENGTH"]
+    return config["MAX_CONTENT_LENGTH"]
+
+
+class SpooledRequest(Request):
+    """Flask request class: spooled file parts and a per-route size limit."""
+
+    @property
+    def max_content_length(self) -> Optional[int]:  # type: ignore[override]
+        if not current_app:
+            return None
+        return upload_limit(self.path, self.headers, current_app.config)
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None) -> IO[bytes]:
+        threshold = current_app.config["UPLOAD_SPOOL_THRESHOLD"]
+        return spooled_stream_factory(threshold)(total_content_length, content_type, filename, content_length)
@@ -0,0 +1,122 @@
+# app/utils/docx_stream.py
+#
+# Lean DOCX text extraction: streams word/document.xml (and the page
+# headers) straight out of the zip with an incremental XML parser and
+# never builds a document object model. Unlike python-docx's
+# document.paragraphs it also yields table cells and text boxes, in
+# document order.
+
+import re
+import zipfile
+from io import BytesIO
+from typing import IO, Iterator, List, Union
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+HEADER_PART_RE = re.compile(r"^word/header\d*\.xml$")
+
+# Runs of text and the few inline elements that stand for characters.
+_INLINE_TEXT = {
+    W + "tab": "\t",
+    W + "br": "\n",
+    W + "cr": "\n",
+    W + "noBreakHyphen": "-",
+}
+
+
+def _iter_part(stream: IO[bytes]) -> Iterator[str]:
+    """
+    Yield one string per paragraph, and one per table row with its cells
+    joined by " | ". Text inside mc:Fallback is skipped because it repeats
+    the text box content already present in mc:Choice.
+    """
+    paragraphs: List[List[str]] = []   # open w:p buffers (text boxes nest them)
+    rows: List[List[str]] = []         # open w:tr buffers, one entry per cell
+    cells: List[List[str]] = []        # open w:tc buffers, one entry per paragraph
+    fallback_depth = 0
+    depth = 0
+    body = None
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+
+        if event == "start":
+            depth += 1
+            if tag == W + "body":
+                body = elem
+            elif tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                continue
+            elif tag == W + "p":
+                paragraphs.append([])
+            elif tag == W + "tr":
+                rows.append([])
+            elif tag == W + "tc":
+                cells.append([])
+            continue
+
+        depth -= 1
+
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == W + "t":
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag in _INLINE_TEXT:
+            if paragraphs:
+                paragraphs[-1].append(_INLINE_TEXT[tag])
+        elif tag == W + "p":
+            text = "".join(paragraphs.pop()).strip() if paragraphs else ""
+            if text:
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text
+        elif tag == W + "tc":
+            cell = " ".join(cells.pop()) if cells else ""
+            if rows:
+                rows[-1].append(cell)
+        elif tag == W + "tr":
+            row = [c for c in rows.pop() if c] if rows else []
+            if row:
+                line = " | ".join(row)
+                if cells:
+                    cells[-1].append(line)   # nested table
+                else:
+                    yield line
+
+        # Drop everything already consumed so memory stays flat no matter
+        # how long the document is.
+        if body is not None and depth == 2:
+            body.clear()
+
+
+def iter_docx_text(source: Union[bytes, str, IO[bytes]]) -> Iterator[str]:
+    """Yield header and body text lines of a .docx in document order."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = BytesIO(source)
+
+    with zipfile.ZipFile(source) as zf:
+        names = zf.namelist()
+
+        # Contact details often live in the page header. Sections can carry
+        # first/even/default headers with the same text; keep each line once.
+        seen_header = set()
+        for part in sorted(n for n in names if HEADER_PART_RE.match(n)):
+            with zf.open(part) as stream:
+                for line in _iter_part(stream):
+                    if line not in seen_header:
+                        seen_header.add(line)
+                        yield line
+
+        with zf.open("word/document.xml") as stream:
+            yield from _iter_part(stream)
+
+
+def extract_docx_text(source: Union[bytes, str, IO[bytes]]) -> str:
+    return "\n".join(iter_docx_text(source))
@@ -1,68 +1,237 @@
 # app/utils/file_extractor.py
 
-from io import BytesIO
-from typing import Optional
+import logging
+import time
+import zipfile
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
 
-import fitz  # PyMuPDF
-import pdfplumber
-from docx import Document
+from .docx_stream import extract_docx_text
+from .pdf_layout import iter_pdf_layout_pages
+from .source import Source, as_file, open_pdf, read_all, read_head
 
+# PyMuPDF, pdfplumber and python-docx are imported on first use of their
+# format, so processes that only ever see TXT (CLI runs, batch jobs, tests)
+# never pay for loading them. Preloading servers call preload_backends().
 
-def extract_text_from_bytes(file_bytes: bytes, filename: Optional[str]) -> str:
+logger = logging.getLogger(__name__)
+
+SNIFF_BYTES = 8192
+
+_BOMS = (
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+)
+
+
+def preload_backends() -> None:
+    import fitz  # noqa: F401  (PyMuPDF)
+    import pdfplumber  # noqa: F401
+    import docx  # noqa: F401
+
+
+# ---------- Backend registry ----------
+
+class Backend(NamedTuple):
+    name: str
+    fmt: str    # "pdf" | "docx" | "txt"
+    cost: int   # relative cost; cheaper backends are tried first
+    extract: Callable[[Source], str]
+    # Page texts one at a time, for backends of paged formats; extract is
+    # then their "\n"-join. Lets callers watch progress (see utils.sandbox).
+    pages: Optional[Callable[[Source], Iterator[str]]] = None
+
+
+_BACKENDS: Dict[str, Backend] = {}
+
+PageCallback = Callable[[Backend, int, str], None]
+
+
+def register_backend(
+    name: str,
+    fmt: str,
+    cost: int,
+    extract: Optional[Callable[[Source], str]] = None,
+    pages: Optional[Callable[[Source], Iterator[str]]] = None,
+) -> None:
+    if extract is None:
+        if pages is None:
+            raise ValueError(f"Backend {name} needs extract or pages")
+        extract = lambda source: "\n".join(pages(source))  # noqa: E731
+    _BACKENDS[name] = Backend(name, fmt, cost, extract, pages)
+
+
+def _run_backend(backend: Backend, source: Source, on_page: Optional[PageCallback]) -> str:
+    if on_page is None or backend.pages is None:
+        return backend.extract(source)
+    pages = []
+    for i, text in enumerate(backend.pages(source)):
+        on_page(backend, i, text)
+        pages.append(text)
+    return "\n".join(pages)
+
+
+def backends_for(fmt: str, order: Optional[List[str]] = None) -> List[Backend]:
     """
-    Extract text from PDF, DOCX, or TXT file bytes.
+    Backends able to read fmt. With an explicit order only the named
+    backends are used, in that order; otherwise cheapest first.
     """
+    if order:
+        unknown = [name for name in order if name not in _BACKENDS]
+        if unknown:
+            raise ValueError(f"Unknown extractor backend(s): {', '.join(unknown)}")
+        return [_BACKENDS[name] for name in order if _BACKENDS[name].fmt == fmt]
+    return sorted((b for b in _BACKENDS.values() if b.fmt == fmt), key=lambda b: b.cost)
 
-    if not filename:
-        raise ValueError("Filename is required to detect file type.")
 
-    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+# ---------- Format sniffing ----------
 
-    if ext == "pdf":
-        return _extract_text_from_pdf(file_bytes)
-    elif ext == "docx":
-        return _extract_text_from_docx(file_bytes)
-    elif ext == "txt":
-        return _extract_text_from_txt(file_bytes)
+def detect_encoding(head: bytes, truncated: bool = False) -> str:
+    """
+    Encoding of a text file from its first bytes (truncated: head is not
+    the whole file). The BOM codecs ("utf-8-sig", "utf-16") drop the BOM
+    when decoding.
+    """
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the probe is still UTF-8.
+        if not (truncated and e.reason == "unexpected end of data"):
+            return "latin-1"
+    return "ascii" if head.isascii() else "utf-8"
+
+
+def sniff_format(source: Source) -> Optional[str]:
+    """
+    Detect the document format from its content (magic bytes), not its name.
+    Returns "pdf", "docx", "txt" or None for anything else.
+    """
+    head = read_head(source, SNIFF_BYTES)
+
+    # The PDF spec allows junk before the header within the first 1 KB.
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(as_file(source)) as zf:
+                if "word/document.xml" in zf.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            pass
+        return None
+
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        # NUL bytes are half of any UTF-16 text; count control characters instead.
+        codec = "utf-16-be" if head.startswith(b"\xfe\xff") else "utf-16-le"
+        units = [ord(c) for c in head[2: len(head) & ~1].decode(codec, errors="replace")]
+    elif b"\x00" in head:
+        return None
     else:
+        units = head
+    control = sum(1 for u in units if u < 32 and u not in (9, 10, 12, 13))
+    if control <= len(units) * 0.05:
+        return "txt"
+    return None
+
+
+# ---------- Public API ----------
+
+def extract_document(
+    source: Source,
+    filename: Optional[str] = None,
+    backend_order: Optional[Dict[str, List[str]]] = None,
+    on_page: Optional[PageCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Sniff the format and run its backends until one returns text.
+
+    Returns a dict with the text, the detected format, the backend that
+    produced the text and one entry per attempt (timing, size, error) so
+    the cascade can be tuned from real traffic.
+
+    on_page(backend, index, text) is called as each page comes out of a
+    backend that produces pages (the PDF ones).
+    """
+    fmt = sniff_format(source)
+    if fmt is None:
         raise ValueError("Unsupported file type. Use PDF, DOCX, or TXT.")
 
+    order = (backend_order or {}).get(fmt)
+    attempts: List[Dict[str, Any]] = []
 
-def _extract_text_from_pdf(file_bytes: bytes) -> str:
-    text = ""
+    for backend in backends_for(fmt, order):
+        t0 = time.perf_counter()
+        error = None
+        try:
+            text = _run_backend(backend, source, on_page).strip()
+        except Exception as e:
+            text = ""
+            error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - t0
 
-    # Try PyMuPDF first (usually best reading order)
-    try:
-        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
-            for page in doc:
-                text += page.get_text("text") + "\n"
-    except Exception:
-        text = ""
+        attempts.append({
+            "backend": backend.name,
+            "seconds": round(elapsed, 4),
+            "chars": len(text),
+            "error": error,
+        })
+        logger.debug("extract %s fmt=%s backend=%s %.1fms chars=%d error=%s",
+                     filename, fmt, backend.name, elapsed * 1000, len(text), error)
 
-    text = text.strip()
+        if text:
+            return {"text": text, "format": fmt, "backend": backend.name, "attempts": attempts}
 
-    # If PyMuPDF worked, return
-    if text:
-        return text
+    if attempts and all(a["error"] for a in attempts):
+        raise ValueError(attempts[-1]["error"])
 
-    # Fallback: pdfplumber
-    with pdfplumber.open(BytesIO(file_bytes)) as pdf:
+    return {"text": "", "format": fmt, "backend": None, "attempts": attempts}
+
+
+def extract_text_from_bytes(file_bytes: Source, filename: Optional[str] = None) -> str:
+    """
+    Extract text from PDF, DOCX, or TXT file bytes.
+    """
+    return extract_document(file_bytes, filename)["text"]
+
+
+# ---------- Built-in backends ----------
+
+def _pages_pymupdf(source: Source) -> Iterator[str]:
+    with open_pdf(source) as doc:
+        for page in doc:
+            yield page.get_text("text")
+
+
+def _pages_pdfplumber(source: Source) -> Iterator[str]:
+    import pdfplumber
+
+    with pdfplumber.open(as_file(source)) as pdf:
         for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            text += page_text + "\n"
+            yield page.extract_text() or ""
 
-    return text.strip()
 
+def _extract_text_python_docx(source: Source) -> str:
+    from docx import Document
 
-def _extract_text_from_docx(file_bytes: bytes) -> str:
-    document = Document(BytesIO(file_bytes))
+    document = Document(as_file(source))
     paragraphs = [p.text for p in document.paragraphs if p.text]
-    return "\n".join(paragraphs).strip()
+    return "\n".join(paragraphs)
 
 
-def _extract_text_from_txt(file_bytes: bytes) -> str:
-    try:
-        return file_bytes.decode("utf-8").strip()
-    except UnicodeDecodeError:
-        # Fallback if encoding is not UTF-8
-        return file_bytes.decode("latin-1", errors="ignore").strip()
\ No newline at end of file
+def _extract_text_from_txt(source: Source) -> str:
+    # Same detection as upload triage (utils.preflight): BOM, else UTF-8,
+    # else Latin-1, which decodes any bytes.
+    file_bytes = read_all(source)
+    return file_bytes.decode(detect_encoding(file_bytes), errors="replace")
+
+
+register_backend("text", "txt", 0, _extract_text_from_txt)
+register_backend("pymupdf-layout", "pdf", 1, pages=iter_pdf_layout_pages)  # column-aware; pdfplumber only for weak pages
+register_backend("pymupdf", "pdf", 2, pages=_pages_pymupdf)      # raw content-stream order
+register_backend("docx-stream", "docx", 1, extract_docx_text)    # also reads tables, text boxes, headers
+register_backend("python-docx", "docx", 2, _extract_text_python_docx)
+register_backend("pdfplumber", "pdf", 5, pages=_pages_pdfplumber)
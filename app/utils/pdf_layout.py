@@ -0,0 +1,158 @@
+# app/utils/pdf_layout.py
+#
+# Layout-aware PDF text extraction on top of PyMuPDF. Text blocks are put
+# back into reading order (detecting two-column layouts), each page gets a
+# quality score, and only pages scoring below QUALITY_THRESHOLD are
+# re-extracted with the much slower pdfplumber.
+
+import logging
+import unicodedata
+from contextlib import ExitStack
+from typing import Iterator, List, Optional, Tuple
+
+from .source import Source, as_file, open_pdf
+
+logger = logging.getLogger(__name__)
+
+Block = Tuple[float, float, float, float, str]  # x0, y0, x1, y1, text
+
+QUALITY_THRESHOLD = 0.6
+
+# A column break must sit in the middle half of the page. Blocks crossing
+# it (name/title banners, full-width lines) are read as spanning; more
+# than this fraction of them means the page isn't really in columns.
+MAX_SPANNING_FRACTION = 0.25
+# Right-hand blocks vertically aligned with left-hand ones (dates next to
+# job titles, label/value pairs) mean rows, not columns.
+ROW_ALIGN_TOLERANCE = 3.0
+
+
+def _text_blocks(page) -> List[Block]:
+    blocks = []
+    for x0, y0, x1, y1, text, _, block_type in page.get_text("blocks"):
+        if block_type == 0 and text.strip():
+            blocks.append((x0, y0, x1, y1, text.strip()))
+    return blocks
+
+
+def _find_gutter(blocks: List[Block], width: float) -> Optional[float]:
+    """
+    Best x for a column break: a left edge of some block in the middle of
+    the page with text on both sides and few blocks crossing it.
+    """
+    candidates = sorted({b[0] for b in blocks if 0.25 * width <= b[0] <= 0.75 * width})
+    max_spanning = len(blocks) * MAX_SPANNING_FRACTION
+
+    best_score = 0
+    gutter = None
+    for x in candidates:
+        left = sum(1 for b in blocks if b[2] <= x)
+        right = sum(1 for b in blocks if b[0] >= x)
+        spanning = len(blocks) - left - right
+        if left < 2 or right < 2 or spanning > max_spanning:
+            continue
+        score = min(left, right) - spanning
+        if score > best_score:
+            best_score, gutter = score, x
+    return gutter
+
+
+def _is_row_layout(left: List[Block], right: List[Block]) -> bool:
+    centers = [(b[1] + b[3]) / 2 for b in left]
+    aligned = sum(
+        1 for b in right
+        if any(abs((b[1] + b[3]) / 2 - c) <= ROW_ALIGN_TOLERANCE for c in centers)
+    )
+    return aligned * 2 > len(right)
+
+
+def order_blocks(blocks: List[Block], width: float) -> Tuple[List[Block], bool]:
+    """
+    Reading order for a page's blocks. Returns (ordered blocks, two_column).
+    Spanning blocks (headers, full-width lines) split the page into bands;
+    within a band the left column is read before the right one.
+    """
+    by_position = sorted(blocks, key=lambda b: (round(b[1]), b[0]))
+    gutter = _find_gutter(blocks, width)
+    if gutter is None:
+        return by_position, False
+
+    left = [b for b in blocks if b[2] <= gutter]
+    right = [b for b in blocks if b[0] >= gutter]
+    if len(left) < 2 or len(right) < 2 or _is_row_layout(left, right):
+        return by_position, False
+
+    ordered: List[Block] = []
+    band_left: List[Block] = []
+    band_right: List[Block] = []
+
+    def flush() -> None:
+        ordered.extend(sorted(band_left, key=lambda b: b[1]))
+        ordered.extend(sorted(band_right, key=lambda b: b[1]))
+        band_left.clear()
+        band_right.clear()
+
+    for b in by_position:
+        if b[2] <= gutter:
+            band_left.append(b)
+        elif b[0] >= gutter:
+            band_right.append(b)
+        else:
+            flush()
+            ordered.append(b)
+    flush()
+    return ordered, True
+
+
+def page_quality(text: str) -> float:
+    """
+    0..1 estimate of how usable extracted page text is. Empty pages,
+    replacement/private-use glyphs (broken font encodings) and letter-
+    spaced output ("S o f t w a r e") all pull the score down.
+    """
+    chars = [c for c in text if not c.isspace()]
+    if not chars:
+        return 0.0
+
+    bad = sum(
+        1 for c in chars
+        if c == "�" or unicodedata.category(c) in ("Co", "Cc", "Cs", "Cn")
+    )
+    score = 1.0 - bad / len(chars)
+
+    words = text.split()
+    singles = sum(1 for w in words if len(w) == 1 and w.isalpha())
+    if len(words) >= 10 and singles > 0.5 * len(words):
+        score *= 0.3
+
+    return round(score, 3)
+
+
+def layout_page_text(page) -> Tuple[str, bool]:
+    """Text of one PyMuPDF page in reading order, and whether it had two columns."""
+    blocks, two_column = order_blocks(_text_blocks(page), page.rect.width)
+    return "\n".join(b[4] for b in blocks), two_column
+
+
+def iter_pdf_layout_pages(source: Source, threshold: float = QUALITY_THRESHOLD) -> Iterator[str]:
+    """Page texts in order; pdfplumber is opened only once a weak page needs it."""
+    with ExitStack() as stack:
+        doc = stack.enter_context(open_pdf(source))
+        plumber = None
+        for i, page in enumerate(doc):
+            text, two_column = layout_page_text(page)
+            score = page_quality(text)
+            logger.debug("pdf page %d: two_column=%s quality=%.2f", i, two_column, score)
+            if score < threshold:
+                if plumber is None:
+                    import pdfplumber
+
+                    plumber = stack.enter_context(pdfplumber.open(as_file(source)))
+                alt = plumber.pages[i].extract_text() or ""
+                if page_quality(alt) > score:
+                    text = alt
+            yield text
+
+
+def extract_pdf_layout(source: Source, threshold: float = QUALITY_THRESHOLD) -> str:
+    return "\n".join(iter_pdf_layout_pages(source, threshold))
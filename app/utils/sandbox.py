@@ -0,0 +1,386 @@
+# app/utils/sandbox.py - document extraction in rlimited helper processes
+#
+# PyMuPDF and pdfplumber run C code and deep recursion on whatever bytes a
+# user uploads. A malformed PDF can spin or eat memory inside a call we
+# can't interrupt, so in the server process extraction runs in helpers:
+#
+#   - each helper has an address-space rlimit (memory_mb) and a CPU rlimit
+#     reset before every document (cpu_seconds); going over either fails
+#     the backend (MemoryError) or kills the helper (SIGXCPU);
+#   - the parent enforces wall-clock budgets: document_seconds per
+#     document and, for PDFs, page_seconds between one page and the next.
+#     Pages are sent back as they are extracted, so when a budget runs out
+#     (or the helper dies) the helper is killed and the pages received so
+#     far are returned as a partial result;
+#   - a helper is retired after max_documents documents or once its peak
+#     RSS passes max_rss_mb, and a fresh one is started in its place.
+#
+# Upload triage (utils.preflight) opens the same untrusted files, so it
+# runs in the helpers too, under the same rlimits and a page_seconds
+# deadline.
+#
+# Helpers are started ahead of requests (see gunicorn.conf.py post_fork)
+# with the forkserver method, so they never inherit the server's threads
+# or sockets. Results are the extract_document() dict plus "partial".
+
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+from .. import memprofile
+from .file_extractor import extract_document, preload_backends, sniff_format
+from .preflight import Triage, preflight
+from .source import Source
+
+try:
+    import resource
+except ImportError:  # not on Windows: helpers then run without rlimits
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Grace period the parent adds to its deadlines before killing a helper:
+# process start-up and pipe latency are not the document's fault.
+KILL_GRACE_SECONDS = 0.5
+
+
+class SandboxLimits(NamedTuple):
+    helpers: int = 1
+    memory_mb: int = 1024
+    cpu_seconds: int = 20
+    document_seconds: float = 20.0
+    page_seconds: float = 5.0
+    max_documents: int = 200
+    max_rss_mb: int = 512
+
+
+def sandbox_limits(config: Mapping[str, Any]) -> Optional[SandboxLimits]:
+    """SandboxLimits from app config, or None if EXTRACTION_SANDBOX is off."""
+    if not config.get("EXTRACTION_SANDBOX"):
+        return None
+    return SandboxLimits(*(config[f"SANDBOX_{name.upper()}"] for name in SandboxLimits._fields))
+
+
+# ---------- Helper process ----------
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KB on Linux
+
+
+def _set_cpu_budget(seconds: int) -> None:
+    """Allow seconds more CPU time from now (SIGXCPU after that)."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _helper_main(conn, limits: SandboxLimits) -> None:
+    if resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        soft = limits.memory_mb * MB
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+    try:
+        preload_backends()
+    except ImportError:
+        pass
+
+    def on_page(backend, index: int, text: str) -> None:
+        conn.send(("page", backend.name, index, text))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        kind, source, *args = job
+        if resource is not None:
+            _set_cpu_budget(limits.cpu_seconds)
+        try:
+            if kind == "preflight":
+                result = preflight(source)
+            elif kind == "extract-profiled":
+                with memprofile.measure() as memory:
+                    result = extract_document(source, *args, on_page=on_page)
+                result = dict(result, memory=memory)
+            else:
+                result = extract_document(source, *args, on_page=on_page)
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", _peak_rss_bytes()))
+        else:
+            conn.send(("done", result, _peak_rss_bytes()))
+
+
+def _exit_reason(process) -> str:
+    process.join(timeout=1)
+    code = process.exitcode
+    if code is None:
+        return "stopped responding"
+    if code < 0:
+        try:
+            return f"killed by {signal.Signals(-code).name}"
+        except ValueError:
+            return f"killed by signal {-code}"
+    return f"exited with status {code}"
+
+
+class _Helper:
+    __slots__ = ("process", "conn", "documents")
+
+    def __init__(self, context, limits: SandboxLimits) -> None:
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_helper_main, args=(child_conn, limits), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.documents = 0
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, EOFError):
+            pass
+        self.conn.close()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+# ---------- Parent side ----------
+
+def _sendable(source: Source) -> Source:
+    """source as bytes or a path string, to send to a helper."""
+    if isinstance(source, (bytes, str)):
+        return source
+    return bytes(source) if isinstance(source, (bytearray, memoryview)) else os.fspath(source)
+
+
+def _size(source: Source) -> int:
+    return len(source) if isinstance(source, bytes) else os.path.getsize(source)
+
+
+class ExtractionSandbox:
+    """
+    A fixed number of helpers shared by the threads of one server process.
+    extract() blocks until a helper is free.
+    """
+
+    def __init__(self, limits: SandboxLimits) -> None:
+        self.limits = limits
+        self._context = multiprocessing.get_context("forkserver")
+        self._idle: List[_Helper] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self.recycled = 0
+        self.killed = 0
+
+    def start(self) -> None:
+        helpers: List[_Helper] = []
+        try:
+            for _ in range(self.limits.helpers):
+                helpers.append(_Helper(self._context, self.limits))
+        except BaseException:
+            for helper in helpers:
+                helper.kill()
+            raise
+        with self._cond:
+            self._idle.extend(helpers)
+            self._cond.notify_all()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for helper in idle:
+            helper.stop()
+
+    def _acquire(self) -> _Helper:
+        with self._cond:
+            while not self._idle:
+                if self._closed:
+                    raise RuntimeError("ExtractionSandbox is shut down")
+                self._cond.wait()
+            return self._idle.pop()
+
+    def _release(self, helper: _Helper) -> None:
+        with self._cond:
+            if not self._closed:
+                self._idle.append(helper)
+                self._cond.notify()
+                return
+        helper.stop()
+
+    def _replace(self, helper: _Helper, kill: bool) -> None:
+        """Retire helper and start its replacement off the request path."""
+        def run() -> None:
+            if kill:
+                helper.kill()
+            else:
+                helper.stop()
+            try:
+                fresh = _Helper(self._context, self.limits)
+            except Exception:
+                logger.exception("could not start an extraction helper")
+                return
+            self._release(fresh)
+        threading.Thread(target=run, name="sandbox-replace", daemon=True).start()
+
+    def _finished(self, helper: _Helper, rss: int) -> None:
+        """Hand helper back after a job, or retire it if it has done enough."""
+        helper.documents += 1
+        if helper.documents >= self.limits.max_documents or rss >= self.limits.max_rss_mb * MB:
+            self.recycled += 1
+            self._replace(helper, kill=False)
+        else:
+            self._release(helper)
+
+    def preflight(self, source: Source) -> Triage:
+        """utils.preflight.preflight() in a helper; a file it can't triage in time is rejected."""
+        source = _sendable(source)
+        helper = self._acquire()
+        seconds = self.limits.page_seconds
+        try:
+            helper.conn.send(("preflight", source))
+            if not helper.conn.poll(seconds + KILL_GRACE_SECONDS):
+                reason = f"took over {seconds:g}s"
+            else:
+                kind, payload, rss = helper.conn.recv()
+                self._finished(helper, rss)
+                helper = None
+                if kind == "error":
+                    raise ValueError(f"Unreadable file ({payload}).")
+                return payload
+        except (EOFError, OSError):
+            reason = f"extraction helper {_exit_reason(helper.process)}"
+        finally:
+            if helper is not None:
+                self.killed += 1
+                self._replace(helper, kill=True)
+
+        logger.warning("preflight: %s", reason)
+        return Triage(sniff_format(source), _size(source), "reject", "The file could not be inspected; it may be damaged.")
+
+    def extract(
+        self,
+        source: Source,
+        filename: Optional[str] = None,
+        backend_order: Optional[Dict[str, List[str]]] = None,
+        profile: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        extract_document() in a helper, within the budgets. With profile the
+        helper traces the extraction and the result gets its stats under
+        "memory" (see memprofile.measure()).
+        """
+        fmt = sniff_format(source)
+        if fmt is None:
+            raise ValueError("Unsupported file type. Use PDF, DOCX, or TXT.")
+        source = _sendable(source)
+
+        limits = self.limits
+        helper = self._acquire()
+        t0 = time.monotonic()
+        doc_deadline = t0 + limits.document_seconds + KILL_GRACE_SECONDS
+        page_deadline = t0 + limits.page_seconds + KILL_GRACE_SECONDS if fmt == "pdf" else doc_deadline
+        backend: Optional[str] = None
+        pages: List[str] = []
+        reason: Optional[str] = None
+
+        try:
+            helper.conn.send(("extract-profiled" if profile else "extract", source, filename, backend_order))
+            while True:
+                now = time.monotonic()
+                deadline = min(doc_deadline, page_deadline)
+                if now >= deadline or not helper.conn.poll(deadline - now):
+                    if doc_deadline <= page_deadline:
+                        reason = f"document took over {limits.document_seconds:g}s"
+                    else:
+                        reason = f"page {len(pages) + 1} took over {limits.page_seconds:g}s"
+                    break
+                message = helper.conn.recv()
+                kind = message[0]
+                if kind == "page":
+                    _, name, _, text = message
+                    if name != backend:  # the previous backend gave up
+                        backend, pages = name, []
+                    pages.append(text)
+                    page_deadline = time.monotonic() + limits.page_seconds + KILL_GRACE_SECONDS
+                    continue
+
+                _, payload, rss = message
+                self._finished(helper, rss)
+                helper = None
+                if kind == "done":
+                    return dict(payload, partial=False)
+                if not pages:
+                    raise ValueError(payload)
+                # The backend failed part way (MemoryError at the rlimit).
+                reason = payload
+                break
+        except (EOFError, OSError):
+            reason = f"extraction helper {_exit_reason(helper.process)}"
+        finally:
+            if helper is not None:
+                self.killed += 1
+                self._replace(helper, kill=True)
+
+        text = "\n".join(pages).strip()
+        logger.warning("extract %s: %s; returning %d chars from %d page(s)", filename, reason, len(text), len(pages))
+        return {
+            "text": text,
+            "format": fmt,
+            "backend": backend if text else None,
+            "attempts": [{
+                "backend": backend,
+                "seconds": round(time.monotonic() - t0, 4),
+                "chars": len(text),
+                "error": f"Budget exceeded: {reason}",
+            }],
+            "partial": True,
+        }
+
+
+_sandbox: Optional[ExtractionSandbox] = None
+_sandbox_key: Optional[tuple] = None
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox(limits: SandboxLimits) -> ExtractionSandbox:
+    """
+    This process's sandbox, started on first use. Keyed by pid as well, so
+    a forked child never reuses its parent's helpers.
+    """
+    global _sandbox, _sandbox_key
+    key = (os.getpid(), limits)
+    with _sandbox_lock:
+        if _sandbox is None or _sandbox_key != key:
+            # Started before it is published: if start() raises, the next
+            # call tries again instead of finding a sandbox with no helpers.
+            sandbox = ExtractionSandbox(limits)
+            sandbox.start()
+            if _sandbox is not None and _sandbox_key is not None and _sandbox_key[0] == key[0]:
+                _sandbox.shutdown()
+            _sandbox, _sandbox_key = sandbox, key
+        return _sandbox
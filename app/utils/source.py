@@ -0,0 +1,44 @@
+# app/utils/source.py
+#
+# Documents are passed around either as bytes or as a path to a file on
+# disk. Backends open paths themselves (PyMuPDF and zipfile read lazily),
+# so large uploads never need to be loaded into memory whole.
+
+import os
+from io import BytesIO
+from typing import IO, Union
+
+Source = Union[bytes, str, "os.PathLike[str]"]
+
+
+def is_bytes(source: Source) -> bool:
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+def read_head(source: Source, n: int) -> bytes:
+    if is_bytes(source):
+        return bytes(source[:n])
+    with open(source, "rb") as f:
+        return f.read(n)
+
+
+def read_all(source: Source) -> bytes:
+    if is_bytes(source):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def as_file(source: Source) -> Union[str, IO[bytes]]:
+    """Something zipfile, pdfplumber and python-docx can open: the path itself or a BytesIO."""
+    if is_bytes(source):
+        return BytesIO(source)
+    return os.fspath(source)
+
+
+def open_pdf(source: Source):
+    import fitz  # PyMuPDF
+
+    if is_bytes(source):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(os.fspath(source), filetype="pdf")
@@ -0,0 +1,12 @@
+# asgi.py - entry point for ASGI servers
+#
+#     hypercorn asgi:app --bind 0.0.0.0:5000 --workers 0
+#
+# One server process is enough: CPU work goes to its process pool
+# (ANALYSIS_WORKERS). --workers 0 keeps hypercorn in the main process;
+# its own worker processes are daemonic and may not start a pool.
+# wsgi.py remains the entry point for gunicorn.
+
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,101 @@
+"""
+BM25 query time (app.corpus.bm25) with and without MaxScore pruning.
+
+    python benchmarks/bm25_search.py --docs 200000
+    python benchmarks/bm25_search.py --index cache/bm25 --query-file job.txt
+
+Without --index a synthetic corpus is generated: Zipf-distributed terms
+over ~400-token documents, written straight into the base segment (going
+through add() would time the text cleaner, not the search). Queries of
+each size draw their terms from the same distribution, so longer ones
+include the long posting lists a real job description hits.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.corpus.bm25 import BM25Index  # noqa: E402
+
+VOCAB = 50000
+DOC_TOKENS = 400
+
+
+def synthetic_index(n_docs: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    p = 1 / np.arange(1, VOCAB + 1)
+    p /= p.sum()
+    df = np.maximum(1, ((1 - np.exp(-DOC_TOKENS * p)) * n_docs).astype(np.int64))
+    offsets = np.zeros(VOCAB + 1, dtype=np.int64)
+    np.cumsum(df, out=offsets[1:])
+    docs = np.empty(offsets[-1], dtype=np.int32)
+    tfs = np.empty(offsets[-1], dtype=np.float32)
+    for t in range(VOCAB):
+        lo, hi = offsets[t], offsets[t + 1]
+        docs[lo:hi] = np.sort(rng.choice(n_docs, hi - lo, replace=False))
+        tfs[lo:hi] = 1 + rng.poisson(max(0.1, DOC_TOKENS * p[t] * n_docs / df[t] - 1), hi - lo)
+    doc_len = rng.normal(DOC_TOKENS, DOC_TOKENS / 5, n_docs).clip(50).astype(np.float32)
+    arrays = {
+        "docs": docs, "tfs": tfs, "offsets": offsets, "doc_len": doc_len,
+        "max_tf": np.maximum.reduceat(tfs, offsets[:-1]),
+        "min_dl": np.minimum.reduceat(doc_len[docs], offsets[:-1]),
+    }
+    index = BM25Index()
+    index._set_base([f"doc{i}" for i in range(n_docs)], arrays, [f"t{i}" for i in range(VOCAB)])
+
+    def query(n_terms: int) -> str:
+        return " ".join(f"t{t}" for t in rng.choice(VOCAB, n_terms, p=p, replace=False))
+    return index, query
+
+
+def time_queries(index: BM25Index, queries, k: int) -> dict:
+    """Median milliseconds per query for each mode; checks both agree."""
+    runs = {"pruned": [], "exhaustive": []}
+    for q in queries:
+        t0 = time.perf_counter()
+        pruned = index.search(q, k)
+        t1 = time.perf_counter()
+        exhaustive = index.search(q, k, prune=False)
+        t2 = time.perf_counter()
+        if pruned != exhaustive:
+            raise AssertionError(f"pruned and exhaustive results differ for {q[:60]!r}")
+        runs["pruned"].append((t1 - t0) * 1000)
+        runs["exhaustive"].append((t2 - t1) * 1000)
+    return {mode: statistics.median(r) for mode, r in runs.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000, help="Synthetic corpus size.")
+    parser.add_argument("--index", type=Path, help="Time a saved index instead.")
+    parser.add_argument("--query-file", type=Path, action="append", help="Query text (with --index).")
+    parser.add_argument("--queries", type=int, default=20, help="Synthetic queries per size.")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.index:
+        if not args.query_file:
+            parser.error("--index needs at least one --query-file")
+        index = BM25Index.load(args.index)
+        queries = {p.name: [p.read_text()] for p in args.query_file}
+    else:
+        t0 = time.perf_counter()
+        index, query = synthetic_index(args.docs)
+        print(f"built {args.docs} documents, {len(index._docs)} postings in {time.perf_counter() - t0:.1f}s")
+        queries = {f"{n} terms": [query(n) for _ in range(args.queries)] for n in (5, 30, 150)}
+
+    for name, qs in queries.items():
+        for q in qs[:1]:
+            index.search(q, args.k)  # page in the postings
+        times = time_queries(index, qs, args.k)
+        print(f"{name:>12}: pruned {times['pruned']:7.1f} ms  exhaustive {times['exhaustive']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
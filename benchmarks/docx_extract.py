@@ -0,0 +1,75 @@
+"""
+Streaming DOCX backend vs python-docx: time and peak Python memory.
+
+    python benchmarks/docx_extract.py --paragraphs 20000
+    python benchmarks/docx_extract.py path/to/resume.docx ...
+
+Without paths a synthetic resume-like document (paragraphs plus a table
+every 50 paragraphs) is generated with python-docx first.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.utils.docx_stream import extract_docx_text  # noqa: E402
+from app.utils.file_extractor import _extract_text_python_docx  # noqa: E402
+
+
+def build_sample(paragraphs: int) -> bytes:
+    from docx import Document
+
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com | +91 98765 43210"
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Line {i}: Software Engineer, Example Technologies Ltd, Jan 2015 - Present")
+        if i % 50 == 0:
+            table = doc.add_table(rows=2, cols=3)
+            for r in range(2):
+                for c in range(3):
+                    table.cell(r, c).text = f"cell {i}.{r}.{c}"
+    with tempfile.TemporaryFile() as f:
+        doc.save(f)
+        f.seek(0)
+        return f.read()
+
+
+def measure(fn, data: bytes, runs: int):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        text = fn(data)
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak, len(text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = [(p, Path(p).read_bytes()) for p in args.paths] or [
+        (f"synthetic ({args.paragraphs} paragraphs)", build_sample(args.paragraphs))
+    ]
+
+    for name, data in docs:
+        print(f"{name}: {len(data) / 1024:.0f} KB")
+        for label, fn in (("docx-stream", extract_docx_text), ("python-docx", _extract_text_python_docx)):
+            secs, peak, chars = measure(fn, data, args.runs)
+            print(f"  {label:<12}{secs * 1000:>10.1f} ms{peak / 1024 / 1024:>10.1f} MB peak{chars:>10} chars")
+
+
+if __name__ == "__main__":
+    main()
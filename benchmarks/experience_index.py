@@ -0,0 +1,81 @@
+"""
+Experience index (app.corpus.experience_index) build, query and size.
+
+    python benchmarks/experience_index.py --candidates 100000
+    python benchmarks/experience_index.py --index cache/experience
+
+Without --index a synthetic pool is generated: each candidate gets one
+to six roles of 6-60 months between 1995 and today, with gaps and the
+occasional overlap, in a random category. Rows are added with add(), so
+the build time includes packing the bitmaps.
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.corpus.experience_index import CATEGORIES, ExperienceBitmapIndex  # noqa: E402
+from app.resume_parser.timeline import month_ordinal  # noqa: E402
+
+AS_OF = date(2024, 6, 1)
+
+
+def synthetic_index(n_candidates: int, seed: int = 0) -> ExperienceBitmapIndex:
+    rng = np.random.default_rng(seed)
+    today = month_ordinal(AS_OF.year, AS_OF.month)
+    index = ExperienceBitmapIndex(capacity=n_candidates)
+    for i in range(n_candidates):
+        intervals = {c: [] for c in CATEGORIES}
+        start = month_ordinal(int(rng.integers(1995, 2020)), int(rng.integers(1, 13)))
+        for _ in range(int(rng.integers(1, 7))):
+            end = min(today, start + int(rng.integers(6, 61)))
+            intervals[CATEGORIES[rng.integers(len(CATEGORIES))]].append((start, end))
+            start = end + int(rng.integers(-3, 13))
+            if start >= today:
+                break
+        index.add(f"cand{i}", intervals)
+    return index
+
+
+def median_ms(fn, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100000, help="Synthetic pool size.")
+    parser.add_argument("--index", type=Path, help="Time a saved index instead.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.index:
+        index = ExperienceBitmapIndex.load(args.index, mmap=False)
+        as_of = date.today()
+    else:
+        t0 = time.perf_counter()
+        index = synthetic_index(args.candidates)
+        print(f"built {len(index)} candidates in {time.perf_counter() - t0:.1f}s")
+        as_of = AS_OF
+
+    print(f"bitmaps: {index.rows.nbytes / 1024 / 1024:.1f} MB")
+    hits = len(index.query(3, "Industry", within_years=5, as_of=as_of))
+    window = median_ms(lambda: index.query(3, "Industry", within_years=5, as_of=as_of), args.repeat)
+    print(f"window query (3y Industry in last 5y): {window:7.1f} ms, {hits} hits")
+    print(f"career query (5y any category):        {median_ms(lambda: index.query(5), args.repeat):7.1f} ms")
+    print(f"totals (all categories and union):     {median_ms(index.totals, args.repeat):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold-start benchmark: how long does a fresh interpreter take to become
+able to extract text, with lazily loaded backends vs. loading all of them
+up front (the old behaviour, reproduced via preload_backends())?
+
+    python benchmarks/import_time.py --runs 10
+
+Each scenario runs in a new process; the reported number is the median
+in-process time from interpreter start-up to finishing the scenario.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "txt (lazy)": (
+        "from app.utils.file_extractor import extract_text_from_bytes\n"
+        "extract_text_from_bytes(b'Jane Doe\\njane@example.com', 'cv.txt')\n"
+    ),
+    "txt (eager backends)": (
+        "from app.utils.file_extractor import extract_text_from_bytes, preload_backends\n"
+        "preload_backends()\n"
+        "extract_text_from_bytes(b'Jane Doe\\njane@example.com', 'cv.txt')\n"
+    ),
+    "analyzer only": (
+        "from app.resume_parser.advanced_analyzer import analyze_resume_text\n"
+        "analyze_resume_text('Jane Doe\\njane@example.com')\n"
+    ),
+}
+
+HARNESS = (
+    "import time\n"
+    "t0 = time.perf_counter()\n"
+    "{body}"
+    "print(time.perf_counter() - t0)\n"
+)
+
+
+def run_once(body: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", HARNESS.format(body=body)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--json", help="write machine-readable results to this path")
+    args = parser.parse_args()
+
+    results = {}
+    for name, body in SCENARIOS.items():
+        samples = [run_once(body) for _ in range(args.runs)]
+        results[name] = round(statistics.median(samples) * 1000, 1)
+        print(f"{name:<24}{results[name]:>10} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Replay a corpus of resumes against the app under load, for each server
+configuration, and report throughput, latency percentiles, errors and
+per-process memory - the numbers for sizing the Procfile.
+
+    python benchmarks/load_test.py resumes/ --concurrency 1,4,16 --duration 30
+    python benchmarks/load_test.py a.pdf b.docx --configs gthread --workers 2 --threads 8
+    python benchmarks/load_test.py --json load.json
+
+Configurations (--configs, comma separated):
+
+    sync     gunicorn wsgi:app, sync workers (--workers)
+    gthread  gunicorn wsgi:app, gthread workers (--workers x --threads)
+    pool     hypercorn asgi:app, one server process sending analyses to a
+             process pool of --workers (app.pipeline.AnalysisPool)
+
+Each configuration is started once, warmed up, then driven at every
+--concurrency level for --duration seconds: that many client threads each
+POST the next corpus file to /api/analyze as soon as their previous
+request returns (closed loop). Without paths the warm-up sample resume is
+used. The analysis cache is off unless --cache is given, so every request
+runs the whole pipeline.
+
+While a level runs the server's process tree is sampled from /proc for
+peak RSS; PSS (shared pages split between the processes sharing them) is
+read at the end. Processes are reported by role: master/server, worker
+(gunicorn), forkserver, tracker (multiprocessing's resource tracker) and
+helper (forkserver children: extraction helpers and, in the pool
+configuration, the analysis pool's workers); "worker MB" in
+the table is the largest gunicorn worker, or the hypercorn server process.
+Uploads are saved as in production, into a temporary UPLOAD_FOLDER that
+is removed at the end. Linux only.
+"""
+import argparse
+import json
+import math
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.warmup import SAMPLE_RESUME  # noqa: E402
+from startup_rss import free_port, multipart_body, read_memory_kb  # noqa: E402
+
+TOKEN = "load-test"
+CONFIGS = ("sync", "gthread", "pool")
+EXTENSIONS = {".pdf", ".docx", ".txt"}
+SAMPLE_SECONDS = 0.5
+
+
+# ---------- Corpus ----------
+
+def load_corpus(paths: List[Path]) -> List[Tuple[bytes, str]]:
+    """(multipart body, content type) per resume file under paths."""
+    if not paths:
+        return [multipart_body("sample.txt", SAMPLE_RESUME.encode())]
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() in EXTENSIONS))
+        else:
+            files.append(path)
+    if not files:
+        raise SystemExit("no .pdf, .docx or .txt files in the given paths")
+    return [multipart_body(p.name, p.read_bytes()) for p in files]
+
+
+# ---------- Server ----------
+
+def server_command(config: str, port: int) -> List[str]:
+    if config == "pool":
+        return [sys.executable, "-m", "hypercorn", "asgi:app", "--bind", f"127.0.0.1:{port}", "--workers", "0"]
+    return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"]
+
+
+def server_env(config: str, port: int, args) -> Dict[str, str]:
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        BULK_API_TOKENS=TOKEN,
+        # The client is one bulk token; don't let admission throttle it.
+        BULK_RATE="1000000",
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_WORKER_CLASS="gthread" if config == "gthread" else "sync",
+        GUNICORN_THREADS=str(args.threads if config == "gthread" else 1),
+        ANALYSIS_WORKERS=str(args.workers),
+    )
+    if not args.cache:
+        env["ANALYSIS_CACHE"] = ""
+    env.update(args.env)
+    return env
+
+
+def wait_ready(url: str, proc: subprocess.Popen, timeout: float = 60) -> float:
+    t0 = time.perf_counter()
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with status {proc.returncode}")
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return time.perf_counter() - t0
+        except OSError:
+            if time.perf_counter() - t0 > timeout:
+                raise RuntimeError("server did not come up")
+            time.sleep(0.05)
+
+
+# ---------- Process tree ----------
+
+def child_pids(pid: int) -> List[int]:
+    # Children are listed under the thread that forked them.
+    pids: List[int] = []
+    try:
+        tasks = os.listdir(f"/proc/{pid}/task")
+    except FileNotFoundError:
+        return pids
+    for tid in tasks:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                pids.extend(int(p) for p in f.read().split())
+        except FileNotFoundError:
+            pass
+    return pids
+
+
+def cmdline(pid: int) -> bytes:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return b""
+
+
+def process_tree(root: int, config: str) -> Dict[int, str]:
+    """pid -> role for root and all its descendants."""
+    roles = {root: "server" if config == "pool" else "master"}
+    stack = [root]
+    while stack:
+        parent = stack.pop()
+        for pid in child_pids(parent):
+            # Forkserver children keep the forkserver's command line.
+            cmd = cmdline(pid)
+            if roles[parent] == "forkserver":
+                roles[pid] = "helper"
+            elif b"multiprocessing.forkserver" in cmd:
+                roles[pid] = "forkserver"
+            elif b"multiprocessing.resource_tracker" in cmd:
+                roles[pid] = "tracker"
+            elif roles[parent] == "master":
+                roles[pid] = "worker"
+            else:
+                roles[pid] = "helper"
+            stack.append(pid)
+    return roles
+
+
+def read_rss_kb(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (FileNotFoundError, ProcessLookupError):
+        pass
+    return None
+
+
+class MemorySampler(threading.Thread):
+    """Peak RSS per process of the server's tree, sampled until finish()."""
+
+    def __init__(self, root: int, config: str) -> None:
+        super().__init__(name="memory-sampler", daemon=True)
+        self.root = root
+        self.config = config
+        self.peak_kb: Dict[int, int] = {}
+        self.roles: Dict[int, str] = {}
+        self._done = threading.Event()
+
+    def sample(self) -> None:
+        for pid, role in process_tree(self.root, self.config).items():
+            rss = read_rss_kb(pid)
+            if rss is not None:
+                self.roles[pid] = role
+                self.peak_kb[pid] = max(rss, self.peak_kb.get(pid, 0))
+
+    def run(self) -> None:
+        while not self._done.wait(SAMPLE_SECONDS):
+            self.sample()
+
+    def finish(self) -> List[Dict]:
+        self._done.set()
+        self.join()
+        self.sample()
+        processes = []
+        for pid, role in sorted(self.roles.items()):
+            try:
+                now = read_memory_kb(pid)
+            except (FileNotFoundError, ProcessLookupError):
+                now = None  # exited (a recycled helper)
+            processes.append({"pid": pid, "role": role, "peak_rss_kb": self.peak_kb[pid], **(now or {"exited": True})})
+        return processes
+
+
+def memory_summary(processes: List[Dict]) -> Dict[str, Dict]:
+    summary = {}
+    for role in ("master", "server", "worker", "forkserver", "tracker", "helper"):
+        procs = [p for p in processes if p["role"] == role]
+        if not procs:
+            continue
+        peaks = [p["peak_rss_kb"] / 1024 for p in procs]
+        summary[role] = {
+            "count": len(procs),
+            "peak_rss_mb_avg": round(statistics.mean(peaks), 1),
+            "peak_rss_mb_max": round(max(peaks), 1),
+            "pss_mb_total": round(sum(p.get("pss_kb", 0) for p in procs) / 1024, 1),
+        }
+    return summary
+
+
+# ---------- Load ----------
+
+def post(url: str, body: bytes, ctype: str, timeout: float) -> Tuple[float, Optional[str]]:
+    """Seconds taken and None, or the error (status code or exception name)."""
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": ctype, "Authorization": f"Bearer {TOKEN}"})
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+        error = None
+    except urllib.error.HTTPError as e:
+        e.read()
+        error = str(e.code)
+    except OSError as e:  # URLError, resets, timeouts
+        error = type(getattr(e, "reason", e)).__name__
+    return time.perf_counter() - t0, error
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def drive(url: str, corpus, concurrency: int, duration: float, timeout: float) -> Dict:
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset: int) -> None:
+        i = offset
+        while time.perf_counter() < deadline:
+            body, ctype = corpus[i % len(corpus)]
+            i += 1
+            seconds, error = post(url, body, ctype, timeout)
+            with lock:
+                if error is None:
+                    latencies.append(seconds)
+                else:
+                    errors[error] += 1
+
+    t0 = time.perf_counter()
+    # Each client starts at a different file so a small corpus still mixes.
+    clients = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    elapsed = time.perf_counter() - t0
+
+    total = len(latencies) + sum(errors.values())
+    ms = sorted(s * 1000 for s in latencies)
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "requests": total,
+        "ok": len(latencies),
+        "errors": dict(errors),
+        "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            "mean": round(statistics.mean(ms), 1) if ms else None,
+            "p50": round(percentile(ms, 50), 1),
+            "p95": round(percentile(ms, 95), 1),
+            "p99": round(percentile(ms, 99), 1),
+            "max": round(ms[-1], 1) if ms else None,
+        },
+    }
+
+
+def run_config(config: str, corpus, args) -> Dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        server_command(config, port), cwd=ROOT, env=server_env(config, port, args),
+        stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+    levels = []
+    try:
+        ready_s = wait_ready(base + "/", proc)
+        url = base + "/api/analyze"
+        capacity = args.workers * (args.threads if config == "gthread" else 1)
+        for n in range(args.warmup if args.warmup is not None else 2 * capacity):
+            post(url, *corpus[n % len(corpus)], args.timeout)
+
+        for concurrency in args.concurrency:
+            sampler = MemorySampler(proc.pid, config)
+            sampler.start()
+            level = drive(url, corpus, concurrency, args.duration, args.timeout)
+            processes = sampler.finish()
+            level["memory"] = memory_summary(processes)
+            level["processes"] = processes
+            levels.append(level)
+            print_level(config, level)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    return {
+        "config": config,
+        "command": " ".join(server_command(config, port)[1:]),
+        "workers": args.workers,
+        "threads": args.threads if config == "gthread" else 1,
+        "cache": args.cache,
+        "corpus_files": len(corpus),
+        "ready_s": round(ready_s, 2),
+        "levels": levels,
+    }
+
+
+def print_level(config: str, level: Dict) -> None:
+    lat = level["latency_ms"]
+    memory = level["memory"]
+    workers = memory.get("worker") or memory.get("server") or {}
+    helpers = memory.get("helper", {})
+    print(
+        f"{config:<8}{level['concurrency']:>5}{level['throughput_rps']:>9}"
+        f"{lat['p50']:>9}{lat['p95']:>9}{lat['p99']:>9}{level['error_rate'] * 100:>8.1f}"
+        f"{workers.get('peak_rss_mb_max', 0):>12}{helpers.get('count', 0):>9}{helpers.get('peak_rss_mb_max', 0):>12}",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", type=Path, help="Resume files or directories to replay.")
+    parser.add_argument("--configs", default=",".join(CONFIGS), help="Comma separated: sync, gthread, pool.")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers / analysis pool size.")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per gthread worker.")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma separated client counts to sweep.")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per concurrency level.")
+    parser.add_argument("--warmup", type=int, help="Requests before measuring (default: two per worker thread).")
+    parser.add_argument("--timeout", type=float, default=120, help="Client timeout per request, seconds.")
+    parser.add_argument("--cache", action="store_true", help="Keep the analysis cache on (a fresh temp file).")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Extra server environment.")
+    parser.add_argument("--json", help="Write machine-readable results to this path.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the server's log.")
+    args = parser.parse_args()
+
+    configs = [c.strip() for c in args.configs.split(",") if c.strip()]
+    unknown = set(configs) - set(CONFIGS)
+    if unknown:
+        parser.error(f"unknown configs: {', '.join(sorted(unknown))}")
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+    try:
+        args.env = dict(kv.split("=", 1) for kv in args.env)
+    except ValueError:
+        parser.error("--env takes KEY=VALUE")
+    corpus = load_corpus(args.paths)
+
+    print(f"{'config':<8}{'conc':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'err %':>8}"
+          f"{'worker MB':>12}{'helpers':>9}{'helper MB':>12}")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Every request saves its upload; keep them out of the repo's uploads/.
+        args.env.setdefault("UPLOAD_FOLDER", os.path.join(tmp, "uploads"))
+        for config in configs:
+            if args.cache:
+                # Fresh per configuration so none starts with the last one's hits.
+                args.env["ANALYSIS_CACHE"] = os.path.join(tmp, f"{config}.sqlite3")
+            results.append(run_config(config, corpus, args))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Analysis time per profile (app.resume_parser.profiles) on the same texts.
+
+    python benchmarks/profile_speed.py --repeat 200
+    python benchmarks/profile_speed.py path/to/resume.pdf ... --repeat 50
+
+Without paths the warm-up sample resume is used. Text is extracted and
+cleaned once; only the analysis stage (sections, skills, advanced) is
+timed, as it runs on a cache miss.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.pipeline import analyze_stage, extract_stage  # noqa: E402
+from app.resume_parser.profiles import PROFILES  # noqa: E402
+from app.resume_parser.text_cleaner import clean_text  # noqa: E402
+from app.warmup import SAMPLE_RESUME  # noqa: E402
+
+
+def time_profiles(texts, repeat: int) -> dict:
+    """Median seconds per profile to analyze all texts once."""
+    runs = {name: [] for name in PROFILES}
+    for text in texts:
+        analyze_stage(text)  # warm regex and lookup caches
+    # Profiles are interleaved within each round so CPU frequency or
+    # cache drift over the run doesn't favour whichever goes first.
+    for _ in range(repeat):
+        for name, profile in PROFILES.items():
+            t0 = time.perf_counter()
+            for text in texts:
+                analyze_stage(text, profile=profile)
+            runs[name].append(time.perf_counter() - t0)
+    return {name: statistics.median(r) for name, r in runs.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.paths:
+        texts = [extract_stage(str(p), p.name)[0] for p in args.paths]
+    else:
+        texts = [clean_text(SAMPLE_RESUME)[0]]
+    print(f"{len(texts)} document(s), {sum(map(len, texts)):,} chars, median of {args.repeat} runs")
+
+    results = time_profiles(texts, args.repeat)
+    full = results["full"]
+    per_doc = len(texts)
+    print(f"{'profile':<10}{'ms/doc':>10}{'speedup':>10}")
+    for name, seconds in results.items():
+        print(f"{name:<10}{seconds * 1000 / per_doc:>10.3f}{full / seconds:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Memory held by analyzer output: plain dicts vs the slotted records.
+
+    python benchmarks/records_memory.py --candidates 100000
+
+Analyzes one sample resume, then keeps N copies of its result (each with
+its own DegreeInfo/ExperienceEntry objects, as a batch run or candidate
+store would) in both representations and reports the traced memory.
+String and number values are shared between copies in both cases, so the
+difference is the container overhead alone.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.resume_parser.advanced_analyzer import analyze_resume_text  # noqa: E402
+from app.resume_parser.records import AnalysisResult, DegreeInfo, ExperienceEntry  # noqa: E402
+from app.resume_parser.text_cleaner import clean_text  # noqa: E402
+from app.warmup import SAMPLE_RESUME  # noqa: E402
+
+
+def copy_as_records(result: AnalysisResult) -> AnalysisResult:
+    fields = {name: getattr(result, name) for name in AnalysisResult.__slots__}
+    fields["degrees_info"] = [DegreeInfo(**d.to_dict()) for d in result.degrees_info]
+    fields["experience_history"] = [ExperienceEntry(**e.to_dict()) for e in result.experience_history]
+    return AnalysisResult(**fields)
+
+
+def copy_as_dicts(result: AnalysisResult) -> dict:
+    return result.to_dict()
+
+
+def measure(make, result, n: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    held = [make(result) for _ in range(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100_000)
+    args = parser.parse_args()
+
+    cleaned, _ = clean_text(SAMPLE_RESUME)
+    result = analyze_resume_text(cleaned)
+    print(f"per candidate: {len(result.degrees_info)} degrees, "
+          f"{len(result.experience_history)} experience entries")
+
+    n = args.candidates
+    dict_bytes = measure(copy_as_dicts, result, n)
+    record_bytes = measure(copy_as_records, result, n)
+
+    mb = 1024 * 1024
+    print(f"{'dicts':<10}{dict_bytes / mb:>10.1f} MB{dict_bytes / n:>10.0f} B/candidate")
+    print(f"{'records':<10}{record_bytes / mb:>10.1f} MB{record_bytes / n:>10.0f} B/candidate")
+    print(f"saved {(dict_bytes - record_bytes) / mb:.1f} MB per {n:,} candidates "
+          f"({1 - record_bytes / dict_bytes:.0%})")
+
+
+if __name__ == "__main__":
+    main()
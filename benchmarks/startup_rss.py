@@ -0,0 +1,139 @@
+"""
+Compare gunicorn startup time and per-worker memory with and without the
+preload/warm-up mode (see gunicorn.conf.py).
+
+    python benchmarks/startup_rss.py --workers 4
+    python benchmarks/startup_rss.py --json startup.json
+
+For each mode it starts `gunicorn wsgi:app`, waits for the first response,
+sends a few TXT analyses so every worker has run the analyzer, then reads
+RSS, shared memory and PSS (proportional set size - the honest number
+when pages are shared) for every worker from /proc. Linux only.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.warmup import SAMPLE_RESUME  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def multipart_body(filename: str, payload: bytes):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="resume"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def post_resume(url: str) -> float:
+    body, ctype = multipart_body("sample.txt", SAMPLE_RESUME.encode())
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": ctype})
+    t0 = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        resp.read()
+    return time.perf_counter() - t0
+
+
+def read_memory_kb(pid: int) -> Dict[str, int]:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    return {"rss_kb": fields.get("Rss", 0), "pss_kb": fields.get("Pss", 0), "shared_kb": shared}
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def run_mode(preload: bool, workers: int, requests_per_worker: int) -> Dict:
+    port = free_port()
+    env = dict(os.environ, GUNICORN_PRELOAD="1" if preload else "0", WEB_CONCURRENCY=str(workers), PORT=str(port))
+    url = f"http://127.0.0.1:{port}/"
+
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(url, timeout=1).read()
+                break
+            except OSError:
+                if time.perf_counter() - t0 > 60:
+                    raise RuntimeError("gunicorn did not come up")
+                time.sleep(0.02)
+        ready_s = time.perf_counter() - t0
+
+        first_analysis_s = post_resume(url)
+        latencies = [post_resume(url) for _ in range(workers * requests_per_worker)]
+
+        per_worker = [dict(pid=pid, **read_memory_kb(pid)) for pid in worker_pids(proc.pid)]
+        master = read_memory_kb(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+    return {
+        "preload": preload,
+        "workers": workers,
+        "ready_s": round(ready_s, 3),
+        "first_analysis_ms": round(first_analysis_s * 1000, 1),
+        "max_analysis_ms": round(max(latencies) * 1000, 1),
+        "master": master,
+        "per_worker": per_worker,
+        "worker_rss_mb_avg": round(sum(w["rss_kb"] for w in per_worker) / len(per_worker) / 1024, 1),
+        "worker_pss_mb_avg": round(sum(w["pss_kb"] for w in per_worker) / len(per_worker) / 1024, 1),
+        "total_pss_mb": round((master["pss_kb"] + sum(w["pss_kb"] for w in per_worker)) / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests-per-worker", type=int, default=3)
+    parser.add_argument("--json", help="write machine-readable results to this path")
+    args = parser.parse_args()
+
+    results = [run_mode(preload, args.workers, args.requests_per_worker) for preload in (False, True)]
+
+    print(f"{'mode':<10}{'ready s':>9}{'1st req ms':>12}{'max req ms':>12}"
+          f"{'RSS/worker MB':>15}{'PSS/worker MB':>15}{'total PSS MB':>14}")
+    for r in results:
+        mode = "preload" if r["preload"] else "default"
+        print(f"{mode:<10}{r['ready_s']:>9}{r['first_analysis_ms']:>12}{r['max_analysis_ms']:>12}"
+              f"{r['worker_rss_mb_avg']:>15}{r['worker_pss_mb_avg']:>15}{r['total_pss_mb']:>14}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# gunicorn.conf.py - picked up automatically by `gunicorn wsgi:app`
+#
+# GUNICORN_PRELOAD=1 (default) loads the app in the master, warms it up
+# and freezes the heap before forking, so workers share the imported
+# backends, compiled patterns and matchers copy-on-write.
+# GUNICORN_PRELOAD=0 restores the old behaviour (each worker imports and
+# initialises everything itself).
+#
+# Each worker starts its extraction helpers (app.utils.sandbox) as soon
+# as it is forked, so the first upload doesn't wait for them.
+#
+# WORKER_MAX_RSS_MB > 0 recycles a worker once its resident size passes
+# that after a request: the worker finishes the request, exits, and the
+# master forks a fresh one from the (warm, frozen) preloaded image.
+# GUNICORN_MAX_REQUESTS does the same by request count. With
+# MEMORY_PROFILE on (app.memprofile) a recycled worker logs its profile.
+
+import multiprocessing
+import os
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.environ.get(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(4, multiprocessing.cpu_count() * 2 + 1)))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+
+preload_app = _env_flag("GUNICORN_PRELOAD", "1")
+
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+worker_max_rss_mb = float(os.environ.get("WORKER_MAX_RSS_MB", "0"))
+
+
+def when_ready(server):
+    # Runs in the master after the app has been loaded (before any worker
+    # is forked when preload_app is on).
+    if not preload_app:
+        return
+
+    from app.warmup import warm_up, freeze_heap
+
+    timings = warm_up()
+    freeze_heap()
+    server.log.info(
+        "Warm-up done: %s",
+        ", ".join(f"{step}={secs * 1000:.0f}ms" for step, secs in timings.items()),
+    )
+
+
+def post_fork(server, worker):
+    from app.utils.sandbox import get_sandbox, sandbox_limits
+
+    limits = sandbox_limits(worker.app.wsgi().config)
+    if limits is not None:
+        get_sandbox(limits)
+
+
+def post_request(worker, req, environ, resp):
+    if worker_max_rss_mb <= 0 or not worker.alive:
+        return
+    from app.memprofile import rss_mb
+
+    rss = rss_mb()
+    if rss > worker_max_rss_mb:
+        worker.log.warning(
+            "Worker %s at %.0f MB RSS (limit %.0f MB) after %s %s; recycling",
+            worker.pid, rss, worker_max_rss_mb, req.method, req.path,
+        )
+        # Checked by the worker loop after this request (gthread: after
+        # its in-flight requests); the master then forks a replacement.
+        worker.alive = False
+
+
+def worker_exit(server, worker):
+    from app.memprofile import get_profiler
+
+    profiler = get_profiler()
+    if profiler is not None and profiler.report()["requests"]:
+        profiler.log_report()
@@ -0,0 +1,52 @@
+// Result page: highlights over the server-rendered text and the JSON view,
+// from the data block the server embeds ([start, end, label] spans into
+// the text, and the structured result).
+(function () {
+    "use strict";
+
+    var CLASSES = {
+        degree: "hl-degree",
+        institution: "hl-degree",
+        field: "hl-degree",
+        organization: "hl-exp",
+        title: "hl-exp",
+        date: "hl-date",
+        email: "hl-contact",
+        phone: "hl-contact",
+        skill: "hl-skill"
+    };
+
+    var block = document.getElementById("result-data");
+    if (!block) {
+        return;
+    }
+    var data = JSON.parse(block.textContent);
+
+    var target = document.getElementById("resume-text");
+    if (target) {
+        // Offsets are in code points (Python), not UTF-16 units.
+        var chars = Array.from(target.textContent);
+        var out = document.createDocumentFragment();
+        var pos = 0;
+        (data.spans || []).forEach(function (span) {
+            var start = span[0], end = span[1], label = span[2];
+            if (start < pos || end > chars.length) {
+                return;
+            }
+            out.appendChild(document.createTextNode(chars.slice(pos, start).join("")));
+            var mark = document.createElement("mark");
+            mark.className = CLASSES[label] || "hl-exp";
+            mark.title = label;
+            mark.textContent = chars.slice(start, end).join("");
+            out.appendChild(mark);
+            pos = end;
+        });
+        out.appendChild(document.createTextNode(chars.slice(pos).join("")));
+        target.replaceChildren(out);
+    }
+
+    var json = document.getElementById("result-json");
+    if (json) {
+        json.value = JSON.stringify(data.result, null, 4);
+    }
+})();
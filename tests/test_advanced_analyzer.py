@@ -0,0 +1,48 @@
+import pytest
+
+from app.resume_parser import advanced_analyzer
+from app.resume_parser.advanced_analyzer import analyze_resume_text
+
+RESUME = "Priya Sharma\npriya@example.com | +91 98765 43210\nKothrud, Pune, Maharashtra\n"
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("extractor ran for a field that was not requested")
+
+
+def test_email_does_not_run_the_other_contact_extractors(monkeypatch):
+    for extractor in ("_name_from_lines", "_location_from_lines", "_states_from_lines", "_line_places"):
+        monkeypatch.setattr(advanced_analyzer, extractor, _fail)
+    result = analyze_resume_text(RESUME, fields=["email"])
+    assert result.email == "priya@example.com"
+    assert result.name is None and result.current_location is None
+
+
+def test_body_is_not_scanned_when_the_header_has_email_and_phone(monkeypatch):
+    scanned = []
+    contact_re = advanced_analyzer.CONTACT_RE
+
+    class Recording:
+        def finditer(self, scope):
+            scanned.append(scope)
+            return contact_re.finditer(scope)
+
+    monkeypatch.setattr(advanced_analyzer, "CONTACT_RE", Recording())
+    body = "\n".join(f"Project {i}" for i in range(40)) + "\nreferee@example.com\n"
+    result = analyze_resume_text(RESUME + body, fields=["email", "phone"])
+    assert (result.email, result.phone) == ("priya@example.com", "+91 98765 43210")
+    assert len(scanned) == 1 and "referee" not in scanned[0]
+
+    scanned.clear()
+    result = analyze_resume_text(RESUME + body, fields=["all_emails"])
+    assert result.all_emails == ["priya@example.com", "referee@example.com"]
+    assert len(scanned) == 2
+
+
+@pytest.mark.parametrize("field, value", [
+    ("name", "Priya Sharma"),
+    ("current_location_canonical", "Pune"),
+    ("indian_states_found", ["Maharashtra"]),
+])
+def test_contact_fields_on_their_own(field, value):
+    assert getattr(analyze_resume_text(RESUME, fields=[field]), field) == value
@@ -0,0 +1,64 @@
+import random
+
+from app.corpus.bm25 import BM25Index, get_index, sync_index
+
+WORDS = [f"term{i}" for i in range(300)]
+
+
+def _corpus(n_docs, seed=0):
+    rng = random.Random(seed)
+    # Zipf-like: low-numbered terms are common, so some posting lists are long.
+    weights = [1 / (i + 1) for i in range(len(WORDS))]
+    return {
+        f"doc{i}": "SKILLS\n" + " ".join(rng.choices(WORDS, weights, k=rng.randint(20, 120)))
+        for i in range(n_docs)
+    }
+
+
+def test_pruned_search_matches_exhaustive():
+    index = BM25Index()
+    for doc_id, text in _corpus(400).items():
+        index.add(doc_id, text)
+    rng = random.Random(1)
+    for n_terms in (1, 3, 10, 40):
+        for _ in range(10):
+            query = " ".join(rng.sample(WORDS[:120], n_terms))
+            for k in (1, 5, 20):
+                assert index.search(query, k) == index.search(query, k, prune=False)
+
+
+def test_pruned_search_matches_exhaustive_with_tail_and_deletes(tmp_path):
+    corpus = _corpus(300, seed=2)
+    index = BM25Index()
+    for doc_id, text in list(corpus.items())[:200]:
+        index.add(doc_id, text)
+    index.save(tmp_path / "bm25")
+    index = BM25Index.load(tmp_path / "bm25")
+    for doc_id, text in list(corpus.items())[200:]:
+        index.add(doc_id, text)
+    for i in range(0, 300, 7):
+        index.remove(f"doc{i}")
+    for query in ("term0 term1 term50", "term3 term77 term120 term9", "term200"):
+        assert index.search(query, 10) == index.search(query, 10, prune=False)
+
+
+def test_save_swaps_versions_and_keeps_names(tmp_path):
+    path = tmp_path / "bm25"
+    index = BM25Index()
+    sync_index(index, [("a", "SKILLS\npython django"), ("b", "SKILLS\njava spring")], {"a": "alice.pdf"})
+    index.save(path)
+    assert path.is_symlink()
+    first = get_index(path)
+    assert first.search("python", 1)[0][0] == "a"
+    assert first.names == {"a": "alice.pdf"}
+
+    sync_index(index, [("b", "SKILLS\njava spring"), ("c", "SKILLS\npython flask")], {"c": "carol.docx"})
+    index.save(path)
+    second = get_index(path)
+    assert second is not first
+    assert [doc_id for doc_id, _ in second.search("python", 5)] == ["c"]
+    assert second.names == {"c": "carol.docx"}
+    # The previous version is gone; only the link and the current one remain.
+    assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith("bm25")) == sorted(
+        ["bm25", path.resolve().name]
+    )
@@ -0,0 +1,23 @@
+import pytest
+
+from app.utils.file_extractor import extract_document, sniff_format
+from app.utils.preflight import preflight
+
+TEXT = "Jane Doe\nSkills: Python, Café"
+
+
+@pytest.mark.parametrize("data, encoding", [
+    (TEXT.encode("utf-8"), "utf-8"),
+    (b"\xef\xbb\xbf" + TEXT.encode("utf-8"), "utf-8-sig"),
+    (TEXT.encode("utf-16"), "utf-16"),
+    (b"\xfe\xff" + TEXT.encode("utf-16-be"), "utf-16"),
+    (TEXT.encode("latin-1"), "latin-1"),
+])
+def test_txt_encodings(data, encoding):
+    assert sniff_format(data) == "txt"
+    assert preflight(data).encoding == encoding
+    assert extract_document(data)["text"] == TEXT
+
+
+def test_binary_is_not_text():
+    assert sniff_format(b"abc\x00def\x01\x02") is None
@@ -0,0 +1,26 @@
+import pytest
+
+from app.resume_parser.organizations import canonical_id
+
+
+@pytest.mark.parametrize("name, org_id", [
+    ("TCS", "tcs"),
+    ("Tata Consultancy Services Ltd", "tcs"),
+    ("Tata Consultancy Services, Hyderabad", "tcs"),
+    ("Infosys Limited, Bangalore", "infosys"),
+    ("Satyam", "techm"),
+    ("Mahindra Satyam, Hyderabad", "techm"),
+    ("IBM India Pvt Ltd, Bangalore", "ibm"),
+])
+def test_resolves(name, org_id):
+    assert canonical_id(name) == org_id
+
+
+@pytest.mark.parametrize("name", [
+    "CTS Public School",
+    "BEL Public School, Bangalore",
+    "Satyam Software Solutions",
+    "EY Consulting Club",
+])
+def test_short_and_acronym_aliases_only_match_whole_names(name):
+    assert canonical_id(name) is None
@@ -0,0 +1,19 @@
+from datetime import date
+
+from app.cache import AnalysisCache
+from app.pipeline import process_document
+
+RESUME = b"John Smith\njohn@example.com\n\nEXPERIENCE\nSoftware Engineer, Infosys\nJan 2015 - Present\n"
+
+
+def test_ongoing_role_is_not_served_from_an_older_month(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.db"))
+    first, _ = process_document(RESUME, "a.txt", cache=cache, as_of=date(2024, 1, 1))
+    again, hits = process_document(RESUME, "a.txt", cache=cache, as_of=date(2024, 1, 20))
+    assert hits["analysis"]
+    assert again["advanced"].total_experience_years == first["advanced"].total_experience_years == 9.0
+
+    later, hits = process_document(RESUME, "a.txt", cache=cache, as_of=date(2025, 1, 1))
+    assert not hits["analysis"]
+    assert later["advanced"].total_experience_years == 10.0
+    assert later["advanced"].experience_history[0].duration_months == 120
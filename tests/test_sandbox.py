@@ -0,0 +1,24 @@
+import pytest
+
+from app.utils import sandbox
+from app.utils.sandbox import ExtractionSandbox, SandboxLimits, get_sandbox
+
+
+def test_failed_start_is_retried(monkeypatch):
+    monkeypatch.setattr(sandbox, "_sandbox", None)
+    monkeypatch.setattr(sandbox, "_sandbox_key", None)
+    started = []
+
+    def start(self):
+        started.append(self)
+        if len(started) == 1:
+            raise RuntimeError("forkserver failed")
+
+    monkeypatch.setattr(ExtractionSandbox, "start", start)
+    limits = SandboxLimits()
+    with pytest.raises(RuntimeError):
+        get_sandbox(limits)
+    assert sandbox._sandbox is None and sandbox._sandbox_key is None
+
+    assert get_sandbox(limits) is started[1]
+    assert get_sandbox(limits) is started[1]
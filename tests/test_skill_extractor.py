@@ -0,0 +1,21 @@
+import pytest
+
+from app.resume_parser.skill_extractor import fuzzy_skills
+
+
+@pytest.mark.parametrize("typo, skill", [
+    ("kubernates", "kubernetes"),
+    ("pyhton", "python"),
+    ("Djnago", "django"),
+    ("postgre sql", "postgresql"),
+    ("Seabron", "seaborn"),
+])
+def test_typo_matches_skill(typo, skill):
+    assert [m["skill"] for m in fuzzy_skills(f"Skills: {typo}")] == [skill]
+
+
+@pytest.mark.parametrize("word", [
+    "scalar", "bumpy", "reacts", "dockers", "swifty", "scale", "sprint", "string", "flash", "seaborne",
+])
+def test_english_word_is_not_a_skill(word):
+    assert fuzzy_skills(f"Worked on {word} problems") == []
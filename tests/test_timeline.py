@@ -0,0 +1,53 @@
+from datetime import date
+
+from app.resume_parser.timeline import Timeline, covered_months, merge_intervals
+
+AS_OF = date(2024, 6, 1)
+
+
+def test_merge_intervals_overlapping_and_adjacent():
+    assert merge_intervals([(10, 20), (15, 25), (25, 30), (40, 45)]) == [(10, 30), (40, 45)]
+
+
+def test_merge_intervals_unsorted_and_contained():
+    assert merge_intervals([(40, 45), (10, 30), (12, 14)]) == [(10, 30), (40, 45)]
+
+
+def test_merge_intervals_empty():
+    assert merge_intervals([]) == []
+
+
+def test_covered_months_counts_overlap_once():
+    # Two jobs overlapping by 6 months: 24 + 24 - 6.
+    assert covered_months([(0, 24), (18, 42)]) == 42
+
+
+def test_nested_range_is_seen_once():
+    timeline = Timeline("Engineer, Infosys\nJan 2015 - Present", AS_OF)
+    assert [s.kind for s in timeline.spans] == ["month"]
+    assert timeline.duration_months(timeline.spans[0]) == (2024 * 12 + 6) - (2015 * 12 + 1)
+
+
+def test_overlapping_jobs_merge_on_the_timeline():
+    timeline = Timeline("Lead, TCS\nJan 2018 - Dec 2020\nConsultant, Wipro\nJan 2020 - Dec 2021", AS_OF)
+    intervals = [timeline.interval(s) for s in timeline.spans]
+    assert merge_intervals(intervals) == [(2018 * 12 + 1, 2021 * 12 + 12)]
+    assert covered_months(intervals) < sum(end - start for start, end in intervals)
+
+
+def test_range_wrapped_across_lines():
+    timeline = Timeline("Engineer, Infosys Jan 2015 –\nMar 2018\nBuilt things.", AS_OF)
+    assert len(timeline.spans) == 1
+    span = timeline.spans[0]
+    assert span.line == 0 and not timeline.has_date(1)
+    assert (span.from_year, span.from_month, span.to_year, span.to_month) == (2015, 1, 2018, 3)
+
+
+def test_wrapped_ongoing_range():
+    timeline = Timeline("Analyst Apr 2019 to\nPresent", AS_OF)
+    assert timeline.line_span(0).ongoing
+
+
+def test_skipped_lines_are_not_searched():
+    timeline = Timeline("EDUCATION\nB.Tech 2007 - 2011\nEXPERIENCE\nJan 2015 - Mar 2018", AS_OF, skip=[(0, 2)])
+    assert [s.line for s in timeline.spans] == [3]
@@ -0,0 +1,38 @@
+from io import BytesIO
+
+import pytest
+
+from app import create_app
+from app.config import Config
+
+NOT_A_RESUME = b"\x00\x01\x02\x03" * 64
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "UPLOAD_FOLDER", str(tmp_path / "uploads"))
+    monkeypatch.setattr(Config, "BULK_API_TOKENS", ["test-token"])
+    monkeypatch.setattr(Config, "ANALYSIS_CACHE", "")
+    monkeypatch.setattr(Config, "EXTRACTION_SANDBOX", False)
+    return create_app().test_client()
+
+
+def _upload(content: bytes, name: str = "resume.txt"):
+    return {"resume": (BytesIO(content), name)}
+
+
+def test_rejected_bulk_upload_is_deleted(client, tmp_path):
+    response = client.post(
+        "/api/analyze",
+        data=_upload(NOT_A_RESUME),
+        headers={"Authorization": "Bearer test-token"},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 422
+    assert list((tmp_path / "uploads").iterdir()) == []
+
+
+def test_rejected_form_upload_is_deleted(client, tmp_path):
+    response = client.post("/", data=_upload(NOT_A_RESUME), content_type="multipart/form-data")
+    assert response.status_code == 302
+    assert list((tmp_path / "uploads").iterdir()) == []